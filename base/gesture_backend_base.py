@@ -0,0 +1,70 @@
+from constants.constants import ADB_ROTATION_PROBE_COMMAND
+from utils.adb_gestures import build_rotation_dispatch, parse_rotation
+
+import abc
+import typing
+
+import click
+
+class DeviceCommandError(OSError):
+    """
+    Raised when a device command ran but exited non-zero. Unlike other
+    OSErrors, asking again will not help.
+    """
+
+class GestureBackendBase(abc.ABC):
+    """
+    Abstract base class for all gesture backends.
+
+    A gesture backend turns the swipe into a device shell command line;
+    the ADB swipe providers decide how that line reaches the device.
+    """
+
+    def __init__(self, verbose: bool = False, follow_rotation: bool = False) -> None:
+        """
+        Initializes the backend.
+
+        Args:
+            verbose: Whether to log what was probed.
+            follow_rotation: Whether every swipe reads the display rotation
+                on the device, instead of once when the swipe is built.
+        """
+        self.verbose = verbose
+        self.follow_rotation = follow_rotation
+
+    @abc.abstractmethod
+    def get_swipe_command(self, run_device_command: typing.Callable[[str], str]) -> str:
+        """
+        Returns the device shell command line that performs the swipe.
+
+        Args:
+            run_device_command: Runs a command line on the device and
+                returns its output, raising DeviceCommandError if the
+                command failed on the device and OSError if the device
+                could not be reached. Backends may use it to probe the
+                device.
+        """
+        raise NotImplementedError
+
+    def select_rotation_command(self, commands: typing.Dict[int, str], run_device_command: typing.Callable[[str], str]) -> str:
+        """
+        Returns the command line for the display's rotation: one that reads
+        the rotation on the device in every swipe if `follow_rotation` is
+        set, or the one for the rotation read now otherwise.
+
+        Args:
+            commands: The command line for each rotation in quarter turns.
+            run_device_command: Runs a command line on the device.
+
+        Raises:
+            OSError: If the rotation could not be read.
+        """
+        if self.follow_rotation:
+            return build_rotation_dispatch(ADB_ROTATION_PROBE_COMMAND, commands)
+
+        rotation = parse_rotation(run_device_command(ADB_ROTATION_PROBE_COMMAND))
+
+        if self.verbose:
+            click.echo(f"Display rotation: {rotation * 90} degrees.", err=True)
+
+        return commands[rotation]
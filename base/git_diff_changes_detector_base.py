@@ -1,3 +1,7 @@
+from base.git_diff_provider_base import GitDiffProviderBase
+from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+from utils.detector_state_file import DetectorStateFile
+
 import abc
 import pathlib
 import typing
@@ -10,10 +14,34 @@ class GitDiffChangesDetectorBase(abc.ABC):
     of new work has occurred since the last check.
     """
 
-    def __init__(self, repo_path: pathlib.Path) -> None:
-        """Initializes the detector with the repository path."""
+    def __init__(
+        self,
+        repo_path: pathlib.Path,
+        diff_provider: typing.Optional[GitDiffProviderBase] = None,
+        state_file: typing.Optional[DetectorStateFile] = None,
+    ) -> None:
+        """
+        Initializes the detector with the repository path and diff provider.
+
+        The baseline is taken from `state_file` when it has a valid one,
+        so no diff is needed; otherwise the current diff is the baseline.
+        """
         self.repo_path = repo_path
-        self._last_state = self.get_current_state()
+        self.diff_provider = diff_provider if diff_provider is not None else GitDiffProviderSubprocess()
+        self.state_file = state_file
+        self.is_warm_start = False
+
+        saved_state = state_file.load() if state_file is not None else None
+
+        if saved_state is not None:
+            try:
+                self._last_state = self.load_state(saved_state)
+                self.is_warm_start = True
+            except (TypeError, ValueError):
+                pass
+
+        if not self.is_warm_start:
+            self._last_state = self.get_current_state()
 
     @abc.abstractmethod
     def get_current_state(self) -> typing.Any:
@@ -28,6 +56,57 @@ class GitDiffChangesDetectorBase(abc.ABC):
         """
         raise NotImplementedError
 
+    def dump_state(self) -> typing.Any:
+        """
+        Returns the baseline as JSON-compatible data, for the state file.
+        The default implementation returns it as is.
+        """
+        return self._last_state
+
+    def load_state(self, data: typing.Any) -> typing.Any:
+        """
+        Converts data returned by dump_state() back into a state.
+        The default implementation returns it as is.
+
+        Raises:
+            TypeError, ValueError: If the data does not fit this detector.
+        """
+        return data
+
+    def save_state(self) -> None:
+        """Writes the baseline to the state file, if there is one."""
+        if self.state_file is not None:
+            self.state_file.save(self.dump_state())
+
+    async def save_state_async(self) -> None:
+        """
+        Asynchronous variant of save_state(), writing the file in a
+        worker thread so the event loop keeps running.
+        """
+        import asyncio
+
+        await asyncio.to_thread(self.save_state)
+
+    async def get_current_state_async(self) -> typing.Any:
+        """
+        Asynchronous variant of get_current_state().
+
+        The default implementation runs the blocking call in a worker thread.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.get_current_state)
+
+    async def check_for_new_work_async(self) -> bool:
+        """
+        Asynchronous variant of check_for_new_work().
+
+        The default implementation runs the blocking call in a worker thread.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.check_for_new_work)
+
     @property
     def initial_status_message(self) -> str:
         """Returns a string describing the initial state."""
@@ -1,5 +1,15 @@
+from utils.git_diff_parsing import GitNumstat, count_git_numstat
+
 import abc
 import pathlib
+import typing
+
+class GitDiffUnavailableError(OSError):
+    """
+    Raised when git can not produce a diff right now (it hit its
+    deadline, or is paused after repeated timeouts). Unlike an empty
+    diff, this tells detectors to keep their baseline and try again.
+    """
 
 class GitDiffProviderBase(abc.ABC):
     """
@@ -18,3 +28,112 @@ class GitDiffProviderBase(abc.ABC):
             The full output of git diff as a string.
         """
         raise NotImplementedError
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """
+        Returns the entire output of git diff as raw bytes.
+
+        Implementations that talk to git directly should override this
+        and derive get_current_git_diff() from it with decode_git_diff(),
+        so nothing is decoded unless a caller actually needs text.
+        The default implementation encodes the string variant.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as bytes.
+        """
+        return self.get_current_git_diff(repo_path=repo_path).encode("utf-8")
+
+    @staticmethod
+    def decode_git_diff(diff: bytes) -> str:
+        """
+        Decodes raw git diff output for display.
+
+        Invalid UTF-8 (binary-ish content) is replaced instead of raising,
+        and line endings are normalized like text-mode pipes do.
+        """
+        return diff.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+    def iter_current_git_diff_chunks(self, repo_path: pathlib.Path) -> typing.Iterator[bytes]:
+        """
+        Yields the output of git diff as a sequence of byte chunks.
+
+        Lets callers that only hash or count the diff keep memory flat.
+        The default implementation yields the whole diff as one chunk.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Yields:
+            Consecutive pieces of the git diff output.
+        """
+        yield self.get_current_git_diff_bytes(repo_path=repo_path)
+
+    def get_current_git_numstat(self, repo_path: pathlib.Path) -> typing.List[GitNumstat]:
+        """
+        Returns added and deleted line counts per file, like
+        `git diff --numstat`.
+
+        Implementations that can ask git for the counts directly should
+        override this, so only a few bytes per file cross the pipe.
+        The default implementation counts the lines of the full patch.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            One entry per file in the diff, in git's output order.
+        """
+        return count_git_numstat(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    async def get_current_git_diff_bytes_async(self, repo_path: pathlib.Path) -> bytes:
+        """
+        Asynchronous variant of get_current_git_diff_bytes().
+
+        The default implementation runs the blocking call in a worker
+        thread, so the event loop stays responsive.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as bytes.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.get_current_git_diff_bytes, repo_path=repo_path)
+
+    async def aiter_current_git_diff_chunks(self, repo_path: pathlib.Path) -> typing.AsyncIterator[bytes]:
+        """
+        Asynchronous variant of iter_current_git_diff_chunks().
+
+        The default implementation yields the whole diff as one chunk.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Yields:
+            Consecutive pieces of the git diff output.
+        """
+        yield await self.get_current_git_diff_bytes_async(repo_path=repo_path)
+
+    async def get_current_git_numstat_async(self, repo_path: pathlib.Path) -> typing.List[GitNumstat]:
+        """
+        Asynchronous variant of get_current_git_numstat().
+
+        The default implementation runs the blocking call in a worker thread.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            One entry per file in the diff, in git's output order.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.get_current_git_numstat, repo_path=repo_path)
+
+    def close(self) -> None:
+        """Releases any resources held by the provider (helper processes, mapped files)."""
@@ -1,3 +1,5 @@
+from utils.impl_registry import ImplRegistry
+
 import abc
 import typing
 
@@ -11,20 +13,34 @@ TImplName = typing.TypeVar("TImplName", bound=StrEnum)
 class ImplFactoryBase(abc.ABC, typing.Generic[TBaseClass, TImplName]):
     """
     Base class for implementation factories.
+
+    Implementations are resolved through an ImplRegistry, so only the
+    selected one is imported, and third-party ones are found through
+    entry points.
     """
 
     @property
     @abc.abstractmethod
-    def impl_name_class(self) -> type[TImplName]:
+    def registry(self) -> ImplRegistry[TBaseClass]:
         raise NotImplementedError
 
     @abc.abstractmethod
-    def get_impl_map(self) -> typing.Dict[TImplName, typing.Callable[[], TBaseClass]]:
+    def get_impl_kwargs(self) -> typing.Dict[str, typing.Any]:
         """
-        Returns a map of implementation names to their factory functions.
+        Returns the keyword arguments implementations are created with,
+        unless get_impl_map() has a factory function for them. This is
+        the constructor contract for third-party implementations.
         """
         raise NotImplementedError
 
+    def get_impl_map(self) -> typing.Dict[TImplName, typing.Callable[[type[TBaseClass]], TBaseClass]]:
+        """
+        Returns a map of built-in implementation names to factory
+        functions, for those that take more than get_impl_kwargs().
+        Each function receives the implementation class, loaded on demand.
+        """
+        return {}
+
     def get_impl_instance(self, impl_name_str: str) -> TBaseClass:
         """
         Gets an instance of the implementation based on the provided name.
@@ -36,15 +52,13 @@ class ImplFactoryBase(abc.ABC, typing.Generic[TBaseClass, TImplName]):
             An instance of the implementation.
 
         Raises:
-            click.Abort: If the implementation name is not found.
+            click.Abort: If the implementation name is not found or fails to load.
         """
-        impl_map = self.get_impl_map()
+        impl_name = impl_name_str.lower()
 
-        impl_name = self.impl_name_class(impl_name_str.lower())
-
-        instance_factory = impl_map.get(impl_name)
-
-        if not instance_factory:
+        try:
+            impl_class = self.registry.load(impl_name)
+        except LookupError:
             click.echo(
                 f"Error: Unknown implementation {impl_name}. "
                 f"Available: {self.get_instance_names_list()}",
@@ -52,11 +66,19 @@ class ImplFactoryBase(abc.ABC, typing.Generic[TBaseClass, TImplName]):
             )
 
             raise click.Abort()
+        except (ImportError, TypeError) as exception:
+            click.echo(f"Error: Implementation {impl_name} could not be loaded: {exception}", err=True)
+            raise click.Abort()
+
+        instance_factory = self.get_impl_map().get(impl_name)
+
+        if instance_factory is not None:
+            return instance_factory(impl_class)
 
-        return instance_factory()
+        return impl_class(**self.get_impl_kwargs())
 
     def get_instance_names_list(self) -> typing.List[str]:
         """
         Returns a list of available implementation names.
         """
-        return [name.value for name in self.get_impl_map().keys()]
+        return self.registry.get_names()
@@ -0,0 +1,158 @@
+from base.git_diff_changes_detector_base import GitDiffChangesDetectorBase
+from base.git_diff_provider_base import GitDiffUnavailableError
+from base.swipe_provider_base import SwipeProviderBase
+from base.watcher_base import WatcherBase
+from constants.enums import PollPhases
+from utils.circuit_breaker import CircuitOpenError
+
+import abc
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from metrics.poll_stats import PollStats
+
+import click
+
+class RuntimeBase(abc.ABC):
+    """
+    Abstract base class for all runtimes.
+
+    A runtime drives the main loop: it waits through the watcher, asks
+    the detector for new work and hands rewards to the swipe provider.
+    """
+
+    def __init__(
+        self,
+        detector: GitDiffChangesDetectorBase,
+        provider: SwipeProviderBase,
+        watcher: WatcherBase,
+        verbose: bool = False,
+        stats: typing.Optional["PollStats"] = None,
+    ) -> None:
+        """
+        Initializes the runtime with the components it drives.
+
+        Args:
+            stats: Where to record the phases of the loop, or None to not time them.
+        """
+        self.detector = detector
+        self.provider = provider
+        self.watcher = watcher
+        self.verbose = verbose
+        self.stats = stats
+
+    @abc.abstractmethod
+    def run(self) -> None:
+        """
+        Runs the main loop until interrupted.
+
+        Raises:
+            KeyboardInterrupt: When the user presses CTRL+C.
+        """
+        raise NotImplementedError
+
+    def check_for_new_work(self) -> bool:
+        """
+        Asks the detector for new work. While git is unavailable (timed
+        out or paused), the check counts as finding none and the detector
+        keeps its baseline. A new baseline is saved for the next start.
+        """
+        started = self.stats.start_check() if self.stats is not None else 0.0
+
+        try:
+            has_new_work = self.detector.check_for_new_work()
+        except GitDiffUnavailableError as exception:
+            self._echo_skipped_check(exception)
+            has_new_work = False
+
+        if has_new_work:
+            self.detector.save_state()
+
+        if self.stats is not None:
+            self.stats.end_check(started, has_new_work)
+
+        return has_new_work
+
+    async def check_for_new_work_async(self) -> bool:
+        """Asynchronous variant of check_for_new_work()."""
+        started = self.stats.start_check() if self.stats is not None else 0.0
+
+        try:
+            has_new_work = await self.detector.check_for_new_work_async()
+        except GitDiffUnavailableError as exception:
+            self._echo_skipped_check(exception)
+            has_new_work = False
+
+        if has_new_work:
+            await self.detector.save_state_async()
+
+        if self.stats is not None:
+            self.stats.end_check(started, has_new_work)
+
+        return has_new_work
+
+    def swipe_up(self) -> None:
+        """Hands one reward to the swipe provider."""
+        if self.stats is None:
+            self.provider.swipe_up()
+            return
+
+        started = time.perf_counter()
+
+        try:
+            self.provider.swipe_up()
+        except Exception:
+            self.stats.observe_reward(time.perf_counter() - started, has_failed=True)
+            raise
+
+        self.stats.observe_reward(time.perf_counter() - started, has_failed=False)
+
+    async def swipe_up_async(self) -> None:
+        """Asynchronous variant of swipe_up()."""
+        if self.stats is None:
+            await self.provider.swipe_up_async()
+            return
+
+        started = time.perf_counter()
+
+        try:
+            await self.provider.swipe_up_async()
+        except Exception:
+            self.stats.observe_reward(time.perf_counter() - started, has_failed=True)
+            raise
+
+        self.stats.observe_reward(time.perf_counter() - started, has_failed=False)
+
+    def wait_for_change(self) -> None:
+        """Waits through the watcher until the next check is due."""
+        if self.stats is None:
+            self.watcher.wait_for_change()
+            return
+
+        started = time.perf_counter()
+        self.watcher.wait_for_change()
+        self.stats.observe(PollPhases.SLEEP, time.perf_counter() - started)
+
+    async def wait_for_change_async(self) -> None:
+        """Asynchronous variant of wait_for_change()."""
+        if self.stats is None:
+            await self.watcher.wait_for_change_async()
+            return
+
+        started = time.perf_counter()
+        await self.watcher.wait_for_change_async()
+        self.stats.observe(PollPhases.SLEEP, time.perf_counter() - started)
+
+    def _echo_skipped_check(self, exception: GitDiffUnavailableError) -> None:
+        """Reports a skipped check; while git is paused, only in verbose mode."""
+        if self.verbose or not isinstance(exception.__cause__, CircuitOpenError):
+            click.echo(f"Warning: skipping this check, {exception}.", err=True)
+
+    def get_reward_message(self) -> str:
+        """Returns the line printed for every reward."""
+        return f"[{time.strftime('%H:%M:%S')}] New code detected! Swiping for dopamine... 📱"
+
+    def echo_reward(self) -> None:
+        """Prints the reward line."""
+        click.echo(self.get_reward_message())
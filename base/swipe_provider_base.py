@@ -14,7 +14,20 @@ class SwipeProviderBase(abc.ABC):
         """Executes the swipe up action."""
         raise NotImplementedError
 
+    async def swipe_up_async(self) -> None:
+        """
+        Asynchronous variant of swipe_up().
+
+        The default implementation runs the blocking call in a worker thread.
+        """
+        import asyncio
+
+        await asyncio.to_thread(self.swipe_up)
+
     @abc.abstractmethod
     def check_availability(self) -> bool:
         """Checks if the provider is ready."""
         raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases any resources held by the provider."""
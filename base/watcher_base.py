@@ -0,0 +1,45 @@
+import abc
+
+class WatcherBase(abc.ABC):
+    """
+    Abstract base class for all watchers.
+
+    A watcher decides when the change detector runs next: the main loop
+    checks for new work, then blocks in wait_for_change() until the
+    worktree may have changed.
+    """
+
+    def __init__(self, verbose: bool = False) -> None:
+        """Initializes the watcher."""
+        self.verbose = verbose
+
+    @abc.abstractmethod
+    def wait_for_change(self) -> None:
+        """Blocks until the change detector should run again."""
+        raise NotImplementedError
+
+    async def wait_for_change_async(self) -> None:
+        """
+        Asynchronous variant of wait_for_change().
+
+        The default implementation runs the blocking call in a worker thread.
+        """
+        import asyncio
+
+        await asyncio.to_thread(self.wait_for_change)
+
+    def report_activity(self, has_new_work: bool) -> None:
+        """
+        Tells the watcher what the last check found, so it can adapt.
+
+        Args:
+            has_new_work: Whether the check triggered a reward.
+        """
+
+    def close(self) -> None:
+        """Releases any resources held by the watcher."""
+
+    @property
+    def description(self) -> str:
+        """Returns a short human-readable description of the watcher."""
+        return type(self).__name__
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""
+Compares the line count detector, which reads the whole patch, with the
+numstat detector, which only reads per-file counts, on a large synthetic
+diff.
+
+Usage:
+    python benchmarks/bench_numstat.py --files 2000 --lines 200
+"""
+
+import pathlib
+import sys
+import tempfile
+import time
+
+import click
+
+# Make the repository's packages importable when run as a script.
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from change_detectors.git_diff_changes_detector_line_count import GitDiffChangesDetectorLineCount
+from change_detectors.git_diff_changes_detector_numstat import GitDiffChangesDetectorNumstat
+from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+
+from synthetic_repo import SyntheticRepoSpec, create_synthetic_repo
+
+def time_detector(detector_class: type, repo_path: pathlib.Path, iterations: int) -> float:
+    """Returns the mean seconds one `get_current_state` call takes."""
+    detector = detector_class(
+        repo_path=repo_path,
+        diff_provider=GitDiffProviderSubprocess(),
+    )
+
+    started = time.perf_counter()
+
+    for _ in range(iterations):
+        detector.get_current_state()
+
+    return (time.perf_counter() - started) / iterations
+
+@click.command()
+@click.option("--files", "file_count", type=click.INT, default=2000, show_default=True, help="Number of modified files.")
+@click.option("--lines", "line_count", type=click.INT, default=200, show_default=True, help="Lines per file.")
+@click.option("--iterations", type=click.INT, default=10, show_default=True, help="Polls timed per detector.")
+def main(file_count: int, line_count: int, iterations: int) -> None:
+    """Times linecount against numstat on a synthetic repository."""
+    with tempfile.TemporaryDirectory(prefix="code4swipe-bench-") as temp_dir:
+        repo_path = pathlib.Path(temp_dir)
+        diff_size = create_synthetic_repo(
+            repo_path=repo_path,
+            spec=SyntheticRepoSpec(
+                file_count=file_count,
+                lines_per_file=line_count,
+                dirty_ratio=1.0,
+                changed_line_ratio=0.5,
+            ),
+        ).diff_bytes
+
+        click.echo(f"Synthetic diff: {file_count} files, {diff_size / 1024 / 1024:.1f} MiB.")
+
+        for name, detector_class in (
+            ("linecount", GitDiffChangesDetectorLineCount),
+            ("numstat", GitDiffChangesDetectorNumstat),
+        ):
+            seconds = time_detector(detector_class=detector_class, repo_path=repo_path, iterations=iterations)
+            click.echo(f"{name:>10}: {seconds * 1000:8.1f} ms per poll")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+
+"""
+Measures what one poll costs on a synthetic repository: getting the
+diff, computing each detector's state, and a full
+`check_for_new_work()` both while the worktree is idle and while it
+keeps changing. Rewards go to the `null` swipe provider, so no device
+is needed.
+
+For every benchmark, the latency percentiles, the processes spawned per
+call and the peak RSS so far are reported and written as JSON, so runs
+on different commits can be compared with compare_results.py.
+
+Usage:
+    python benchmarks/bench_poll.py --files 5000 --dirty-ratio 0.05 --output before.json
+"""
+
+import datetime
+import json
+import math
+import os
+import pathlib
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import click
+
+# Make the repository's packages importable when run as a script.
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from base.git_diff_changes_detector_base import GitDiffChangesDetectorBase
+from base.swipe_provider_base import SwipeProviderBase
+from diff_providers.git_index_reader import GitIndex
+from constants.enums import SwipeProviders
+from factories.Impl_factory_swipe_provider import ImplFactorySwipeProvider
+from factories.impl_factory_git_diff_changes_detector import CHANGE_DETECTOR_REGISTRY, ImplFactoryGitDiffChangesDetector
+from factories.impl_factory_git_diff_provider import ImplFactoryGitDiffProvider
+
+from synthetic_repo import SyntheticRepo, SyntheticRepoSpec, backdate, create_synthetic_repo
+
+#: Version of the JSON layout written by --output.
+RESULTS_SCHEMA_VERSION: typing.Final[int] = 1
+
+class SubprocessCounter:
+    """Counts processes started through subprocess.Popen (asyncio included) while active."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._original_init = subprocess.Popen.__init__
+
+    def __enter__(self) -> "SubprocessCounter":
+        original_init = self._original_init
+
+        def counting_init(popen: subprocess.Popen, *args: typing.Any, **kwargs: typing.Any) -> None:
+            self.count += 1
+            original_init(popen, *args, **kwargs)
+
+        subprocess.Popen.__init__ = counting_init  # type: ignore[method-assign]
+
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        subprocess.Popen.__init__ = self._original_init  # type: ignore[method-assign]
+
+def percentile(sorted_samples: typing.List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of ascending samples."""
+    rank = min(max(math.ceil(fraction * len(sorted_samples)), 1), len(sorted_samples))
+    return sorted_samples[rank - 1]
+
+def run_benchmark(
+    name: str,
+    call: typing.Callable[[], typing.Any],
+    iterations: int,
+    warmup: int,
+    prepare: typing.Optional[typing.Callable[[int], None]] = None,
+) -> typing.Dict[str, typing.Any]:
+    """
+    Times `call` and summarizes the samples.
+
+    Args:
+        name: Benchmark name in the results.
+        call: The operation to time.
+        iterations: Timed calls.
+        warmup: Untimed calls before them.
+        prepare: Runs untimed before each call, with the call's index.
+    """
+    for index in range(warmup):
+        if prepare is not None:
+            prepare(index)
+
+        call()
+
+    samples: typing.List[float] = []
+
+    with SubprocessCounter() as counter:
+        for index in range(iterations):
+            if prepare is not None:
+                prepare(warmup + index)
+
+            started = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+
+    return {
+        "name": name,
+        "iterations": iterations,
+        "mean_ms": sum(samples) / len(samples),
+        "min_ms": samples[0],
+        "p50_ms": percentile(samples, 0.50),
+        "p95_ms": percentile(samples, 0.95),
+        "p99_ms": percentile(samples, 0.99),
+        "max_ms": samples[-1],
+        "subprocesses_per_call": counter.count / iterations,
+        # ru_maxrss is the process's peak so far, in KiB on Linux.
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "peak_child_rss_kib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+def make_worktree_changer(repo: SyntheticRepo) -> typing.Tuple[typing.Callable[[int], None], typing.Callable[[], None]]:
+    """
+    Returns a function that changes the worktree before every poll,
+    alternating the length of a line block appended to one file, and a
+    function that undoes it.
+
+    Both date the file past the racy window, so the idle polls after
+    them measure the clean stat path rather than re-hashing the file.
+    """
+    file_path = repo.file_paths[0]
+    original = file_path.read_bytes()
+    original_stat = file_path.stat()
+
+    def change(index: int) -> None:
+        file_path.write_bytes(original + b"appended by bench_poll\n" * (1 + index % 2))
+        backdate(file_path)
+
+    def restore() -> None:
+        file_path.write_bytes(original)
+        os.utime(file_path, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+
+    return change, restore
+
+def benchmark_detector(
+    detector_name: str,
+    diff_provider_name: str,
+    repo: SyntheticRepo,
+    swipe_provider: SwipeProviderBase,
+    iterations: int,
+    warmup: int,
+) -> typing.List[typing.Dict[str, typing.Any]]:
+    """Times one detector's state computation and its idle and rewarded polls."""
+    diff_provider = ImplFactoryGitDiffProvider(verbose=False).get_impl_instance(diff_provider_name)
+    detector: GitDiffChangesDetectorBase = ImplFactoryGitDiffChangesDetector(
+        repo_path=repo.path,
+        diff_provider=diff_provider,
+    ).get_impl_instance(detector_name)
+
+    label = f"{detector_name}/{diff_provider_name}"
+
+    def poll() -> None:
+        if detector.check_for_new_work():
+            swipe_provider.swipe_up()
+
+    results = [
+        run_benchmark(f"state/{label}", detector.get_current_state, iterations, warmup),
+        run_benchmark(f"poll-idle/{label}", poll, iterations, warmup),
+    ]
+
+    change, restore = make_worktree_changer(repo)
+
+    try:
+        results.append(run_benchmark(f"poll-change/{label}", poll, iterations, warmup, prepare=change))
+    finally:
+        restore()
+        detector.check_for_new_work()
+
+    return results
+
+def benchmark_index(
+    repo: SyntheticRepo,
+    index_versions: typing.Sequence[int],
+    iterations: int,
+    warmup: int,
+) -> typing.List[typing.Dict[str, typing.Any]]:
+    """
+    Times mapping and parsing `.git/index`, and listing its paths, for
+    each index version. Leaves the index in the last version given.
+    """
+    index_path = repo.path / ".git" / "index"
+    results: typing.List[typing.Dict[str, typing.Any]] = []
+
+    def parse() -> None:
+        GitIndex.open(path=index_path).close()
+
+    def parse_and_list_paths() -> None:
+        with GitIndex.open(path=index_path) as index:
+            index.get_paths()
+
+    for index_version in index_versions:
+        subprocess.run(
+            ["git", "-C", str(repo.path), "update-index", "--index-version", str(index_version)],
+            check=True,
+        )
+
+        results.append(run_benchmark(f"index-parse/v{index_version}", parse, iterations, warmup))
+        results.append(run_benchmark(f"index-paths/v{index_version}", parse_and_list_paths, iterations, warmup))
+
+    return results
+
+def get_code4swipe_commit() -> typing.Optional[str]:
+    """Returns the benchmarked commit, with `-dirty` for local changes."""
+    try:
+        return subprocess.run(
+            ["git", "-C", str(REPO_ROOT), "describe", "--always", "--dirty", "--abbrev=12"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+@click.command()
+@click.option("--files", "file_count", type=click.IntRange(min=1), default=2000, show_default=True, help="Number of committed files.")
+@click.option("--lines", "lines_per_file", type=click.IntRange(min=1), default=100, show_default=True, help="Lines per file.")
+@click.option("--line-length", type=click.IntRange(min=2), default=40, show_default=True, help="Characters per line.")
+@click.option("--dirty-ratio", type=click.FloatRange(min=0, max=1), default=0.05, show_default=True, help="Fraction of files modified in the worktree.")
+@click.option("--changed-line-ratio", type=click.FloatRange(min=0, max=1), default=0.2, show_default=True, help="Fraction of lines rewritten in each modified file.")
+@click.option("--detector", "detector_names", multiple=True, help="Detector to benchmark; repeat for several.  [default: all built-in]")
+@click.option("--diff-provider", "diff_provider_names", multiple=True, help="Diff provider to benchmark; repeat for several.  [default: subprocess]")
+@click.option("--index-version", "index_versions", type=click.IntRange(min=2, max=4), multiple=True, help="Index version to time GitIndex on; repeat for several.  [default: 2 and 4]")
+@click.option("--iterations", type=click.IntRange(min=1), default=50, show_default=True, help="Timed calls per benchmark.")
+@click.option("--warmup", type=click.IntRange(min=0), default=3, show_default=True, help="Untimed calls before each benchmark.")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=pathlib.Path), default=None, help="Write the results as JSON to this file.")
+def main(
+    file_count: int,
+    lines_per_file: int,
+    line_length: int,
+    dirty_ratio: float,
+    changed_line_ratio: float,
+    detector_names: typing.Tuple[str, ...],
+    diff_provider_names: typing.Tuple[str, ...],
+    index_versions: typing.Tuple[int, ...],
+    iterations: int,
+    warmup: int,
+    output: typing.Optional[pathlib.Path],
+) -> None:
+    """Times diffs, detector states and polls on a synthetic repository."""
+    spec = SyntheticRepoSpec(
+        file_count=file_count,
+        lines_per_file=lines_per_file,
+        line_length=line_length,
+        dirty_ratio=dirty_ratio,
+        changed_line_ratio=changed_line_ratio,
+    )
+
+    swipe_provider = ImplFactorySwipeProvider(verbose=False).get_impl_instance(SwipeProviders.NULL)
+    results: typing.List[typing.Dict[str, typing.Any]] = []
+
+    with tempfile.TemporaryDirectory(prefix="code4swipe-bench-") as temp_dir:
+        repo = create_synthetic_repo(repo_path=pathlib.Path(temp_dir), spec=spec)
+
+        click.echo(
+            f"Synthetic repo: {file_count} files, {repo.dirty_file_count} modified, "
+            f"diff {repo.diff_bytes / 1024:.0f} KiB.",
+            err=True,
+        )
+
+        for diff_provider_name in diff_provider_names or ["subprocess"]:
+            diff_provider = ImplFactoryGitDiffProvider(verbose=False).get_impl_instance(diff_provider_name)
+
+            results.append(run_benchmark(
+                f"diff/{diff_provider_name}",
+                lambda: diff_provider.get_current_git_diff(repo_path=repo.path),
+                iterations,
+                warmup,
+            ))
+
+            for detector_name in detector_names or CHANGE_DETECTOR_REGISTRY.builtin_names:
+                results.extend(benchmark_detector(
+                    detector_name=detector_name,
+                    diff_provider_name=diff_provider_name,
+                    repo=repo,
+                    swipe_provider=swipe_provider,
+                    iterations=iterations,
+                    warmup=warmup,
+                ))
+
+        # Last, as it rewrites the index the other benchmarks run against.
+        results.extend(benchmark_index(
+            repo=repo,
+            index_versions=index_versions or (2, 4),
+            iterations=iterations,
+            warmup=warmup,
+        ))
+
+    click.echo(f"{'benchmark':<36} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'procs':>6} {'RSS MiB':>8}")
+
+    for result in results:
+        click.echo(
+            f"{result['name']:<36} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} {result['p99_ms']:8.2f} "
+            f"{result['subprocesses_per_call']:6.1f} {result['peak_rss_kib'] / 1024:8.1f}"
+        )
+
+    click.echo(f"Null provider swipes: {swipe_provider.swipe_count}", err=True)
+
+    if output is not None:
+        document = {
+            "schema": RESULTS_SCHEMA_VERSION,
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": get_code4swipe_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip(),
+            "spec": spec._asdict(),
+            "repo": {
+                "dirty_file_count": repo.dirty_file_count,
+                "diff_bytes": repo.diff_bytes,
+            },
+            "results": results,
+        }
+
+        output.write_text(json.dumps(document, indent=2) + "\n")
+        click.echo(f"Results written to {output}.", err=True)
+
+if __name__ == "__main__":
+    main()
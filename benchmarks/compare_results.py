@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+Compares two result files written by bench_poll.py, e.g. from the
+commits before and after a change.
+
+Usage:
+    python benchmarks/compare_results.py before.json after.json --fail-above 10
+"""
+
+import json
+import pathlib
+import sys
+import typing
+
+import click
+
+def load_results(path: pathlib.Path) -> typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Dict[str, typing.Any]]]:
+    """Returns a result file's document and its results by benchmark name."""
+    document = json.loads(path.read_text())
+    return document, {result["name"]: result for result in document["results"]}
+
+def describe_change(before: float, after: float) -> typing.Tuple[str, float]:
+    """Returns the relative change as text and in percent."""
+    if before == 0:
+        return "     n/a", 0.0
+
+    percent = (after - before) / before * 100
+
+    return f"{percent:+7.1f}%", percent
+
+@click.command()
+@click.argument("before_path", type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path))
+@click.argument("after_path", type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path))
+@click.option("--metric", type=click.Choice(["p50_ms", "p95_ms", "p99_ms", "mean_ms"]), default="p50_ms", show_default=True, help="Latency to compare.")
+@click.option("--fail-above", type=click.FLOAT, default=None, help="Exit with status 1 if a benchmark got slower by more than this many percent.")
+def main(before_path: pathlib.Path, after_path: pathlib.Path, metric: str, fail_above: typing.Optional[float]) -> None:
+    """Prints the change of every benchmark present in both files."""
+    before_document, before_results = load_results(before_path)
+    after_document, after_results = load_results(after_path)
+
+    click.echo(f"before: {before_document.get('commit')} ({before_document.get('created')})")
+    click.echo(f" after: {after_document.get('commit')} ({after_document.get('created')})")
+
+    if before_document.get("spec") != after_document.get("spec"):
+        click.echo("Warning: the runs used different repository shapes.", err=True)
+
+    click.echo(f"{'benchmark':<36} {'before':>9} {'after':>9} {'change':>8} {'procs':>11}")
+
+    regressions: typing.List[str] = []
+
+    for name, after in after_results.items():
+        before = before_results.get(name)
+
+        if before is None:
+            continue
+
+        text, percent = describe_change(before[metric], after[metric])
+
+        click.echo(
+            f"{name:<36} {before[metric]:9.2f} {after[metric]:9.2f} {text} "
+            f"{before['subprocesses_per_call']:5.1f}->{after['subprocesses_per_call']:<5.1f}"
+        )
+
+        if fail_above is not None and percent > fail_above:
+            regressions.append(name)
+
+    for name in sorted(set(before_results) ^ set(after_results)):
+        click.echo(f"{name:<36} only in {'before' if name in before_results else 'after'}")
+
+    if regressions:
+        click.echo(f"Slower by more than {fail_above}%: {', '.join(regressions)}", err=True)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+A fake adb server that implements the few host protocol services
+code4swipe uses, for trying the `adb-socket` provider without a device.
+
+Supported services: `host:version`, `host:devices`, `host:track-devices`,
+`host:transport:<serial>`, `host:transport-any` and `shell:<command>`.
+Shell commands run locally through `sh`, with `input` defined as a no-op
+that takes `--input-latency` seconds.
+
+Device changes can be simulated with the extra service
+`fake:set-state:<serial>:<state>` (state `disconnected` removes the
+device), which is pushed to every `host:track-devices` subscriber.
+
+Usage:
+    python benchmarks/fake_adb_server.py --port 5038 &
+    ANDROID_ADB_SERVER_PORT=5038 ./code4swipe.py --provider adb-socket
+"""
+
+import socketserver
+import subprocess
+import threading
+import typing
+
+import click
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    """Serves one client connection."""
+
+    server: "FakeAdbServer"
+
+    def handle(self) -> None:
+        """Answers requests until the connection turns into a service stream or closes."""
+        transport_serial = None
+
+        while True:
+            try:
+                request = self._read_request()
+            except ConnectionError:
+                return
+
+            if request == "host:version":
+                self._reply_okay(b"%04x" % 41)
+                return
+
+            if request == "host:devices":
+                self._reply_okay(self.server.get_devices_payload())
+                return
+
+            if request == "host:track-devices":
+                self._track_devices()
+                return
+
+            if request.startswith("fake:set-state:"):
+                serial, _, state = request.removeprefix("fake:set-state:").rpartition(":")
+                self.server.set_device_state(serial, state)
+                self.request.sendall(b"OKAY")
+                return
+
+            if request.startswith("host:transport:") or request == "host:transport-any":
+                serial = request.removeprefix("host:transport:") if request != "host:transport-any" else None
+
+                online_serials = self.server.get_online_serials()
+
+                if serial is not None and serial not in online_serials:
+                    self._reply_fail(f"device '{serial}' not found")
+                    return
+
+                if serial is None and len(online_serials) != 1:
+                    self._reply_fail("more than one device/emulator")
+                    return
+
+                transport_serial = serial or online_serials[0]
+                self.request.sendall(b"OKAY")
+                continue
+
+            if request.startswith("shell:") and transport_serial is not None:
+                self.request.sendall(b"OKAY")
+                self.request.sendall(self.server.run_shell_command(request.removeprefix("shell:")))
+                return
+
+            self._reply_fail(f"unknown service: {request}")
+            return
+
+    def _track_devices(self) -> None:
+        """Sends the device list now and after every change, until the client leaves."""
+        self.request.sendall(b"OKAY")
+        generation = -1
+
+        while True:
+            with self.server.devices_changed:
+                self.server.devices_changed.wait_for(lambda: self.server.generation != generation)
+                generation = self.server.generation
+                payload = self.server.get_devices_payload()
+
+            try:
+                self.request.sendall(b"%04x" % len(payload) + payload)
+            except OSError:
+                return
+
+    def _read_request(self) -> str:
+        """Reads one length-prefixed request."""
+        length = int(self._read_exactly(4), 16)
+        return self._read_exactly(length).decode("utf-8")
+
+    def _read_exactly(self, size: int) -> bytes:
+        """Reads exactly `size` bytes from the client."""
+        data = b""
+
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+
+            if not chunk:
+                raise ConnectionError("client closed the connection")
+
+            data += chunk
+
+        return data
+
+    def _reply_okay(self, payload: bytes) -> None:
+        """Sends `OKAY` and a length-prefixed payload."""
+        self.request.sendall(b"OKAY" + b"%04x" % len(payload) + payload)
+
+    def _reply_fail(self, message: str) -> None:
+        """Sends `FAIL` and a length-prefixed message."""
+        payload = message.encode("utf-8")
+        self.request.sendall(b"FAIL" + b"%04x" % len(payload) + payload)
+
+class FakeAdbServer(socketserver.ThreadingTCPServer):
+    """A threading TCP server pretending to be the adb server."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, port: int, serials: typing.List[str], input_latency: float) -> None:
+        """Binds to localhost:`port`."""
+        super().__init__(("127.0.0.1", port), FakeAdbHandler)
+        self.devices = {serial: "device" for serial in serials}
+        self.devices_changed = threading.Condition()
+        self.generation = 0
+        self.input_latency = input_latency
+
+    def get_devices_payload(self) -> bytes:
+        """Returns the `host:devices` listing."""
+        with self.devices_changed:
+            return "".join(f"{serial}\t{state}\n" for serial, state in self.devices.items()).encode("utf-8")
+
+    def get_online_serials(self) -> typing.List[str]:
+        """Returns the serials of devices in the `device` state."""
+        with self.devices_changed:
+            return [serial for serial, state in self.devices.items() if state == "device"]
+
+    def set_device_state(self, serial: str, state: str) -> None:
+        """Adds, updates or removes a device and notifies trackers."""
+        click.echo(f"device {serial}: {state}", err=True)
+
+        with self.devices_changed:
+            if state == "disconnected":
+                self.devices.pop(serial, None)
+            else:
+                self.devices[serial] = state
+
+            self.generation += 1
+            self.devices_changed.notify_all()
+
+    def run_shell_command(self, command: str) -> bytes:
+        """Runs a device shell command locally and returns its output."""
+        click.echo(f"shell: {command}", err=True)
+
+        result = subprocess.run(
+            ["sh", "-c", f"input() {{ sleep {self.input_latency}; }}; {command}"],
+            capture_output=True,
+        )
+
+        return result.stdout + result.stderr
+
+@click.command()
+@click.option("--port", type=click.INT, default=5037, show_default=True, help="Port to listen on.")
+@click.option("--serial", "serials", multiple=True, default=["emulator-5554"], show_default=True, help="Serial of a fake device; repeat for several.")
+@click.option("--input-latency", type=click.FLOAT, default=0.0, show_default=True, help="Seconds `input` takes.")
+def main(port: int, serials: typing.Tuple[str, ...], input_latency: float) -> None:
+    """Runs the fake adb server until interrupted."""
+    with FakeAdbServer(port=port, serials=list(serials), input_latency=input_latency) as server:
+        click.echo(f"Fake adb server on 127.0.0.1:{port} with devices {', '.join(serials)}.", err=True)
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
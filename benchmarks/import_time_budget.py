@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+"""
+Checks code4swipe's start-up import cost with `python -X importtime`.
+
+Fails if importing the CLI module pulls in an implementation module
+that only the selected detector or provider should load, or takes
+longer than the budget, and if importing it or building the parts a run
+with default options builds imports importlib.metadata (entry points
+are only scanned for names that are not built in) or asyncio.
+
+Usage:
+    python benchmarks/import_time_budget.py --budget-ms 100
+"""
+
+import pathlib
+import subprocess
+import sys
+import typing
+
+import click
+
+# Make the repository's packages importable when run as a script.
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from factories.Impl_factory_swipe_provider import SWIPE_PROVIDER_REGISTRY
+from factories.impl_factory_gesture_backend import GESTURE_BACKEND_REGISTRY
+from factories.impl_factory_git_diff_changes_detector import CHANGE_DETECTOR_REGISTRY
+from factories.impl_factory_git_diff_provider import GIT_DIFF_PROVIDER_REGISTRY
+from factories.impl_factory_runtime import RUNTIME_REGISTRY
+from factories.impl_factory_watcher import WATCHER_REGISTRY
+
+#: Implementation modules that may load at start-up anyway: the change
+#: detector base class falls back to the subprocess provider.
+ALLOWED_MODULES: typing.Final[typing.Set[str]] = {
+    "diff_providers.git_diff_provider_subprocess",
+}
+
+#: Modules that must stay off the start-up path; asyncio is only
+#: needed by `--runtime asyncio`.
+FORBIDDEN_MODULES: typing.Final[typing.Set[str]] = {
+    "importlib.metadata",
+    "asyncio",
+}
+
+#: Builds what `code4swipe` builds with its default options, in this
+#: repository, without starting the main loop.
+DEFAULT_STARTUP_STATEMENT: typing.Final[str] = """
+import pathlib
+
+import code4swipe
+from factories.Impl_factory_swipe_provider import ImplFactorySwipeProvider
+from factories.impl_factory_git_diff_changes_detector import ImplFactoryGitDiffChangesDetector
+from factories.impl_factory_git_diff_provider import ImplFactoryGitDiffProvider
+from factories.impl_factory_runtime import ImplFactoryRuntime
+from factories.impl_factory_watcher import ImplFactoryWatcher
+from swipe_providers.swipe_provider_coalescing import SwipeProviderCoalescing
+from utils.detector_state_file import DetectorStateFile
+
+defaults = {parameter.name: parameter.default for parameter in code4swipe.main.params}
+repo_path = pathlib.Path(".")
+
+provider = ImplFactorySwipeProvider(
+    verbose=False,
+    gesture_backend_name=defaults["gesture_backend_name"],
+    timeout=defaults["adb_timeout"],
+).get_impl_instance(defaults["provider_name"])
+provider = SwipeProviderCoalescing(
+    inner=provider,
+    window=defaults["reward_window"],
+    max_per_minute=defaults["max_swipes_per_minute"],
+)
+diff_provider = ImplFactoryGitDiffProvider(
+    verbose=False,
+    timeout=defaults["git_timeout"],
+).get_impl_instance(defaults["diff_provider_name"])
+detector = ImplFactoryGitDiffChangesDetector(
+    repo_path=repo_path,
+    diff_provider=diff_provider,
+    state_file=DetectorStateFile.for_repo(repo_path, detector_name=defaults["detector_name"]),
+).get_impl_instance(defaults["detector_name"])
+watcher = ImplFactoryWatcher(
+    repo_path=repo_path,
+    poll_interval=defaults["poll_interval"],
+    min_poll_interval=defaults["min_poll_interval"],
+    max_poll_interval=defaults["max_poll_interval"],
+    verbose=False,
+).get_impl_instance(defaults["watch_mode"])
+runtime = ImplFactoryRuntime(
+    detector=detector,
+    provider=provider,
+    watcher=watcher,
+    verbose=False,
+).get_impl_instance(defaults["runtime_name"])
+"""
+
+class ImportTime(typing.NamedTuple):
+    """One line of `-X importtime` output, in microseconds."""
+    self_us: int
+    cumulative_us: int
+    module: str
+
+def measure_imports(statement: str) -> typing.List[ImportTime]:
+    """Runs `statement` in a fresh interpreter and parses its import times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times: typing.List[ImportTime] = []
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        import_times.append(ImportTime(int(self_us), int(cumulative_us), module.strip()))
+
+    return import_times
+
+def get_implementation_modules() -> typing.Set[str]:
+    """Returns the modules of every built-in implementation."""
+    modules: typing.Set[str] = set()
+
+    for registry in (
+        SWIPE_PROVIDER_REGISTRY,
+        GESTURE_BACKEND_REGISTRY,
+        CHANGE_DETECTOR_REGISTRY,
+        GIT_DIFF_PROVIDER_REGISTRY,
+        RUNTIME_REGISTRY,
+        WATCHER_REGISTRY,
+    ):
+        modules.update(reference.partition(":")[0] for reference in registry.builtin_references.values())
+
+    return modules
+
+@click.command()
+@click.option("--budget-ms", type=click.FLOAT, default=100.0, show_default=True, help="Maximum milliseconds `import code4swipe` may take.")
+@click.option("--runs", type=click.INT, default=5, show_default=True, help="Runs; the fastest one is compared with the budget.")
+@click.option("--top", type=click.INT, default=10, show_default=True, help="Number of slowest modules to list.")
+def main(budget_ms: float, runs: int, top: int) -> None:
+    """Checks what `import code4swipe` imports and how long it takes."""
+    measurements = [measure_imports("import code4swipe") for _ in range(runs)]
+    fastest = min(measurements, key=lambda import_times: import_times[-1].cumulative_us)
+    total_ms = fastest[-1].cumulative_us / 1000
+
+    click.echo(f"import code4swipe: {total_ms:.1f} ms (fastest of {runs}, budget {budget_ms:.1f} ms)")
+    click.echo("Slowest modules (self time):")
+
+    for import_time in sorted(fastest, key=lambda import_time: import_time.self_us, reverse=True)[:top]:
+        click.echo(f"  {import_time.self_us / 1000:6.1f} ms  {import_time.module}")
+
+    imported = {import_time.module for import_time in fastest}
+    unexpected = sorted(((get_implementation_modules() - ALLOWED_MODULES) | FORBIDDEN_MODULES) & imported)
+    failures: typing.List[str] = [f"imported by `import code4swipe`: {module}" for module in unexpected]
+
+    # The default implementations are meant to load here, the forbidden modules still are not.
+    imported_by_default_run = {import_time.module for import_time in measure_imports(DEFAULT_STARTUP_STATEMENT)}
+    failures.extend(f"imported by a run with default options: {module}" for module in sorted(FORBIDDEN_MODULES & imported_by_default_run))
+
+    if total_ms > budget_ms:
+        failures.append(f"{total_ms:.1f} ms is over the budget of {budget_ms:.1f} ms")
+
+    for failure in failures:
+        click.echo(f"FAIL: {failure}", err=True)
+
+    if failures:
+        sys.exit(1)
+
+    click.echo("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Generates throwaway git repositories with a configurable shape, for the
+benchmarks in this directory.
+"""
+
+import os
+import pathlib
+import random
+import subprocess
+import time
+import typing
+
+#: Identity for the generated commits, independent of the user's config.
+GIT_ENVIRONMENT: typing.Final[typing.Dict[str, str]] = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+    "GIT_CONFIG_NOSYSTEM": "1",
+}
+
+#: How far back generated files are dated. Files modified within git's
+#: racy window (GIT_RACY_WINDOW_NS in the snapshot's terms) before a poll
+#: are re-hashed, which would make the first idle polls look slow.
+BACKDATE_SECONDS: typing.Final[float] = 10.0
+
+class SyntheticRepoSpec(typing.NamedTuple):
+    """The shape of a generated repository."""
+    #: Number of committed files.
+    file_count: int
+    #: Lines per file.
+    lines_per_file: int
+    #: Characters per line, including the newline; sets the file size.
+    line_length: int = 40
+    #: Fraction of files that are modified in the worktree.
+    dirty_ratio: float = 0.1
+    #: Fraction of lines rewritten in each modified file; sets the diff size.
+    changed_line_ratio: float = 0.1
+    #: Seed for picking the modified files.
+    seed: int = 0
+
+class SyntheticRepo(typing.NamedTuple):
+    """A generated repository and the size of its diff."""
+    path: pathlib.Path
+    file_paths: typing.List[pathlib.Path]
+    dirty_file_count: int
+    diff_bytes: int
+
+def make_line(file_index: int, line_index: int, line_length: int, prefix: str = "") -> str:
+    """Returns one line of exactly `line_length` characters, newline included."""
+    text = f"{prefix}line {line_index} of file {file_index} "
+    return (text * (line_length // len(text) + 1))[:max(line_length - 1, 0)] + "\n"
+
+def is_changed_line(line_index: int, ratio: float) -> bool:
+    """Spreads `ratio` of the lines evenly over a file."""
+    return int((line_index + 1) * ratio) > int(line_index * ratio)
+
+def backdate(file_path: pathlib.Path, seconds: float = BACKDATE_SECONDS) -> None:
+    """Sets a file's access and modification times `seconds` into the past."""
+    timestamp_ns = time.time_ns() - int(seconds * 1_000_000_000)
+    os.utime(file_path, ns=(timestamp_ns, timestamp_ns))
+
+def create_synthetic_repo(repo_path: pathlib.Path, spec: SyntheticRepoSpec) -> SyntheticRepo:
+    """
+    Commits `spec.file_count` files, then rewrites lines of a share of
+    them so the worktree has a diff of the requested size.
+
+    Args:
+        repo_path: An empty directory to create the repository in.
+        spec: The repository's shape.
+    """
+    subprocess.run(["git", "init", "-q", str(repo_path)], check=True, env=GIT_ENVIRONMENT)
+
+    file_paths: typing.List[pathlib.Path] = []
+
+    for file_index in range(spec.file_count):
+        file_path = repo_path / f"dir{file_index % 64:02d}" / f"file{file_index:06d}.txt"
+        file_path.parent.mkdir(exist_ok=True)
+        file_path.write_text("".join(make_line(file_index, line_index, spec.line_length) for line_index in range(spec.lines_per_file)))
+        # Older than the rewrites below, so those always move the mtime.
+        backdate(file_path, seconds=2 * BACKDATE_SECONDS)
+        file_paths.append(file_path)
+
+    subprocess.run(["git", "-C", str(repo_path), "add", "-A"], check=True, env=GIT_ENVIRONMENT)
+    subprocess.run(["git", "-C", str(repo_path), "commit", "-q", "-m", "base"], check=True, env=GIT_ENVIRONMENT)
+
+    dirty_count = round(spec.file_count * spec.dirty_ratio)
+    dirty_indices = sorted(random.Random(spec.seed).sample(range(spec.file_count), dirty_count))
+
+    for file_index in dirty_indices:
+        file_paths[file_index].write_text("".join(
+            make_line(file_index, line_index, spec.line_length, prefix="changed " if is_changed_line(line_index, spec.changed_line_ratio) else "")
+            for line_index in range(spec.lines_per_file)
+        ))
+        backdate(file_paths[file_index])
+
+    diff = subprocess.run(["git", "-C", str(repo_path), "diff"], capture_output=True, check=True).stdout
+
+    return SyntheticRepo(
+        path=repo_path,
+        file_paths=file_paths,
+        dirty_file_count=dirty_count,
+        diff_bytes=len(diff),
+    )
@@ -1,35 +1,75 @@
 from base.git_diff_changes_detector_base import GitDiffChangesDetectorBase
-from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+
+import hashlib
+import typing
 
 class GitDiffChangesDetectorExact(GitDiffChangesDetectorBase):
     """
-    Detects new work by checking if the whole git diff string has changed
-    (i.e., is not equal to the last recorded diff string).
+    Detects new work by checking if the whole git diff has changed
+    (i.e., its digest is not equal to the last recorded digest).
+
+    The diff is streamed through blake2b, so only the digest and the
+    byte length are kept, however large the diff is.
 
     Note: This will trigger a reward on ANY change, including deletions.
     """
 
-    def get_current_state(self) -> str:
-        """Returns the entire current git diff string."""
-        diff_provider = GitDiffProviderSubprocess()
-        return diff_provider.get_current_git_diff(repo_path=self.repo_path)
+    def get_current_state(self) -> typing.Tuple[str, int]:
+        """Returns the digest and the byte length of the current git diff."""
+        digest = hashlib.blake2b()
+        length = 0
+
+        for chunk in self.diff_provider.iter_current_git_diff_chunks(repo_path=self.repo_path):
+            digest.update(chunk)
+            length += len(chunk)
+
+        return digest.hexdigest(), length
+
+    async def get_current_state_async(self) -> typing.Tuple[str, int]:
+        """Returns the digest and the byte length without blocking the event loop."""
+        digest = hashlib.blake2b()
+        length = 0
+
+        async for chunk in self.diff_provider.aiter_current_git_diff_chunks(repo_path=self.repo_path):
+            digest.update(chunk)
+            length += len(chunk)
+
+        return digest.hexdigest(), length
+
+    def load_state(self, data: typing.Any) -> typing.Tuple[str, int]:
+        """Converts the digest and length saved as a JSON list back into a tuple."""
+        diff_digest, diff_length = data
+
+        if not isinstance(diff_digest, str) or not isinstance(diff_length, int):
+            raise TypeError(f"expected a digest and a length, got {data!r}")
+
+        return diff_digest, diff_length
 
     def check_for_new_work(self) -> bool:
         """
-        Triggers a reward if the current diff string is NOT EQUAL to
-        the last recorded diff string.
+        Triggers a reward if the current diff digest is NOT EQUAL to
+        the last recorded digest.
         """
-        current_diff = self.get_current_state()
-        has_new_work = current_diff != self._last_state
+        current_state = self.get_current_state()
+        has_new_work = current_state != self._last_state
+
+        # Always update the baseline to the current state.
+        self._last_state = current_state
+
+        return has_new_work
+
+    async def check_for_new_work_async(self) -> bool:
+        """Asynchronous variant of check_for_new_work()."""
+        current_state = await self.get_current_state_async()
+        has_new_work = current_state != self._last_state
 
         # Always update the baseline to the current state.
-        self._last_state = current_diff
+        self._last_state = current_state
 
         return has_new_work
 
     @property
     def initial_status_message(self) -> str:
-        """Returns a string describing the initial state (diff hash)."""
-        # Using hash of the diff string for a compact status message
-        diff_hash = hash(self._last_state)
-        return f"Initial diff hash: {diff_hash}. Waiting for ANY change..."
+        """Returns a string describing the initial state (diff digest)."""
+        diff_digest, diff_length = self._last_state
+        return f"Initial diff digest: {diff_digest[:16]} ({diff_length} bytes). Waiting for ANY change..."
@@ -1,5 +1,6 @@
 from base.git_diff_changes_detector_base import GitDiffChangesDetectorBase
-from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+
+import typing
 
 class GitDiffChangesDetectorLineCount(GitDiffChangesDetectorBase):
     """
@@ -9,10 +10,36 @@ class GitDiffChangesDetectorLineCount(GitDiffChangesDetectorBase):
 
     def get_current_state(self) -> int:
         """Returns the number of lines in the current git diff."""
-        diff_provider = GitDiffProviderSubprocess()
-        diff_string = diff_provider.get_current_git_diff(repo_path=self.repo_path)
+        line_count = 0
+        last_byte = b"\n"
+
+        # Count raw newlines chunk by chunk; no decoding needed.
+        for chunk in self.diff_provider.iter_current_git_diff_chunks(repo_path=self.repo_path):
+            if chunk:
+                line_count += chunk.count(b"\n")
+                last_byte = chunk[-1:]
+
+        # An unterminated last line still counts.
+        return line_count if last_byte == b"\n" else line_count + 1
+
+    async def get_current_state_async(self) -> int:
+        """Returns the number of lines without blocking the event loop."""
+        line_count = 0
+        last_byte = b"\n"
+
+        async for chunk in self.diff_provider.aiter_current_git_diff_chunks(repo_path=self.repo_path):
+            if chunk:
+                line_count += chunk.count(b"\n")
+                last_byte = chunk[-1:]
+
+        return line_count if last_byte == b"\n" else line_count + 1
+
+    def load_state(self, data: typing.Any) -> int:
+        """Checks that the saved state is a line count."""
+        if not isinstance(data, int) or isinstance(data, bool):
+            raise TypeError(f"expected a line count, got {data!r}")
 
-        return len(diff_string.splitlines())
+        return data
 
     def check_for_new_work(self) -> bool:
         """
@@ -27,6 +54,16 @@ class GitDiffChangesDetectorLineCount(GitDiffChangesDetectorBase):
 
         return has_new_work
 
+    async def check_for_new_work_async(self) -> bool:
+        """Asynchronous variant of check_for_new_work()."""
+        current_count = await self.get_current_state_async()
+        has_new_work = current_count != self._last_state
+
+        # Always update the baseline to the current state.
+        self._last_state = current_count
+
+        return has_new_work
+
     @property
     def initial_status_message(self) -> str:
         """Returns a string describing the initial state (line count)."""
@@ -0,0 +1,67 @@
+from base.git_diff_changes_detector_base import GitDiffChangesDetectorBase
+from utils.git_diff_parsing import GitNumstat
+
+import typing
+
+class GitDiffChangesDetectorNumstat(GitDiffChangesDetectorBase):
+    """
+    Detects new work by checking if the number of changed files or the
+    total number of added or deleted lines in the git diff has changed.
+
+    Uses the per-file counts of `git diff --numstat`, so only a few
+    bytes per file are transferred instead of the whole patch.
+    """
+
+    def get_current_state(self) -> typing.Tuple[int, int, int]:
+        """Returns the number of changed files, added lines and deleted lines."""
+        return self._summarize(self.diff_provider.get_current_git_numstat(repo_path=self.repo_path))
+
+    async def get_current_state_async(self) -> typing.Tuple[int, int, int]:
+        """Returns the totals without blocking the event loop."""
+        return self._summarize(await self.diff_provider.get_current_git_numstat_async(repo_path=self.repo_path))
+
+    def load_state(self, data: typing.Any) -> typing.Tuple[int, int, int]:
+        """Converts the totals saved as a JSON list back into a tuple."""
+        file_count, added_count, deleted_count = data
+
+        if not all(isinstance(count, int) for count in (file_count, added_count, deleted_count)):
+            raise TypeError(f"expected three counts, got {data!r}")
+
+        return file_count, added_count, deleted_count
+
+    def check_for_new_work(self) -> bool:
+        """
+        Triggers a reward if any of the totals is NOT EQUAL to the
+        last recorded one.
+        """
+        current_state = self.get_current_state()
+        has_new_work = current_state != self._last_state
+
+        # Always update the baseline to the current state.
+        self._last_state = current_state
+
+        return has_new_work
+
+    async def check_for_new_work_async(self) -> bool:
+        """Asynchronous variant of check_for_new_work()."""
+        current_state = await self.get_current_state_async()
+        has_new_work = current_state != self._last_state
+
+        # Always update the baseline to the current state.
+        self._last_state = current_state
+
+        return has_new_work
+
+    @property
+    def initial_status_message(self) -> str:
+        """Returns a string describing the initial state (file and line totals)."""
+        file_count, added_count, deleted_count = self._last_state
+        return f"Initial diff: {file_count} files, +{added_count} -{deleted_count}. Waiting for new code..."
+
+    def _summarize(self, numstats: typing.List[GitNumstat]) -> typing.Tuple[int, int, int]:
+        """Sums per-file counts up; binary files count as changed files only."""
+        return (
+            len(numstats),
+            sum(numstat.added or 0 for numstat in numstats),
+            sum(numstat.deleted or 0 for numstat in numstats),
+        )
@@ -9,22 +9,45 @@ based on a chosen strategy (e.g., increased line count), it executes
 a swipe up command using a chosen provider.
 """
 
-from constants.constants import DEFAULT_POLL_INTERVAL
-from constants.enums import ChangeDetectors, SwipeProviders
-from factories.Impl_factory_swipe_provider import ImplFactorySwipeProvider
-from factories.impl_factory_git_diff_changes_detector import ImplFactoryGitDiffChangesDetector
+from base.git_diff_provider_base import GitDiffUnavailableError
+from constants.constants import (
+    DEFAULT_ADB_TIMEOUT,
+    DEFAULT_GIT_TIMEOUT,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MAX_SWIPES_PER_MINUTE,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REWARD_WINDOW,
+)
+from constants.enums import ChangeDetectors, GestureBackends, GitDiffProviders, Runtimes, SwipeProviders, WatchModes
+from factories.Impl_factory_swipe_provider import SWIPE_PROVIDER_REGISTRY, ImplFactorySwipeProvider
+from factories.impl_factory_gesture_backend import GESTURE_BACKEND_REGISTRY
+from factories.impl_factory_git_diff_changes_detector import CHANGE_DETECTOR_REGISTRY, ImplFactoryGitDiffChangesDetector
+from factories.impl_factory_git_diff_provider import GIT_DIFF_PROVIDER_REGISTRY, ImplFactoryGitDiffProvider
+from factories.impl_factory_runtime import RUNTIME_REGISTRY, ImplFactoryRuntime
+from factories.impl_factory_watcher import WATCHER_REGISTRY, ImplFactoryWatcher
+from utils.detector_state_file import DetectorStateFile
+from utils.impl_registry import ImplChoice
 
 import os
 import pathlib
+import signal
 import sys
 import time
+import typing
 
 import click
 
 
+def raise_keyboard_interrupt(signum: int, frame: typing.Any) -> None:
+    """Signal handler that stops the main loop the way CTRL+C does."""
+    raise KeyboardInterrupt
+
+
 # --- CLI Interface ---
 
-@click.command(
+@click.group(
+    invoke_without_command=True,
     context_settings=dict(
         help_option_names=[
             "-h",
@@ -49,32 +72,169 @@ import click
 @click.option(
     "--provider",
     "provider_name",
-    type=click.Choice(
-        list(SwipeProviders),
-        case_sensitive=False,
-    ),
-    default=SwipeProviders.ADB,
+    type=ImplChoice(SWIPE_PROVIDER_REGISTRY),
+    default=SwipeProviders.ADB.value,
     show_default=True,
     help="The swipe provider to use.",
 )
+@click.option(
+    "--device",
+    "device_serial",
+    envvar="ANDROID_SERIAL",
+    default=None,
+    help="Serial of the Android device to swipe on (see `adb devices`). Defaults to $ANDROID_SERIAL, or the only connected device.",
+)
+@click.option(
+    "--gesture",
+    "gesture_backend_name",
+    type=ImplChoice(GESTURE_BACKEND_REGISTRY),
+    default=GestureBackends.INPUT.value,
+    show_default=True,
+    help="How ADB providers perform the swipe: `input swipe`, or raw touchscreen events written with `sendevent`.",
+)
+@click.option(
+    "--follow-rotation",
+    "follow_rotation",
+    is_flag=True,
+    default=False,
+    help="Read the display rotation on the device in every swipe (one `dumpsys input`, tens of milliseconds) instead of once.",
+)
+@click.option(
+    "--track-devices",
+    "track_devices",
+    is_flag=True,
+    default=False,
+    help="Follow device (dis)connects through the adb server in the background, so swipes on an offline device are skipped instantly.",
+)
+@click.option(
+    "--reward-window",
+    "reward_window",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_REWARD_WINDOW,
+    show_default=True,
+    help="Merge rewards found within this many seconds after a swipe into it. 0 disables merging.",
+)
+@click.option(
+    "--max-swipes-per-minute",
+    "max_swipes_per_minute",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_MAX_SWIPES_PER_MINUTE,
+    show_default=True,
+    help="Drop rewards beyond this swipe rate (short bursts allowed). 0 disables the cap.",
+)
+@click.option(
+    "--adb-timeout",
+    "adb_timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_ADB_TIMEOUT,
+    show_default=True,
+    help="Seconds one adb call may take before it is killed.",
+)
 @click.option(
     "--changes",
     "detector_name",
-    type=click.Choice(
-        list(ChangeDetectors),
-        case_sensitive=False,
-    ),
+    type=ImplChoice(CHANGE_DETECTOR_REGISTRY),
     default=ChangeDetectors.EXACT.value,
     show_default=True,
     help="The strategy to detect new code changes.",
 )
+@click.option(
+    "--diff-provider",
+    "diff_provider_name",
+    type=ImplChoice(GIT_DIFF_PROVIDER_REGISTRY),
+    default=GitDiffProviders.SUBPROCESS.value,
+    show_default=True,
+    help="The way git diffs are obtained.",
+)
+@click.option(
+    "--stat-guard/--no-stat-guard",
+    "stat_guard",
+    default=False,
+    show_default=True,
+    help="Only ask the diff provider for a diff when tracked files' stat data moved.",
+)
+@click.option(
+    "--git-timeout",
+    "git_timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_GIT_TIMEOUT,
+    show_default=True,
+    help="Seconds one git call may take before it is killed.",
+)
+@click.option(
+    "--warm-start/--no-warm-start",
+    "warm_start",
+    default=True,
+    show_default=True,
+    help="Keep the baseline in the git dir, so start-up needs no diff and changes made while stopped are rewarded.",
+)
+@click.option(
+    "--record",
+    "record_path",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    default=None,
+    help="Append every polled diff to this directory, for `code4swipe replay`.",
+)
 @click.option(
     "--poll-interval",
     "poll_interval",
     type=click.FLOAT,
     default=DEFAULT_POLL_INTERVAL,
     show_default=True,
-    help="The interval in seconds to check the git repository for changes.",
+    help="The initial interval in seconds to check the git repository for changes.",
+)
+@click.option(
+    "--min-poll-interval",
+    "min_poll_interval",
+    type=click.FLOAT,
+    default=DEFAULT_MIN_POLL_INTERVAL,
+    show_default=True,
+    help="The shortest interval, used while new changes keep arriving.",
+)
+@click.option(
+    "--max-poll-interval",
+    "max_poll_interval",
+    type=click.FLOAT,
+    default=DEFAULT_MAX_POLL_INTERVAL,
+    show_default=True,
+    help="The longest interval, reached by backing off while the repository is idle.",
+)
+@click.option(
+    "--watch",
+    "watch_mode",
+    type=ImplChoice(WATCHER_REGISTRY),
+    default=WatchModes.POLL.value,
+    show_default=True,
+    help="How to wait between checks: a fixed sleep, or inotify events (Linux).",
+)
+@click.option(
+    "--runtime",
+    "runtime_name",
+    type=ImplChoice(RUNTIME_REGISTRY),
+    default=Runtimes.SYNC.value,
+    show_default=True,
+    help="How the main loop runs: one blocking loop, or asyncio tasks that keep detecting while a swipe is slow.",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    default=False,
+    help="Time every phase of the loop and print a latency summary on exit and on SIGUSR1.",
+)
+@click.option(
+    "--metrics-port",
+    "metrics_port",
+    type=click.IntRange(min=0, max=65535),
+    default=None,
+    help="Serve Prometheus metrics on http://127.0.0.1:<port>/metrics.",
+)
+@click.option(
+    "--metrics-textfile",
+    "metrics_textfile",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    default=None,
+    help="Keep Prometheus metrics in this file, for node exporter's textfile collector.",
 )
 @click.option(
     "--verbose",
@@ -83,11 +243,32 @@ import click
     default=False,
     help="Enable verbose logging for provider actions.",
 )
+@click.pass_context
 def main(
+    ctx: click.Context,
     repo_path: pathlib.Path,
     provider_name: str,
+    device_serial: typing.Optional[str],
+    gesture_backend_name: str,
+    follow_rotation: bool,
+    track_devices: bool,
+    reward_window: float,
+    max_swipes_per_minute: float,
+    adb_timeout: float,
     detector_name: str,
+    diff_provider_name: str,
+    stat_guard: bool,
+    git_timeout: float,
+    warm_start: bool,
+    record_path: typing.Optional[pathlib.Path],
     poll_interval: float,
+    min_poll_interval: float,
+    max_poll_interval: float,
+    watch_mode: str,
+    runtime_name: str,
+    show_stats: bool,
+    metrics_port: typing.Optional[int],
+    metrics_textfile: typing.Optional[pathlib.Path],
     verbose: bool,
 ) -> None:
     """
@@ -96,6 +277,8 @@ def main(
 
     This is a "Dopamine CLI" for coders! 🚀
     """
+    if ctx.invoked_subcommand is not None:
+        return
 
     # Check for Python version compatibility
     if sys.version_info < (3, 11):
@@ -109,40 +292,306 @@ def main(
     if verbose:
         click.echo("Verbose mode enabled.", err=True)
 
+    if min_poll_interval > max_poll_interval:
+        raise click.BadParameter(
+            f"must not be greater than --max-poll-interval ({max_poll_interval}).",
+            param_hint="--min-poll-interval",
+        )
+
+    # Optional parts are imported only when their option asks for them, to keep start-up short.
+    device_monitor = None
+    stats = None
+    export_metrics = metrics_port is not None or metrics_textfile is not None
+    exporters: typing.List[typing.Any] = []
+    recording_writer = None
+
+    if track_devices:
+        from utils.adb_device_monitor import AdbDeviceMonitor
+
+        device_monitor = AdbDeviceMonitor(verbose=verbose)
+
+    if show_stats or export_metrics:
+        from metrics.poll_stats import PollStats
+
+        stats = PollStats()
+
     try:
         # Initialize Swipe Provider
-        provider_factory = ImplFactorySwipeProvider(verbose=verbose)
+        provider_factory = ImplFactorySwipeProvider(
+            verbose=verbose,
+            serial=device_serial,
+            gesture_backend_name=gesture_backend_name,
+            follow_rotation=follow_rotation,
+            device_monitor=device_monitor,
+            timeout=adb_timeout,
+        )
         provider = provider_factory.get_impl_instance(provider_name)
 
+        if reward_window > 0 or max_swipes_per_minute > 0:
+            from swipe_providers.swipe_provider_coalescing import SwipeProviderCoalescing
+
+            provider = SwipeProviderCoalescing(
+                inner=provider,
+                window=reward_window,
+                max_per_minute=max_swipes_per_minute,
+                verbose=verbose,
+            )
+
+        # Initialize Git Diff Provider
+        diff_provider_factory = ImplFactoryGitDiffProvider(verbose=verbose, timeout=git_timeout)
+        diff_provider = diff_provider_factory.get_impl_instance(diff_provider_name)
+
+        if stat_guard:
+            from diff_providers.git_diff_provider_stat_guarded import GitDiffProviderStatGuarded
+
+            diff_provider = GitDiffProviderStatGuarded(
+                inner=diff_provider,
+                verbose=verbose,
+                timeout=git_timeout,
+            )
+
+        if record_path is not None:
+            from diff_providers.git_diff_provider_recording import GitDiffProviderRecording
+            from utils.diff_recording import DiffRecordingWriter
+
+            try:
+                recording_writer = DiffRecordingWriter(path=record_path)
+            except OSError as exception:
+                click.echo(f"Error: can not record to {record_path}: {exception}. Exiting.", err=True)
+                sys.exit(1)
+
+            diff_provider = GitDiffProviderRecording(
+                inner=diff_provider,
+                writer=recording_writer,
+            )
+
+        if stats is not None:
+            from diff_providers.git_diff_provider_timed import GitDiffProviderTimed
+
+            diff_provider = GitDiffProviderTimed(
+                inner=diff_provider,
+                stats=stats,
+            )
+
         # Initialize Git Diff Detector
-        detector_factory = ImplFactoryGitDiffChangesDetector(repo_path=repo_path)
+        detector_factory = ImplFactoryGitDiffChangesDetector(
+            repo_path=repo_path,
+            diff_provider=diff_provider,
+            state_file=DetectorStateFile.for_repo(repo_path, detector_name=detector_name, verbose=verbose) if warm_start else None,
+        )
         detector = detector_factory.get_impl_instance(detector_name)
+
+        # Initialize Watcher
+        watcher_factory = ImplFactoryWatcher(
+            repo_path=repo_path,
+            poll_interval=poll_interval,
+            min_poll_interval=min_poll_interval,
+            max_poll_interval=max_poll_interval,
+            verbose=verbose,
+        )
+        watcher = watcher_factory.get_impl_instance(watch_mode)
+
+        # Initialize Runtime
+        runtime_factory = ImplFactoryRuntime(
+            detector=detector,
+            provider=provider,
+            watcher=watcher,
+            verbose=verbose,
+            stats=stats,
+        )
+        runtime = runtime_factory.get_impl_instance(runtime_name)
     except click.Abort:
         click.echo("Failed to initialize. Exiting.", err=True)
         sys.exit(1)
+    except GitDiffUnavailableError as exception:
+        click.echo(f"Error: reading the initial diff failed: {exception}. Exiting.", err=True)
+        sys.exit(1)
+
+    if stats is not None and export_metrics:
+        from metrics.metrics_exporter import MetricsHttpServer, MetricsTextfileWriter
+
+        if metrics_port is not None:
+            try:
+                exporters.append(MetricsHttpServer(stats=stats, port=metrics_port))
+            except OSError as exception:
+                click.echo(f"Error: can not serve metrics on port {metrics_port}: {exception}. Exiting.", err=True)
+                sys.exit(1)
+
+        if metrics_textfile is not None:
+            exporters.append(MetricsTextfileWriter(stats=stats, path=metrics_textfile))
 
     click.echo("---")
     click.echo(f"Monitoring git diff in: `{detector.repo_path}` using `{detector_name}` strategy.")
     click.echo(detector.initial_status_message)
-    click.echo(f"Polling interval: {poll_interval} seconds.")
+
+    if detector.is_warm_start:
+        click.echo("Resumed from the saved baseline; changes made while stopped are rewarded on the first check.")
+
+    click.echo(f"Waiting for changes: {watcher.description}.")
     click.echo("🚀 code4swipe is running! Start writing code.")
     click.echo("Press CTRL+C to exit.")
 
-    try:
-        while True:
-            if detector.check_for_new_work():
-                provider.swipe_up()
+    if device_monitor is not None:
+        device_monitor.start()
+
+    for exporter in exporters:
+        exporter.start()
+        click.echo(f"Exporting metrics to {exporter.description}.")
 
-                click.echo(
-                    f"[{time.strftime("%H:%M:%S")}] "
-                    "New code detected! Swiping for dopamine... 📱"
-                )
+    if recording_writer is not None:
+        click.echo(f"Recording diffs to {recording_writer.path}.")
 
-            time.sleep(poll_interval)
+    if show_stats and hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: click.echo(stats.describe(), err=True))
+        click.echo(f"Send SIGUSR1 (kill -USR1 {os.getpid()}) to print the stats.")
 
+    # Shut down on SIGTERM (e.g. from a service manager) like on CTRL+C.
+    signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+
+    try:
+        runtime.run()
     except KeyboardInterrupt:
-        click.echo("\n👋 Exiting. Happy coding!")
-        sys.exit(0)
+        pass
+    finally:
+        # Also runs when the runtime died of an unexpected error.
+        watcher.close()
+        provider.close()
+        diff_provider.close()
+
+        if device_monitor is not None:
+            device_monitor.close()
+
+        for exporter in exporters:
+            exporter.close()
+
+        if recording_writer is not None:
+            recording_writer.close()
+
+        detector.save_state()
+
+        if show_stats:
+            click.echo(stats.describe(), err=True)
+
+    click.echo("\n👋 Exiting. Happy coding!")
+    sys.exit(0)
+
+
+@main.command()
+@click.argument(
+    "recording_path",
+    type=click.Path(
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        readable=True,
+        path_type=pathlib.Path,
+    ),
+)
+@click.option(
+    "--changes",
+    "detector_names",
+    type=ImplChoice(CHANGE_DETECTOR_REGISTRY),
+    multiple=True,
+    help="A strategy to replay; repeat to compare several.  [default: all built-in]",
+)
+@click.option(
+    "--repeat",
+    "repeat_count",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Replay the recording this many times per strategy, for steadier throughput numbers.",
+)
+@click.option(
+    "--timeline/--no-timeline",
+    "show_timeline",
+    default=True,
+    show_default=True,
+    help="List every poll that would have been rewarded, and by which strategies.",
+)
+def replay(
+    recording_path: pathlib.Path,
+    detector_names: typing.Tuple[str, ...],
+    repeat_count: int,
+    show_timeline: bool,
+) -> None:
+    """
+    Feeds a recording made with --record through change detection
+    strategies at full speed, without touching a repository, and
+    reports the rewards each would give and its throughput.
+    """
+    from diff_providers.git_diff_provider_replay import GitDiffProviderReplay
+    from utils.diff_recording import load_diff_recording
+
+    try:
+        recording = load_diff_recording(recording_path)
+    except (OSError, ValueError) as exception:
+        click.echo(f"Error: can not load the recording: {exception}. Exiting.", err=True)
+        sys.exit(1)
+
+    if len(recording.polls) < 2:
+        click.echo("Error: the recording needs at least two polls: a baseline and a check. Exiting.", err=True)
+        sys.exit(1)
+
+    check_count = len(recording.polls) - 1
+    check_bytes = sum(len(recording.diffs[poll.digest]) for poll in recording.polls[1:])
+    rewards_by_detector: typing.Dict[str, typing.List[bool]] = {}
+
+    click.echo(
+        f"Replaying {check_count} checks ({len(recording.diffs)} distinct diffs, "
+        f"{check_bytes / 1024 / 1024:.1f} MiB) from `{recording_path}`."
+    )
+    click.echo(f"{'strategy':<12} {'rewards':>8} {'checks/s':>10} {'MiB/s':>8} {'p50 µs':>8} {'p99 µs':>8}")
+
+    for detector_name in detector_names or CHANGE_DETECTOR_REGISTRY.builtin_names:
+        diff_provider = GitDiffProviderReplay(recording=recording)
+        # Checks take microseconds here, below the histogram buckets; keep every sample.
+        samples: typing.List[float] = []
+
+        for _ in range(repeat_count):
+            # The detector takes its baseline from the first poll, like at start-up.
+            diff_provider.poll_index = 0
+            detector = ImplFactoryGitDiffChangesDetector(
+                repo_path=recording_path,
+                diff_provider=diff_provider,
+            ).get_impl_instance(detector_name)
+            rewards: typing.List[bool] = []
+
+            for poll_index in range(1, len(recording.polls)):
+                diff_provider.poll_index = poll_index
+
+                started = time.perf_counter()
+                rewards.append(detector.check_for_new_work())
+                samples.append(time.perf_counter() - started)
+
+        rewards_by_detector[detector_name] = rewards
+        seconds = max(sum(samples), 1e-9)
+        samples.sort()
+
+        # Nearest-rank percentiles: the ceil(fraction * n)-th smallest sample.
+        p50 = samples[(len(samples) - 1) // 2]
+        p99 = samples[(len(samples) * 99 - 1) // 100]
+
+        click.echo(
+            f"{detector_name:<12} {sum(rewards):>8} {len(samples) / seconds:>10.0f} "
+            f"{check_bytes * repeat_count / 1024 / 1024 / seconds:>8.1f} "
+            f"{p50 * 1e6:>8.1f} {p99 * 1e6:>8.1f}"
+        )
+
+    if not show_timeline:
+        return
+
+    click.echo("---")
+    click.echo(f"{'poll time':<19} {'poll':>6}  " + " ".join(f"{name:<10}" for name in rewards_by_detector))
+
+    for poll_index, poll in enumerate(recording.polls[1:], start=1):
+        rewarded = [rewards[poll_index - 1] for rewards in rewards_by_detector.values()]
+
+        if any(rewarded):
+            click.echo(
+                f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(poll.time))} {poll_index:>6}  "
+                + " ".join(f"{'reward' if has_new_work else '-':<10}" for has_new_work in rewarded)
+            )
 
 
 if __name__ == "__main__":
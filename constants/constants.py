@@ -2,11 +2,24 @@ import typing
 
 DEFAULT_POLL_INTERVAL: typing.Final[float] = 5.0
 
-#: Default ADB swipe coordinates (x1, y1, x2, y2, duration_ms)
+#: Bounds of the adaptive polling interval: it drops to the minimum as
+#: soon as new work is detected and grows towards the maximum while the
+#: repository stays idle.
+DEFAULT_MIN_POLL_INTERVAL: typing.Final[float] = 1.0
+DEFAULT_MAX_POLL_INTERVAL: typing.Final[float] = 20.0
+
+#: Factor the polling interval grows by after each idle check.
+POLL_BACKOFF_FACTOR: typing.Final[float] = 2.0
+
+#: The swipe as fractions (x1, y1, x2, y2) of the display in its current
+#: orientation: from bottom-center to top-center.
+ADB_SWIPE_FRACTIONS: typing.Final[typing.Tuple[float, float, float, float]] = (0.5, 0.75, 0.5, 0.25)
+ADB_SWIPE_DURATION_MS: typing.Final[int] = 100
+
+#: Fallback ADB swipe coordinates (x1, y1, x2, y2, duration_ms), used
+#: when a device's screen geometry can not be read.
 #: This simulates a swipe from bottom-center to top-center.
-ADB_SWIPE_COMMAND: typing.Final[typing.List[str]] = [
-    "adb",
-    "shell",
+ADB_SWIPE_DEVICE_COMMAND: typing.Final[typing.List[str]] = [
     "input",
     "swipe",
     "500",  # x1
@@ -15,3 +28,161 @@ ADB_SWIPE_COMMAND: typing.Final[typing.List[str]] = [
     "500",  # y2 (top)
     "100",  # duration (ms)
 ]
+
+#: Number of requests written to a long-lived git helper before reading
+#: the responses back. Keeps both pipe buffers below their capacity,
+#: so the helper never blocks on stdout while we are still writing.
+GIT_COPROCESS_BATCH_SIZE: typing.Final[int] = 512
+
+#: How many times a dead git helper is restarted before the provider
+#: permanently falls back to plain `git diff` subprocess calls.
+GIT_COPROCESS_MAX_RESTARTS: typing.Final[int] = 3
+
+#: Files modified within this window before a poll are re-hashed on the
+#: next poll, since their stat data can not be trusted yet (racy git).
+GIT_RACY_WINDOW_NS: typing.Final[int] = 2_000_000_000
+
+#: Upper bound, in bytes, for resolved delta bases kept by the in-process
+#: object database reader.
+GIT_DELTA_BASE_CACHE_BYTES: typing.Final[int] = 32 * 1024 * 1024
+
+#: When more tracked paths than this moved since the previous poll, the
+#: incremental provider runs one full `git diff` instead of a partial one.
+GIT_INCREMENTAL_MAX_PATHS: typing.Final[int] = 1000
+
+#: Upper bound for the pathspec arguments passed to a single git call.
+GIT_PATHSPEC_ARGS_MAX_BYTES: typing.Final[int] = 64 * 1024
+
+#: Bytes read from git's stdout at a time when streaming a diff.
+GIT_DIFF_CHUNK_SIZE: typing.Final[int] = 64 * 1024
+
+#: After the first relevant filesystem event, the watcher keeps reading
+#: events until none arrived for this many seconds, so an editor's save
+#: or a `git checkout` triggers a single check.
+WATCH_COALESCE_SECONDS: typing.Final[float] = 0.2
+
+#: Upper bound for coalescing a continuous stream of events.
+WATCH_COALESCE_MAX_SECONDS: typing.Final[float] = 2.0
+
+#: Bytes read from the inotify descriptor at a time.
+INOTIFY_READ_SIZE: typing.Final[int] = 64 * 1024
+
+#: Rewards the asyncio runtime queues up while the swipe provider is
+#: busy; further rewards are dropped until the device catches up.
+REWARD_QUEUE_MAX_SIZE: typing.Final[int] = 4
+
+#: Command that opens the persistent shell session used by the
+#: `adb-shell` swipe provider.
+ADB_SHELL_COMMAND: typing.Final[typing.List[str]] = [
+    "adb",
+    "shell",
+    "-T",  # no pseudo-terminal: commands are not echoed back
+]
+
+#: Where the adb server listens; ANDROID_ADB_SERVER_ADDRESS and
+#: ANDROID_ADB_SERVER_PORT override these, like for the adb binary.
+ADB_SERVER_HOST: typing.Final[str] = "127.0.0.1"
+ADB_SERVER_PORT: typing.Final[int] = 5037
+
+#: Upper bound for devices swiped on concurrently by the `adb-all`
+#: swipe provider.
+ADB_FAN_OUT_MAX_WORKERS: typing.Final[int] = 16
+
+#: Device command the `sendevent` gesture backend probes once to find
+#: the touchscreen and its axis ranges.
+ADB_GETEVENT_PROBE_COMMAND: typing.Final[typing.List[str]] = ["getevent", "-pl"]
+
+#: Number of finger moves the `sendevent` gesture backend spreads a
+#: swipe over; more steps look smoother to apps but take longer to send.
+SENDEVENT_SWIPE_STEPS: typing.Final[int] = 10
+
+#: Device commands that identify a device and its build, and read its
+#: screen geometry in the natural orientation.
+ADB_DEVICE_ID_COMMAND: typing.Final[str] = "getprop ro.serialno; getprop ro.build.fingerprint"
+ADB_GEOMETRY_COMMAND: typing.Final[str] = "wm size; wm density"
+
+#: Prefixes of the adb client's own error messages (no device, device
+#: offline or unauthorized), which tell a failed transport apart from a
+#: device command that exited non-zero.
+ADB_CLIENT_ERROR_PREFIXES: typing.Final[typing.Tuple[str, ...]] = ("error:", "adb:")
+
+#: Device command printing the display rotation, in quarter turns on
+#: older releases and as ROTATION_<degrees> on newer ones. `dumpsys input`
+#: takes tens of milliseconds on the device, so it runs once when the
+#: swipe is built, or in every swipe with --follow-rotation.
+ADB_ROTATION_PROBE_COMMAND: typing.Final[str] = (
+    "dumpsys input"
+    " | sed -nE 's/.*(SurfaceOrientation: |orientation=)(ROTATION_)?([0-9]+).*/\\3/p'"
+    " | head -n 1"
+)
+
+#: File, below $XDG_CACHE_HOME/code4swipe, that keeps each device's
+#: screen geometry keyed by serial and build fingerprint.
+DEVICE_GEOMETRY_CACHE_FILE_NAME: typing.Final[str] = "device-geometry.json"
+
+#: Bounds of the exponential backoff between reconnects of the
+#: background `host:track-devices` subscription.
+ADB_MONITOR_MIN_BACKOFF_SECONDS: typing.Final[float] = 0.5
+ADB_MONITOR_MAX_BACKOFF_SECONDS: typing.Final[float] = 30.0
+
+#: Rewards found within this many seconds after a swipe finished are
+#: merged into it instead of swiping again.
+DEFAULT_REWARD_WINDOW: typing.Final[float] = 2.0
+
+#: Default cap on swipes per minute (token bucket refill rate), and the
+#: bucket size, i.e. how many swipes may happen back to back.
+DEFAULT_MAX_SWIPES_PER_MINUTE: typing.Final[float] = 10.0
+REWARD_BURST_SIZE: typing.Final[int] = 3
+
+#: Default deadlines for one call to git and to adb (or the adb server).
+#: Processes still running at the deadline are killed with their whole
+#: process group.
+DEFAULT_GIT_TIMEOUT: typing.Final[float] = 30.0
+DEFAULT_ADB_TIMEOUT: typing.Final[float] = 10.0
+
+#: Consecutive timeouts after which a backend is paused, and seconds
+#: until a paused backend is probed again.
+CIRCUIT_BREAKER_FAILURE_THRESHOLD: typing.Final[int] = 3
+CIRCUIT_BREAKER_RESET_SECONDS: typing.Final[float] = 60.0
+
+#: Entry point groups installed packages register implementations in;
+#: the built-in ones are only listed in the registries.
+SWIPE_PROVIDERS_ENTRY_POINT_GROUP: typing.Final[str] = "code4swipe.swipe_providers"
+GESTURE_BACKENDS_ENTRY_POINT_GROUP: typing.Final[str] = "code4swipe.gesture_backends"
+CHANGE_DETECTORS_ENTRY_POINT_GROUP: typing.Final[str] = "code4swipe.change_detectors"
+GIT_DIFF_PROVIDERS_ENTRY_POINT_GROUP: typing.Final[str] = "code4swipe.git_diff_providers"
+WATCHERS_ENTRY_POINT_GROUP: typing.Final[str] = "code4swipe.watchers"
+RUNTIMES_ENTRY_POINT_GROUP: typing.Final[str] = "code4swipe.runtimes"
+
+#: Upper bounds in seconds of the latency histogram buckets; a last
+#: bucket takes everything slower. Fixed, so recording a sample is a
+#: bisect and an increment.
+LATENCY_BUCKET_BOUNDS: typing.Final[typing.Tuple[float, ...]] = (
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0,
+    10.0, 30.0, 60.0,
+)
+
+#: Address the metrics endpoint listens on; only local scrapers can reach it.
+METRICS_HOST: typing.Final[str] = "127.0.0.1"
+
+#: Seconds between rewrites of the metrics textfile.
+METRICS_TEXTFILE_INTERVAL: typing.Final[float] = 15.0
+
+#: Layout of a directory written by --record: one JSON line per poll in
+#: the index, and every distinct diff once, zlib-compressed and named
+#: after its digest, in the diffs directory.
+DIFF_RECORDING_INDEX_NAME: typing.Final[str] = "index.jsonl"
+DIFF_RECORDING_DIFFS_DIR_NAME: typing.Final[str] = "diffs"
+
+#: zlib level for recorded diffs; fast enough to run on every poll.
+DIFF_RECORDING_COMPRESSION_LEVEL: typing.Final[int] = 6
+
+#: Name of the warm-start state file, kept in the repository's git dir.
+DETECTOR_STATE_FILE_NAME: typing.Final[str] = "code4swipe-state.json"
+
+#: Version of the state file layout; files of other versions are ignored.
+DETECTOR_STATE_FILE_VERSION: typing.Final[int] = 1
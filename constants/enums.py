@@ -3,8 +3,43 @@ from enum import StrEnum
 class SwipeProviders(StrEnum):
     """Defines available swipe provider choices."""
     ADB = "adb"
+    ADB_SHELL = "adb-shell"
+    ADB_SOCKET = "adb-socket"
+    ADB_ALL = "adb-all"
+    NULL = "null"
 
 class ChangeDetectors(StrEnum):
     """Defines available change detector choices."""
     LINECOUNT = "linecount"
     EXACT = "exact"
+    NUMSTAT = "numstat"
+
+class GitDiffProviders(StrEnum):
+    """Defines available git diff provider choices."""
+    SUBPROCESS = "subprocess"
+    BATCH = "batch"
+    NATIVE = "native"
+    INCREMENTAL = "incremental"
+
+class WatchModes(StrEnum):
+    """Defines available watch mode choices."""
+    POLL = "poll"
+    INOTIFY = "inotify"
+
+class Runtimes(StrEnum):
+    """Defines available runtime choices."""
+    SYNC = "sync"
+    ASYNCIO = "asyncio"
+
+class GestureBackends(StrEnum):
+    """Defines available gesture backend choices."""
+    INPUT = "input"
+    SENDEVENT = "sendevent"
+
+class PollPhases(StrEnum):
+    """Defines the timed phases of the main loop."""
+    CHECK = "check"
+    DIFF = "diff"
+    STATE = "state"
+    REWARD = "reward"
+    SLEEP = "sleep"
@@ -0,0 +1,355 @@
+from base.git_diff_provider_base import GitDiffProviderBase, GitDiffUnavailableError
+from constants.constants import (
+    DEFAULT_GIT_TIMEOUT,
+    GIT_COPROCESS_BATCH_SIZE,
+    GIT_COPROCESS_MAX_RESTARTS,
+)
+from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+from diff_providers.git_worktree_snapshot import GITLINK_MODE, GitWorktreeSnapshot
+from utils.circuit_breaker import CircuitOpenError
+from utils.git_paths import GitPaths, resolve_git_paths
+from utils.subprocess_deadline import kill_process_group
+
+import os
+import pathlib
+import selectors
+import stat
+import subprocess
+import time
+import typing
+
+import click
+
+class _GitCoprocess:
+    """
+    A long-lived git helper driven over pipes with a line-based
+    request/response protocol (one response line per request line).
+
+    Every request has a deadline; a helper that misses it is killed
+    together with its process group.
+    """
+
+    def __init__(self, worktree: pathlib.Path, args: typing.List[str], timeout: float) -> None:
+        self.timeout = timeout
+        self._process = subprocess.Popen(
+            [
+                "git",
+                "-C",
+                str(worktree),
+                *args,
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env={
+                **os.environ,
+                "GIT_FLUSH": "1",
+            },
+            start_new_session=True,
+        )
+
+        assert self._process.stdout is not None
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._process.stdout, selectors.EVENT_READ)
+        self._output = b""
+
+    def request(self, lines: typing.List[bytes]) -> typing.List[bytes]:
+        """
+        Sends request lines and returns the matching response lines.
+
+        Raises:
+            EOFError: If the helper exited before answering.
+            OSError: If the helper's stdin is closed.
+            subprocess.TimeoutExpired: If the helper did not answer in time.
+        """
+        assert self._process.stdin is not None
+
+        deadline = time.monotonic() + self.timeout
+        responses: typing.List[bytes] = []
+
+        for start in range(0, len(lines), GIT_COPROCESS_BATCH_SIZE):
+            batch = lines[start:start + GIT_COPROCESS_BATCH_SIZE]
+
+            self._process.stdin.write(b"".join(line + b"\n" for line in batch))
+            self._process.stdin.flush()
+
+            for _ in batch:
+                responses.append(self._read_line(deadline=deadline))
+
+        return responses
+
+    def _read_line(self, deadline: float) -> bytes:
+        """Returns the next response line, waiting until `deadline`."""
+        assert self._process.stdout is not None
+
+        while (line_end := self._output.find(b"\n")) == -1:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0 or not self._selector.select(timeout=remaining):
+                kill_process_group(self._process)
+                raise subprocess.TimeoutExpired(self._process.args, self.timeout)
+
+            chunk = os.read(self._process.stdout.fileno(), 65536)
+
+            if not chunk:
+                raise EOFError("git helper exited unexpectedly")
+
+            self._output += chunk
+
+        line = self._output[:line_end]
+        self._output = self._output[line_end + 1:]
+
+        return line
+
+    def close(self) -> None:
+        """Closes the pipes and reaps the helper."""
+        self._selector.close()
+
+        try:
+            if self._process.stdin is not None:
+                self._process.stdin.close()
+        except OSError:
+            pass
+
+        try:
+            self._process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            kill_process_group(self._process)
+            self._process.wait()
+
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+
+class GitDiffProviderBatch(GitDiffProviderBase):
+    """
+    Implementation of GitDiffProviderBase that keeps a long-lived
+    `git hash-object --stdin-paths` helper open and only runs
+    `git diff` when the content of a tracked file actually changed.
+
+    Files whose stat data did not move since the previous poll are not
+    re-hashed, so an idle poll costs a round of `lstat` calls and
+    no process spawns. Falls back to GitDiffProviderSubprocess when the
+    helper keeps dying. A helper that misses the git deadline is killed
+    and counted by the same circuit breaker as the `git diff` calls.
+    """
+
+    def __init__(self, verbose: bool = False, timeout: float = DEFAULT_GIT_TIMEOUT) -> None:
+        """Initializes the provider with the deadline for one git call."""
+        self.verbose = verbose
+        self.timeout = timeout
+        self._fallback = GitDiffProviderSubprocess(timeout=timeout)
+        self._restarts = 0
+        self._is_call_counted = False
+        self._reset(repo_path=None)
+
+    def _reset(self, repo_path: typing.Optional[pathlib.Path]) -> None:
+        """Drops every cached piece of state."""
+        self._repo_path = repo_path
+        self._git_paths: typing.Optional[GitPaths] = None
+        self._hasher: typing.Optional[_GitCoprocess] = None
+        self._snapshot: typing.Optional[GitWorktreeSnapshot] = None
+        self._content_keys: typing.Dict[bytes, bytes] = {}
+        self._last_diff: typing.Optional[bytes] = None
+
+    @property
+    def is_degraded(self) -> bool:
+        """Whether the provider gave up on its helper process."""
+        return self._restarts > GIT_COPROCESS_MAX_RESTARTS
+
+    def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
+        """
+        Returns the output of git diff, reusing the previous output when
+        no tracked file content changed since the last call.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as a string.
+        """
+        return self.decode_git_diff(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """
+        Returns the raw output of git diff, reusing the previous output
+        when no tracked file content changed since the last call.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as bytes.
+
+        Raises:
+            GitDiffUnavailableError: If git timed out or is paused.
+        """
+        if repo_path != self._repo_path:
+            self.close()
+            self._reset(repo_path=repo_path)
+
+        if self.is_degraded:
+            return self._fallback.get_current_git_diff_bytes(repo_path=repo_path)
+
+        if self._git_paths is None:
+            self._git_paths = resolve_git_paths(repo_path)
+
+            if self._git_paths is None:
+                # Let the subprocess provider report the actual problem.
+                return self._fallback.get_current_git_diff_bytes(repo_path=repo_path)
+
+        self._is_call_counted = False
+
+        try:
+            is_changed = self._refresh(self._git_paths)
+        except GitDiffUnavailableError:
+            self._discard_helper()
+            raise
+        except subprocess.TimeoutExpired:
+            self._discard_helper()
+            raise GitDiffUnavailableError(f"git hash-object did not answer within {self.timeout:.0f} seconds and was killed") from None
+        except (EOFError, OSError, ValueError, subprocess.SubprocessError) as exception:
+            self._on_helper_failure(exception)
+            is_changed = True
+
+        if is_changed or self._last_diff is None:
+            # One poll counts as one git call, even if it hashed first.
+            self._last_diff = self._fallback.get_current_git_diff_bytes(
+                repo_path=repo_path,
+                is_counted=not self._is_call_counted,
+            )
+
+        return self._last_diff
+
+    def close(self) -> None:
+        """Stops the helper process, if any."""
+        if self._hasher is not None:
+            self._hasher.close()
+            self._hasher = None
+
+    def _discard_helper(self) -> None:
+        """Tears the helper down together with everything it hashed."""
+        self.close()
+
+        # Forget stat data, so everything is re-hashed by the next helper.
+        if self._snapshot is not None:
+            self._snapshot.forget()
+
+        self._content_keys.clear()
+
+    def _on_helper_failure(self, exception: Exception) -> None:
+        """Tears the helper down and decides whether to keep using it."""
+        self._discard_helper()
+
+        self._restarts += 1
+
+        if self.is_degraded:
+            click.echo(
+                "Warning: git helper keeps failing, "
+                "falling back to plain `git diff` calls.",
+                err=True,
+            )
+        elif self.verbose:
+            click.echo(f"git helper failed, restarting: {exception}", err=True)
+
+    def _refresh(self, git_paths: GitPaths) -> bool:
+        """
+        Updates the cached view of the worktree.
+
+        Returns:
+            True if anything that can affect git diff output changed.
+        """
+        if self._snapshot is None:
+            self._snapshot = GitWorktreeSnapshot(git_paths=git_paths, run_git=self._fallback.run_git)
+
+        scan = self._snapshot.scan()
+
+        worktree = os.fsencode(git_paths.worktree)
+        changed_paths = set(scan.changed_paths)
+
+        to_hash: typing.List[bytes] = []
+        executable_paths: typing.Set[bytes] = set()
+        content_keys: typing.Dict[bytes, bytes] = {}
+
+        for path, mode in self._snapshot.tracked_modes.items():
+            if path not in changed_paths and path in self._content_keys:
+                content_keys[path] = self._content_keys[path]
+                continue
+
+            full_path = os.path.join(worktree, path)
+
+            if mode == GITLINK_MODE:
+                signature = self._snapshot.get_signature(path)
+                content_keys[path] = b"gitlink:" + repr(signature).encode()
+                continue
+
+            try:
+                file_stat = os.lstat(full_path)
+            except OSError:
+                content_keys[path] = b"missing"
+                continue
+
+            if stat.S_ISLNK(file_stat.st_mode):
+                content_keys[path] = b"link:" + os.readlink(full_path)
+            elif b"\n" in path or not stat.S_ISREG(file_stat.st_mode):
+                # Not expressible in the helper protocol; stat data will do.
+                content_keys[path] = b"stat:" + repr(self._snapshot.get_signature(path)).encode()
+            else:
+                to_hash.append(path)
+
+                if file_stat.st_mode & 0o111:
+                    executable_paths.add(path)
+
+        if to_hash:
+            blob_ids = self._hash_paths(worktree=git_paths.worktree, paths=to_hash)
+
+            for path, blob_id in zip(to_hash, blob_ids):
+                # The blob id ignores the mode, so `chmod +x` needs its own marker.
+                content_keys[path] = blob_id + b":x" if path in executable_paths else blob_id
+
+        is_changed = scan.is_index_changed or content_keys != self._content_keys
+        self._content_keys = content_keys
+
+        return is_changed
+
+    def _hash_paths(self, worktree: pathlib.Path, paths: typing.List[bytes]) -> typing.List[bytes]:
+        """
+        Asks the helper for blob ids under the git circuit breaker,
+        starting the helper if needed.
+
+        Raises:
+            GitDiffUnavailableError: If git is paused after repeated timeouts.
+            subprocess.TimeoutExpired: If the helper did not answer in time.
+        """
+        breaker = self._fallback.breaker
+
+        try:
+            breaker.before_call()
+        except CircuitOpenError as exception:
+            raise GitDiffUnavailableError(str(exception)) from exception
+
+        self._is_call_counted = True
+
+        try:
+            if self._hasher is None:
+                self._hasher = _GitCoprocess(
+                    worktree=worktree,
+                    args=[
+                        "hash-object",
+                        "--stdin-paths",
+                    ],
+                    timeout=self.timeout,
+                )
+
+            blob_ids = self._hasher.request(paths)
+        except subprocess.TimeoutExpired:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # A crashed helper says nothing about whether git responds.
+            breaker.record_no_answer()
+            raise
+
+        breaker.record_success()
+
+        return blob_ids
@@ -0,0 +1,143 @@
+from base.git_diff_provider_base import GitDiffProviderBase, GitDiffUnavailableError
+from constants.constants import (
+    DEFAULT_GIT_TIMEOUT,
+    GIT_INCREMENTAL_MAX_PATHS,
+    GIT_PATHSPEC_ARGS_MAX_BYTES,
+)
+from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+from diff_providers.git_worktree_snapshot import GitWorktreeSnapshot
+from utils.git_diff_parsing import split_file_diffs
+from utils.git_paths import GitPaths, resolve_git_paths
+
+import pathlib
+import subprocess
+import typing
+
+import click
+
+class GitDiffProviderIncremental(GitDiffProviderBase):
+    """
+    Implementation of GitDiffProviderBase that keeps the diff of every
+    modified file and, on each poll, re-diffs only the tracked paths
+    whose stat data moved (`git diff -- <paths>`).
+
+    The fresh chunks are spliced into the cached per-file map, which is
+    joined in index order to give the same output as a full `git diff`.
+    A change of the index invalidates every chunk, since it can move
+    any file's blob id, and triggers a full diff.
+    """
+
+    def __init__(self, verbose: bool = False, timeout: float = DEFAULT_GIT_TIMEOUT) -> None:
+        """Initializes the provider with the deadline for one git call."""
+        self.verbose = verbose
+        self._fallback = GitDiffProviderSubprocess(timeout=timeout)
+        self._repo_path: typing.Optional[pathlib.Path] = None
+        self._git_paths: typing.Optional[GitPaths] = None
+        self._snapshot: typing.Optional[GitWorktreeSnapshot] = None
+        self._file_diffs: typing.Dict[bytes, bytes] = {}
+        self._last_diff: typing.Optional[bytes] = None
+
+    def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
+        """
+        Returns the output of git diff, re-diffing only touched files.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as a string.
+        """
+        return self.decode_git_diff(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """
+        Returns the raw output of git diff, re-diffing only touched files.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as bytes.
+        """
+        if repo_path != self._repo_path or self._snapshot is None:
+            self._git_paths = resolve_git_paths(repo_path)
+
+            if self._git_paths is None:
+                # Let the subprocess provider report the actual problem.
+                return self._fallback.get_current_git_diff_bytes(repo_path=repo_path)
+
+            self._repo_path = repo_path
+            self._snapshot = GitWorktreeSnapshot(git_paths=self._git_paths, run_git=self._fallback.run_git)
+            self._last_diff = None
+
+        try:
+            scan = self._snapshot.scan()
+
+            if (
+                self._last_diff is None
+                or scan.is_index_changed
+                or len(scan.changed_paths) > GIT_INCREMENTAL_MAX_PATHS
+            ):
+                self._file_diffs = split_file_diffs(self._run_git_diff(paths=[]))
+            elif scan.changed_paths:
+                fresh_diffs = split_file_diffs(self._run_git_diff(paths=scan.changed_paths))
+
+                for path in scan.changed_paths:
+                    self._file_diffs.pop(path, None)
+
+                self._file_diffs.update(fresh_diffs)
+            else:
+                return self._last_diff
+        except GitDiffUnavailableError:
+            # Diffing everything would hit the same wall.
+            raise
+        except (OSError, ValueError, subprocess.SubprocessError) as exception:
+            if self.verbose:
+                click.echo(f"Incremental diff failed, diffing everything: {exception}", err=True)
+
+            self._snapshot.forget()
+            self._last_diff = None
+
+            return self._fallback.get_current_git_diff_bytes(repo_path=repo_path)
+
+        # Index order is plain byte order of the paths.
+        self._last_diff = b"".join(self._file_diffs[path] for path in sorted(self._file_diffs))
+
+        return self._last_diff
+
+    def _run_git_diff(self, paths: typing.List[bytes]) -> bytes:
+        """Runs `git diff`, limited to `paths` unless the list is empty."""
+        assert self._git_paths is not None
+
+        git_command: typing.List[typing.Union[str, bytes]] = [
+            "git",
+            "--literal-pathspecs",
+            "-C",
+            str(self._git_paths.worktree),
+            "diff",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            "--",
+        ]
+
+        if not paths:
+            return self._fallback.run_git(git_command)
+
+        outputs: typing.List[bytes] = []
+        batch: typing.List[bytes] = []
+        batch_size = 0
+
+        # Stay well below the platform's argument length limit.
+        for path in [*paths, None]:
+            if path is None or batch_size + len(path) > GIT_PATHSPEC_ARGS_MAX_BYTES:
+                if batch:
+                    outputs.append(self._fallback.run_git([*git_command, *batch]))
+
+                batch = []
+                batch_size = 0
+
+            if path is not None:
+                batch.append(path)
+                batch_size += len(path) + 1
+
+        return b"".join(outputs)
@@ -0,0 +1,348 @@
+from base.git_diff_provider_base import GitDiffProviderBase
+from constants.constants import DEFAULT_GIT_TIMEOUT, GIT_RACY_WINDOW_NS
+from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+from diff_providers.git_index_reader import (
+    EXTENDED_FLAG_SKIP_WORKTREE,
+    FLAG_ASSUME_VALID,
+    GitIndex,
+    GitIndexEntry,
+    GitIndexError,
+)
+from diff_providers.git_object_database import GitObjectDatabase, GitObjectError
+from utils.git_paths import GitPaths, find_git_paths, read_common_dir, read_object_hash_size
+
+import difflib
+import hashlib
+import os
+import pathlib
+import stat
+import time
+import typing
+
+import click
+
+#: Modes as they appear in diff headers.
+MODE_REGULAR: typing.Final[int] = 0o100644
+MODE_EXECUTABLE: typing.Final[int] = 0o100755
+MODE_SYMLINK: typing.Final[int] = 0o120000
+MODE_GITLINK: typing.Final[int] = 0o160000
+
+#: Git treats content as binary if a NUL shows up this early.
+BINARY_SNIFF_SIZE: typing.Final[int] = 8000
+
+#: Object id abbreviation used on `index` lines.
+ABBREV_LENGTH: typing.Final[int] = 7
+
+#: Bytes that force a path to be C-quoted, as with `core.quotePath=true`.
+_QUOTED_ESCAPES: typing.Final[typing.Dict[int, bytes]] = {
+    0x07: b"\\a",
+    0x08: b"\\b",
+    0x09: b"\\t",
+    0x0A: b"\\n",
+    0x0B: b"\\v",
+    0x0C: b"\\f",
+    0x0D: b"\\r",
+    0x22: b'\\"',
+    0x5C: b"\\\\",
+}
+
+def _quote_path(path: bytes) -> bytes:
+    """Quotes a path the way git's diff headers do."""
+    if not any(byte < 0x20 or byte >= 0x7F or byte in (0x22, 0x5C) for byte in path):
+        return path
+
+    quoted = bytearray(b'"')
+
+    for byte in path:
+        if byte in _QUOTED_ESCAPES:
+            quoted += _QUOTED_ESCAPES[byte]
+        elif byte < 0x20 or byte >= 0x7F:
+            quoted += b"\\%03o" % byte
+        else:
+            quoted.append(byte)
+
+    quoted += b'"'
+
+    return bytes(quoted)
+
+def _split_lines(data: bytes) -> typing.List[bytes]:
+    """Splits content on LF only, keeping the line endings, like git does."""
+    lines = [line + b"\n" for line in data.split(b"\n")]
+    lines[-1] = lines[-1][:-1]
+
+    if not lines[-1]:
+        lines.pop()
+
+    return lines
+
+class GitDiffProviderNative(GitDiffProviderBase):
+    """
+    Implementation of GitDiffProviderBase that never runs the git binary.
+
+    Reads `.git/index` and the object store in-process, skips entries
+    whose cached stat data still matches the worktree (like git itself
+    does), and builds unified diffs for the rest with difflib. The diff
+    of each modified file is cached, keyed by its index blob id and its
+    worktree stat data, so an unchanged dirty file is not re-read.
+
+    The output follows git's format but is not byte-identical to it:
+    hunks may be split differently, object ids are always abbreviated
+    to seven characters, and clean/smudge filters, end-of-line
+    conversion and submodules are not taken into account.
+    """
+
+    def __init__(self, verbose: bool = False, timeout: float = DEFAULT_GIT_TIMEOUT) -> None:
+        """Initializes the provider with the deadline for one git call."""
+        self.verbose = verbose
+        self._fallback = GitDiffProviderSubprocess(timeout=timeout)
+        self._repo_path: typing.Optional[pathlib.Path] = None
+        self._git_paths: typing.Optional[GitPaths] = None
+        self._database: typing.Optional[GitObjectDatabase] = None
+        self._hash_name = "sha1"
+        self._index_signature: typing.Optional[typing.Tuple[int, ...]] = None
+        self._index_mtime_ns = 0
+        self._entries: typing.List[GitIndexEntry] = []
+        self._file_diffs: typing.Dict[bytes, typing.Tuple[typing.Tuple[typing.Any, ...], bytes]] = {}
+        self._poll_started_ns = 0
+
+    def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
+        """
+        Builds the worktree-against-index diff without spawning git.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full diff as a string.
+        """
+        return self.decode_git_diff(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """
+        Builds the raw worktree-against-index diff without spawning git.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full diff as bytes.
+        """
+        if repo_path != self._repo_path:
+            self.close()
+            self._repo_path = repo_path
+            self._git_paths = find_git_paths(repo_path)
+            self._index_signature = None
+
+            if self._git_paths is not None:
+                hash_size = read_object_hash_size(self._git_paths.git_dir)
+                self._hash_name = "sha1" if hash_size == 20 else "sha256"
+                self._database = GitObjectDatabase(
+                    # Linked worktrees share the object store with the main one.
+                    objects_dir=read_common_dir(self._git_paths.git_dir) / "objects",
+                    hash_size=hash_size,
+                )
+
+        if self._git_paths is None or self._database is None:
+            click.echo(
+                f"Hint: {repo_path} is not a valid git repository.",
+                err=True,
+            )
+
+            return b""
+
+        try:
+            self._refresh_index(self._git_paths)
+            self._poll_started_ns = time.time_ns()
+
+            return b"".join(
+                self._diff_entry(entry)
+                for entry in self._entries
+            )
+        except (GitIndexError, GitObjectError) as exception:
+            if self.verbose:
+                click.echo(f"Native diff failed, using git: {exception}", err=True)
+
+            return self._fallback.get_current_git_diff_bytes(repo_path=repo_path)
+
+    def close(self) -> None:
+        """Releases the memory-mapped object store."""
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+
+    def _refresh_index(self, git_paths: GitPaths) -> None:
+        """Re-reads the index when its file moved."""
+        index_path = git_paths.git_dir / "index"
+
+        try:
+            index_stat = index_path.stat()
+        except FileNotFoundError:
+            self._entries = []
+            self._index_signature = None
+            return
+
+        signature = (
+            index_stat.st_ino,
+            index_stat.st_size,
+            index_stat.st_mtime_ns,
+            index_stat.st_ctime_ns,
+        )
+
+        if signature == self._index_signature:
+            return
+
+        assert self._database is not None
+
+        with GitIndex.open(path=index_path, hash_size=self._database.hash_size) as index:
+            if not index.is_complete:
+                raise GitIndexError("split or sparse index")
+
+            self._entries = list(index)
+
+        # Drop cached diffs of paths that left the index.
+        tracked_paths = {entry.path for entry in self._entries}
+        self._file_diffs = {
+            path: cached
+            for path, cached in self._file_diffs.items()
+            if path in tracked_paths
+        }
+
+        self._index_signature = signature
+        self._index_mtime_ns = index_stat.st_mtime_ns
+
+    def _diff_entry(self, entry: GitIndexEntry) -> bytes:
+        """Returns the diff of one index entry against the worktree."""
+        if entry.stage:
+            # Conflicted paths have one entry per stage; report them once.
+            return b"* Unmerged path " + entry.path + b"\n" if entry.stage == 1 else b""
+
+        if (
+            entry.mode == MODE_GITLINK
+            or entry.flags & FLAG_ASSUME_VALID
+            or entry.extended_flags & EXTENDED_FLAG_SKIP_WORKTREE
+        ):
+            return b""
+
+        assert self._git_paths is not None
+
+        full_path = os.path.join(os.fsencode(self._git_paths.worktree), entry.path)
+
+        try:
+            file_stat = os.lstat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return self._format_diff(entry=entry, new_mode=None, new_oid=None, new_data=None)
+
+        if stat.S_ISLNK(file_stat.st_mode):
+            new_mode = MODE_SYMLINK
+        elif stat.S_ISREG(file_stat.st_mode):
+            new_mode = MODE_EXECUTABLE if file_stat.st_mode & stat.S_IXUSR else MODE_REGULAR
+        else:
+            # A directory replaced the file: git reports it as deleted.
+            return self._format_diff(entry=entry, new_mode=None, new_oid=None, new_data=None)
+
+        is_racy = entry.mtime_ns >= self._index_mtime_ns
+
+        if (
+            not is_racy
+            and new_mode == entry.mode
+            and file_stat.st_size == entry.size
+            and file_stat.st_mtime_ns == entry.mtime_ns
+            and file_stat.st_ctime_ns == entry.ctime_ns
+            and file_stat.st_ino == entry.ino
+        ):
+            self._file_diffs.pop(entry.path, None)
+            return b""
+
+        cache_key = (
+            entry.oid,
+            entry.mode,
+            file_stat.st_mode,
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            file_stat.st_ctime_ns,
+            file_stat.st_ino,
+        )
+
+        cached = self._file_diffs.get(entry.path)
+
+        if (
+            cached is not None
+            and cached[0] == cache_key
+            and file_stat.st_mtime_ns < self._poll_started_ns - GIT_RACY_WINDOW_NS
+        ):
+            return cached[1]
+
+        file_diff = self._diff_worktree_file(entry=entry, full_path=full_path, new_mode=new_mode)
+        self._file_diffs[entry.path] = (cache_key, file_diff)
+
+        return file_diff
+
+    def _diff_worktree_file(self, entry: GitIndexEntry, full_path: bytes, new_mode: int) -> bytes:
+        """Reads a worktree file and diffs it against its index blob."""
+        if new_mode == MODE_SYMLINK:
+            new_data = os.readlink(full_path)
+        else:
+            with open(full_path, "rb") as file:
+                new_data = file.read()
+
+        new_oid = hashlib.new(self._hash_name, b"blob %d\0" % len(new_data) + new_data).digest()
+
+        if new_oid == entry.oid and new_mode == entry.mode:
+            return b""
+
+        return self._format_diff(entry=entry, new_mode=new_mode, new_oid=new_oid, new_data=new_data)
+
+    def _format_diff(
+        self,
+        entry: GitIndexEntry,
+        new_mode: typing.Optional[int],
+        new_oid: typing.Optional[bytes],
+        new_data: typing.Optional[bytes],
+    ) -> bytes:
+        """Formats a single file's diff in git's extended header format."""
+        assert self._database is not None
+
+        old_path = _quote_path(b"a/" + entry.path)
+        new_path = _quote_path(b"b/" + entry.path)
+
+        lines = [b"diff --git " + old_path + b" " + new_path + b"\n"]
+
+        if new_mode is None:
+            lines.append(b"deleted file mode %o\n" % entry.mode)
+        elif new_mode != entry.mode:
+            lines.append(b"old mode %o\n" % entry.mode)
+            lines.append(b"new mode %o\n" % new_mode)
+
+        if new_oid == entry.oid:
+            # Mode change only.
+            return b"".join(lines)
+
+        old_abbrev = entry.oid.hex()[:ABBREV_LENGTH].encode()
+        new_abbrev = (new_oid.hex() if new_oid else "0" * len(entry.oid) * 2)[:ABBREV_LENGTH].encode()
+
+        if new_mode == entry.mode:
+            lines.append(b"index " + old_abbrev + b".." + new_abbrev + b" %o\n" % entry.mode)
+        else:
+            lines.append(b"index " + old_abbrev + b".." + new_abbrev + b"\n")
+
+        old_data = self._database.read(entry.oid).data
+        new_data = new_data if new_data is not None else b""
+        to_path = new_path if new_mode is not None else b"/dev/null"
+
+        if b"\0" in old_data[:BINARY_SNIFF_SIZE] or b"\0" in new_data[:BINARY_SNIFF_SIZE]:
+            lines.append(b"Binary files " + old_path + b" and " + to_path + b" differ\n")
+            return b"".join(lines)
+
+        for line in difflib.diff_bytes(
+            difflib.unified_diff,
+            _split_lines(old_data),
+            _split_lines(new_data),
+            fromfile=old_path,
+            tofile=to_path,
+        ):
+            lines.append(line)
+
+            if not line.endswith(b"\n"):
+                lines.append(b"\n\\ No newline at end of file\n")
+
+        return b"".join(lines)
@@ -0,0 +1,43 @@
+from base.git_diff_provider_base import GitDiffProviderBase
+from utils.diff_recording import DiffRecordingWriter
+
+import pathlib
+
+class GitDiffProviderRecording(GitDiffProviderBase):
+    """
+    Implementation of GitDiffProviderBase that sits in front of another
+    provider and appends every diff it returns to a recording, for
+    `code4swipe replay`.
+
+    Only the full patch is recorded: streamed diffs and numstat are
+    derived from it, so every detector can be replayed from the same
+    recording. With the `numstat` detector this means the whole patch
+    is read while recording.
+    """
+
+    def __init__(self, inner: GitDiffProviderBase, writer: DiffRecordingWriter) -> None:
+        """Initializes the wrapper around the provider doing the actual work."""
+        self.inner = inner
+        self.writer = writer
+
+    def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
+        """Returns the inner provider's diff as a string and records it."""
+        return self.decode_git_diff(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """Returns the inner provider's diff as bytes and records it."""
+        diff = self.inner.get_current_git_diff_bytes(repo_path=repo_path)
+        self.writer.append(diff)
+
+        return diff
+
+    async def get_current_git_diff_bytes_async(self, repo_path: pathlib.Path) -> bytes:
+        """Asynchronous variant of get_current_git_diff_bytes()."""
+        diff = await self.inner.get_current_git_diff_bytes_async(repo_path=repo_path)
+        self.writer.append(diff)
+
+        return diff
+
+    def close(self) -> None:
+        """Closes the wrapped provider."""
+        self.inner.close()
@@ -0,0 +1,36 @@
+from base.git_diff_provider_base import GitDiffProviderBase
+from constants.constants import GIT_DIFF_CHUNK_SIZE
+from utils.diff_recording import DiffRecording
+
+import pathlib
+import typing
+
+class GitDiffProviderReplay(GitDiffProviderBase):
+    """
+    Implementation of GitDiffProviderBase that returns the diffs of a
+    recording instead of asking git; the repository path is ignored.
+
+    The poll being replayed is chosen by `poll_index`. Streamed diffs
+    come in chunks of GIT_DIFF_CHUNK_SIZE, like from the pipe of the
+    subprocess provider.
+    """
+
+    def __init__(self, recording: DiffRecording) -> None:
+        """Initializes the provider at the first poll of the recording."""
+        self.recording = recording
+        self.poll_index = 0
+
+    def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
+        """Returns the current poll's diff as a string."""
+        return self.decode_git_diff(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """Returns the current poll's diff as bytes."""
+        return self.recording.diffs[self.recording.polls[self.poll_index].digest]
+
+    def iter_current_git_diff_chunks(self, repo_path: pathlib.Path) -> typing.Iterator[bytes]:
+        """Yields the current poll's diff in pipe-sized chunks."""
+        diff = memoryview(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+        for offset in range(0, len(diff), GIT_DIFF_CHUNK_SIZE):
+            yield diff[offset:offset + GIT_DIFF_CHUNK_SIZE].tobytes()
@@ -0,0 +1,115 @@
+from base.git_diff_provider_base import GitDiffProviderBase
+from constants.constants import DEFAULT_GIT_TIMEOUT
+from diff_providers.git_diff_provider_subprocess import GitDiffProviderSubprocess
+from diff_providers.git_worktree_snapshot import GitWorktreeSnapshot
+from utils.git_diff_parsing import GitNumstat
+from utils.git_paths import resolve_git_paths
+
+import pathlib
+import subprocess
+import typing
+
+import click
+
+class GitDiffProviderStatGuarded(GitDiffProviderBase):
+    """
+    Implementation of GitDiffProviderBase that sits in front of another
+    provider and only asks it for a diff when the stat fingerprint of
+    the tracked files, `.git/index` or `.git/HEAD` moved.
+
+    Otherwise the previous diff is returned as is, so detectors see
+    exactly the same sequence of diffs as without the guard.
+    """
+
+    def __init__(self, inner: GitDiffProviderBase, verbose: bool = False, timeout: float = DEFAULT_GIT_TIMEOUT) -> None:
+        """Initializes the guard around the provider doing the actual work."""
+        self.inner = inner
+        self.verbose = verbose
+        self._git = GitDiffProviderSubprocess(timeout=timeout)
+        self._repo_path: typing.Optional[pathlib.Path] = None
+        self._snapshot: typing.Optional[GitWorktreeSnapshot] = None
+        self._last_diff: typing.Optional[bytes] = None
+        self._last_numstat: typing.Optional[typing.List[GitNumstat]] = None
+
+    def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
+        """
+        Returns the output of git diff, skipping the inner provider when
+        nothing in the worktree moved since the previous call.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as a string.
+        """
+        return self.decode_git_diff(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """
+        Returns the raw output of git diff, skipping the inner provider
+        when nothing in the worktree moved since the previous call.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as bytes.
+        """
+        if self._is_stale(repo_path=repo_path) or self._last_diff is None:
+            self._last_diff = self.inner.get_current_git_diff_bytes(repo_path=repo_path)
+
+        return self._last_diff
+
+    def get_current_git_numstat(self, repo_path: pathlib.Path) -> typing.List[GitNumstat]:
+        """
+        Returns per-file line counts, skipping the inner provider when
+        nothing in the worktree moved since the previous call.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            One entry per file in the diff, in git's output order.
+        """
+        if self._is_stale(repo_path=repo_path) or self._last_numstat is None:
+            self._last_numstat = self.inner.get_current_git_numstat(repo_path=repo_path)
+
+        return self._last_numstat
+
+    def close(self) -> None:
+        """Closes the wrapped provider."""
+        self.inner.close()
+
+    def _is_stale(self, repo_path: pathlib.Path) -> bool:
+        """
+        Scans the worktree and drops every cached result if it moved.
+
+        Returns:
+            True if the inner provider has to be asked again.
+        """
+        if repo_path != self._repo_path or self._snapshot is None:
+            git_paths = resolve_git_paths(repo_path)
+
+            if git_paths is None:
+                # Let the inner provider report the actual problem.
+                return True
+
+            self._repo_path = repo_path
+            self._snapshot = GitWorktreeSnapshot(git_paths=git_paths, run_git=self._git.run_git)
+            self._last_diff = None
+            self._last_numstat = None
+
+        try:
+            is_dirty = self._snapshot.scan().is_dirty
+        except (OSError, subprocess.SubprocessError) as exception:
+            if self.verbose:
+                click.echo(f"Stat check failed, diffing anyway: {exception}", err=True)
+
+            self._snapshot.forget()
+            is_dirty = True
+
+        if is_dirty:
+            self._last_diff = None
+            self._last_numstat = None
+
+        return is_dirty
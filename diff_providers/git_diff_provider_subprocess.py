@@ -1,16 +1,39 @@
-from base.git_diff_provider_base import GitDiffProviderBase
+from base.git_diff_provider_base import GitDiffProviderBase, GitDiffUnavailableError
+from constants.constants import DEFAULT_GIT_TIMEOUT, GIT_DIFF_CHUNK_SIZE
+from utils.circuit_breaker import CircuitOpenError, get_shared_circuit_breaker
+from utils.git_diff_parsing import GitNumstat, parse_git_numstat
+from utils.subprocess_deadline import (
+    ProcessWatchdog,
+    communicate_with_deadline,
+    kill_process_group,
+    run_with_deadline,
+)
 
 import subprocess
 import pathlib
 import sys
+import tempfile
+import typing
+
+if typing.TYPE_CHECKING:
+    import asyncio
 
 import click
 
 class GitDiffProviderSubprocess(GitDiffProviderBase):
     """
     Implementation of GitDiffProviderBase using subprocess to get git diffs.
+
+    Every git call has a deadline; a git that hits it is killed with its
+    process group, and after repeated timeouts a circuit breaker, shared
+    by every git call of the process, pauses git for a while. Both surface as GitDiffUnavailableError.
     """
 
+    def __init__(self, timeout: float = DEFAULT_GIT_TIMEOUT) -> None:
+        """Initializes the provider with the deadline for one git call."""
+        self.timeout = timeout
+        self.breaker = get_shared_circuit_breaker("git")
+
     def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
         """
         Runs git diff and returns the entire output string.
@@ -24,6 +47,62 @@ class GitDiffProviderSubprocess(GitDiffProviderBase):
         Raises:
             SystemExit: If git is not found or repo is invalid.
         """
+        return self.decode_git_diff(self.get_current_git_diff_bytes(repo_path=repo_path))
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path, is_counted: bool = True) -> bytes:
+        """
+        Runs git diff and returns the entire raw output.
+
+        Args:
+            repo_path: The path to the repository.
+            is_counted: Whether the call adds to the circuit breaker's
+                call count; False when it finishes a poll whose earlier
+                git call was already counted.
+
+        Returns:
+            The full output of git diff as bytes.
+
+        Raises:
+            SystemExit: If git is not found or repo is invalid.
+        """
+        return self._run_git_diff(repo_path=repo_path, diff_args=[], is_counted=is_counted)
+
+    def get_current_git_numstat(self, repo_path: pathlib.Path) -> typing.List[GitNumstat]:
+        """
+        Runs `git diff --numstat -z` and returns the per-file line counts.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            One entry per file in the diff, in git's output order.
+
+        Raises:
+            SystemExit: If git is not found or repo is invalid.
+        """
+        output = self._run_git_diff(repo_path=repo_path, diff_args=["--numstat", "-z"])
+
+        try:
+            return parse_git_numstat(output)
+        except ValueError as exception:
+            click.echo(f"Error parsing git diff --numstat: {exception}", err=True)
+            return []
+
+    def iter_current_git_diff_chunks(self, repo_path: pathlib.Path) -> typing.Iterator[bytes]:
+        """
+        Runs git diff and yields its raw output while it is being read,
+        without ever holding the whole diff in memory.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Yields:
+            Consecutive pieces of the git diff output.
+
+        Raises:
+            SystemExit: If git is not found.
+            GitDiffUnavailableError: If git timed out or is paused.
+        """
         git_command = [
             "git",
             "-C",
@@ -31,16 +110,154 @@ class GitDiffProviderSubprocess(GitDiffProviderBase):
             "diff",
         ]
 
+        self._before_git_call()
+
+        # stderr goes to a file, so a chatty git can not block on a full pipe
+        # while stdout is still being drained.
+        with tempfile.TemporaryFile() as stderr_file:
+            try:
+                process = subprocess.Popen(
+                    git_command,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file,
+                    start_new_session=True,
+                )
+            except FileNotFoundError:
+                click.echo(
+                    "Error: git command not found. "
+                    "Is it installed and in your PATH?",
+                    err=True,
+                )
+
+                sys.exit(1)  # Critical error, can not continue
+
+            assert process.stdout is not None
+
+            with process, ProcessWatchdog(process=process, timeout=self.timeout) as watchdog:
+                while chunk := process.stdout.read(GIT_DIFF_CHUNK_SIZE):
+                    yield chunk
+
+            if watchdog.expired:
+                self._raise_timeout()
+
+            self.breaker.record_success()
+
+            if process.returncode == 0:
+                return
+
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace").strip()
+
+        self._report_git_diff_error(repo_path=repo_path, stderr=stderr)
+
+    async def get_current_git_diff_bytes_async(self, repo_path: pathlib.Path) -> bytes:
+        """
+        Runs git diff without blocking the event loop and returns the
+        entire raw output.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            The full output of git diff as bytes.
+
+        Raises:
+            SystemExit: If git is not found.
+        """
+        return await self._run_git_diff_async(repo_path=repo_path, diff_args=[])
+
+    async def aiter_current_git_diff_chunks(self, repo_path: pathlib.Path) -> typing.AsyncIterator[bytes]:
+        """
+        Runs git diff without blocking the event loop and yields its raw
+        output while it is being read.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Yields:
+            Consecutive pieces of the git diff output.
+
+        Raises:
+            SystemExit: If git is not found.
+            GitDiffUnavailableError: If git timed out or is paused.
+        """
+        import asyncio
+
+        self._before_git_call()
+
+        with tempfile.TemporaryFile() as stderr_file:
+            process = await self._start_git_diff_async(repo_path=repo_path, diff_args=[], stderr=stderr_file)
+
+            assert process.stdout is not None
+
+            is_expired = False
+
+            try:
+                async with asyncio.timeout(self.timeout):
+                    while chunk := await process.stdout.read(GIT_DIFF_CHUNK_SIZE):
+                        yield chunk
+            except TimeoutError:
+                is_expired = True
+            finally:
+                # The consumer may stop reading early; do not leave git behind.
+                if not process.stdout.at_eof():
+                    kill_process_group(process)
+
+                await process.wait()
+
+            if is_expired:
+                self._raise_timeout()
+
+            self.breaker.record_success()
+
+            if process.returncode == 0:
+                return
+
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace").strip()
+
+        self._report_git_diff_error(repo_path=repo_path, stderr=stderr)
+
+    async def get_current_git_numstat_async(self, repo_path: pathlib.Path) -> typing.List[GitNumstat]:
+        """
+        Runs `git diff --numstat -z` without blocking the event loop and
+        returns the per-file line counts.
+
+        Args:
+            repo_path: The path to the repository.
+
+        Returns:
+            One entry per file in the diff, in git's output order.
+
+        Raises:
+            SystemExit: If git is not found.
+        """
+        output = await self._run_git_diff_async(repo_path=repo_path, diff_args=["--numstat", "-z"])
+
         try:
-            result = subprocess.run(
-                git_command,
-                capture_output=True,
-                check=True,
-                text=True,
-                encoding="utf-8",
-            )
+            return parse_git_numstat(output)
+        except ValueError as exception:
+            click.echo(f"Error parsing git diff --numstat: {exception}", err=True)
+            return []
+
+    def _run_git_diff(self, repo_path: pathlib.Path, diff_args: typing.List[str], is_counted: bool = True) -> bytes:
+        """
+        Runs git diff with extra arguments and returns its raw output.
+
+        Errors are reported and turn into an empty output, except for a
+        missing git binary, which exits, and timeouts, which raise
+        GitDiffUnavailableError.
+        """
+        git_command = [
+            "git",
+            "-C",
+            str(repo_path),
+            "diff",
+            *diff_args,
+        ]
 
-            return result.stdout
+        try:
+            return self.run_git(git_command, is_counted=is_counted)
         except FileNotFoundError:
             click.echo(
                 "Error: git command not found. "
@@ -50,21 +267,119 @@ class GitDiffProviderSubprocess(GitDiffProviderBase):
 
             sys.exit(1)  # Critical error, can not continue
         except subprocess.CalledProcessError as exception:
-            # This error is usually harmless if the repo is empty or not yet fully initialized
-            if exception.stderr.strip().startswith("fatal: not a git repository"):
-                click.echo(
-                    f"Hint: {repo_path} is not a valid git repository.",
-                    err=True,
-                )
+            stderr = exception.stderr.decode("utf-8", errors="replace").strip()
+            self._report_git_diff_error(repo_path=repo_path, stderr=stderr)
 
-                return "" # Treat as no diff
+            return b""  # Return empty bytes to maintain return type consistency
+        except GitDiffUnavailableError:
+            raise
+        except Exception as exception:
+            click.echo(f"An unexpected error occurred checking git: {exception}", err=True)
+            return b""
 
+    def run_git(self, git_command: typing.Sequence[typing.Union[str, bytes]], is_counted: bool = True) -> bytes:
+        """
+        Runs a git command under the deadline and the circuit breaker and
+        returns its stdout; other providers use it for their own git calls.
+
+        Raises:
+            GitDiffUnavailableError: If git timed out or is paused.
+            subprocess.CalledProcessError: If git failed.
+        """
+        self._before_git_call(is_counted=is_counted)
+
+        try:
+            result = run_with_deadline(git_command, timeout=self.timeout, capture_output=True, check=True)
+        except subprocess.TimeoutExpired:
+            self._raise_timeout()
+        except subprocess.CalledProcessError:
+            # git answered in time; the backend is healthy.
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+
+        return result.stdout
+
+    async def _run_git_diff_async(self, repo_path: pathlib.Path, diff_args: typing.List[str]) -> bytes:
+        """Asynchronous variant of _run_git_diff()."""
+        import asyncio
+
+        self._before_git_call()
+
+        process = await self._start_git_diff_async(
+            repo_path=repo_path,
+            diff_args=diff_args,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            stdout, stderr = await communicate_with_deadline(process=process, args=["git", "diff", *diff_args], timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self._raise_timeout()
+
+        self.breaker.record_success()
+
+        if process.returncode == 0:
+            return stdout
+
+        self._report_git_diff_error(
+            repo_path=repo_path,
+            stderr=stderr.decode("utf-8", errors="replace").strip(),
+        )
+
+        return b""
+
+    async def _start_git_diff_async(
+        self,
+        repo_path: pathlib.Path,
+        diff_args: typing.List[str],
+        stderr: typing.Any,
+    ) -> "asyncio.subprocess.Process":
+        """Starts git diff as an asyncio subprocess with stdout piped."""
+        import asyncio
+
+        try:
+            return await asyncio.create_subprocess_exec(
+                "git",
+                "-C",
+                str(repo_path),
+                "diff",
+                *diff_args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=stderr,
+                start_new_session=True,
+            )
+        except FileNotFoundError:
             click.echo(
-                f"Error checking git diff: {exception.stderr.strip()}",
+                "Error: git command not found. "
+                "Is it installed and in your PATH?",
                 err=True,
             )
 
-            return ""  # Return an empty string to maintain return type consistency
-        except Exception as exception:
-            click.echo(f"An unexpected error occurred checking git: {exception}", err=True)
-            return ""
+            sys.exit(1)  # Critical error, can not continue
+
+    def _before_git_call(self, is_counted: bool = True) -> None:
+        """Asks the circuit breaker whether git may be called."""
+        try:
+            self.breaker.before_call(is_counted=is_counted)
+        except CircuitOpenError as exception:
+            raise GitDiffUnavailableError(str(exception)) from exception
+
+    def _raise_timeout(self) -> typing.NoReturn:
+        """Records a timeout and raises it as GitDiffUnavailableError."""
+        self.breaker.record_failure()
+        raise GitDiffUnavailableError(f"git did not finish within {self.timeout:.0f} seconds and was killed")
+
+    def _report_git_diff_error(self, repo_path: pathlib.Path, stderr: str) -> None:
+        """Reports a failed git diff, with a hint for the common causes."""
+        # This error is usually harmless if the repo is empty or not yet fully initialized
+        if stderr.startswith("fatal: not a git repository"):
+            click.echo(
+                f"Hint: {repo_path} is not a valid git repository.",
+                err=True,
+            )
+
+            return
+
+        click.echo(f"Error checking git diff: {stderr}", err=True)
@@ -0,0 +1,122 @@
+from base.git_diff_provider_base import GitDiffProviderBase
+from metrics.poll_stats import PollStats
+from utils.git_diff_parsing import GitNumstat
+
+import pathlib
+import time
+import typing
+
+class GitDiffProviderTimed(GitDiffProviderBase):
+    """
+    Implementation of GitDiffProviderBase that sits in front of another
+    provider and records the time spent in it, and the bytes it returned,
+    into PollStats.
+
+    Streamed diffs are timed per chunk, so the time a detector spends
+    hashing a chunk counts as state, not as diff.
+    """
+
+    def __init__(self, inner: GitDiffProviderBase, stats: PollStats) -> None:
+        """Initializes the wrapper around the provider doing the actual work."""
+        self.inner = inner
+        self.stats = stats
+
+    def get_current_git_diff(self, repo_path: pathlib.Path) -> str:
+        """Returns the inner provider's diff as a string."""
+        started = time.perf_counter()
+        diff = self.inner.get_current_git_diff(repo_path=repo_path)
+        self.stats.observe_diff(time.perf_counter() - started, len(diff))
+
+        return diff
+
+    def get_current_git_diff_bytes(self, repo_path: pathlib.Path) -> bytes:
+        """Returns the inner provider's diff as bytes."""
+        started = time.perf_counter()
+        diff = self.inner.get_current_git_diff_bytes(repo_path=repo_path)
+        self.stats.observe_diff(time.perf_counter() - started, len(diff))
+
+        return diff
+
+    def iter_current_git_diff_chunks(self, repo_path: pathlib.Path) -> typing.Iterator[bytes]:
+        """Yields the inner provider's diff chunks."""
+        chunks = self.inner.iter_current_git_diff_chunks(repo_path=repo_path)
+        seconds = 0.0
+        byte_count = 0
+
+        try:
+            while True:
+                started = time.perf_counter()
+
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - started
+
+                byte_count += len(chunk)
+
+                yield chunk
+        finally:
+            close = getattr(chunks, "close", None)
+
+            if close is not None:
+                close()
+
+            self.stats.observe_diff(seconds, byte_count)
+
+    def get_current_git_numstat(self, repo_path: pathlib.Path) -> typing.List[GitNumstat]:
+        """Returns the inner provider's per-file line counts."""
+        started = time.perf_counter()
+        numstat = self.inner.get_current_git_numstat(repo_path=repo_path)
+        self.stats.observe_diff(time.perf_counter() - started, 0)
+
+        return numstat
+
+    async def get_current_git_diff_bytes_async(self, repo_path: pathlib.Path) -> bytes:
+        """Asynchronous variant of get_current_git_diff_bytes()."""
+        started = time.perf_counter()
+        diff = await self.inner.get_current_git_diff_bytes_async(repo_path=repo_path)
+        self.stats.observe_diff(time.perf_counter() - started, len(diff))
+
+        return diff
+
+    async def aiter_current_git_diff_chunks(self, repo_path: pathlib.Path) -> typing.AsyncIterator[bytes]:
+        """Asynchronous variant of iter_current_git_diff_chunks()."""
+        chunks = self.inner.aiter_current_git_diff_chunks(repo_path=repo_path)
+        seconds = 0.0
+        byte_count = 0
+
+        try:
+            while True:
+                started = time.perf_counter()
+
+                try:
+                    chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - started
+
+                byte_count += len(chunk)
+
+                yield chunk
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+
+            if aclose is not None:
+                await aclose()
+
+            self.stats.observe_diff(seconds, byte_count)
+
+    async def get_current_git_numstat_async(self, repo_path: pathlib.Path) -> typing.List[GitNumstat]:
+        """Asynchronous variant of get_current_git_numstat()."""
+        started = time.perf_counter()
+        numstat = await self.inner.get_current_git_numstat_async(repo_path=repo_path)
+        self.stats.observe_diff(time.perf_counter() - started, 0)
+
+        return numstat
+
+    def close(self) -> None:
+        """Closes the wrapped provider."""
+        self.inner.close()
@@ -0,0 +1,488 @@
+import array
+import hashlib
+import mmap
+import pathlib
+import struct
+import typing
+
+#: Signature at the start of every index file.
+INDEX_SIGNATURE: typing.Final[bytes] = b"DIRC"
+
+#: Index versions this reader understands.
+SUPPORTED_VERSIONS: typing.Final[typing.Tuple[int, ...]] = (2, 3, 4)
+
+#: Size of the fixed stat part of an entry: ten 32-bit fields.
+STAT_SIZE: typing.Final[int] = 40
+
+#: Entry flag bits.
+FLAG_ASSUME_VALID: typing.Final[int] = 0x8000
+FLAG_EXTENDED: typing.Final[int] = 0x4000
+FLAG_STAGE_MASK: typing.Final[int] = 0x3000
+FLAG_NAME_MASK: typing.Final[int] = 0x0FFF
+
+#: Extended flag bits (index v3 and later).
+EXTENDED_FLAG_SKIP_WORKTREE: typing.Final[int] = 0x4000
+EXTENDED_FLAG_INTENT_TO_ADD: typing.Final[int] = 0x2000
+
+#: Extensions that make the entry table incomplete on its own.
+UNSUPPORTED_EXTENSIONS: typing.Final[typing.Tuple[bytes, ...]] = (
+    b"link",  # split index: entries live in a shared index file
+    b"sdir",  # sparse index: directories stand in for their files
+)
+
+_STAT_STRUCT = struct.Struct(">10I")
+
+class GitIndexError(ValueError):
+    """Raised when an index file is malformed or can not be represented."""
+
+class GitIndexEntry(typing.NamedTuple):
+    """A single decoded index entry."""
+    path: bytes
+    oid: bytes
+    mode: int
+    stage: int
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+    ino: int
+    dev: int
+    uid: int
+    gid: int
+    flags: int
+    extended_flags: int
+
+class GitIndexExtension(typing.NamedTuple):
+    """Location of an extension section inside the index file."""
+    signature: bytes
+    offset: int
+    size: int
+
+class GitIndex:
+    """
+    Read-only view of a `.git/index` file (versions 2, 3 and 4).
+
+    The file is memory-mapped and parsed in a single pass that records
+    only the offset of each entry in an `array`; stat data, object ids
+    and flags are decoded on access. Paths are sliced straight out of
+    the map for v2/v3, and for v4 (path-prefix compression) they are
+    rebuilt on first use into one shared buffer with an offset table.
+
+    Entries keep the index order, i.e. sorted by path, then by stage.
+
+    Both passes are pure-Python loops, so the cost grows linearly at
+    roughly 0.3-0.4 µs per entry per pass: on a 100k-entry index,
+    parsing takes about 30 ms and get_paths() another 40 ms (v4: 40 ms
+    and 100 ms). A 400k-entry index therefore takes several hundred
+    milliseconds, well above a 100 ms budget; `benchmarks/bench_poll.py`
+    times both passes as `index-parse` and `index-paths`.
+    """
+
+    def __init__(
+        self,
+        buffer: typing.Union[mmap.mmap, bytes],
+        hash_size: int = 20,
+        verify_checksum: bool = False,
+    ) -> None:
+        """
+        Parses an index held in memory.
+
+        Args:
+            buffer: The whole index file.
+            hash_size: Object id length, 20 for SHA-1 and 32 for SHA-256.
+            verify_checksum: Whether to check the trailing file checksum.
+
+        Raises:
+            GitIndexError: If the file is not a supported index.
+        """
+        self._buffer = buffer
+        self.hash_size = hash_size
+
+        if len(buffer) < 12 + hash_size or buffer[:4] != INDEX_SIGNATURE:
+            raise GitIndexError("not a git index file")
+
+        self.version, self._count = struct.unpack_from(">II", buffer, 4)
+
+        if self.version not in SUPPORTED_VERSIONS:
+            raise GitIndexError(f"unsupported index version {self.version}")
+
+        if verify_checksum:
+            self._verify_checksum()
+
+        # Offset of each entry; "L" is at least 32 bits wide everywhere.
+        self._entry_offsets = array.array("L")
+
+        # v4 only: rebuilt paths and their start offsets (count + 1 items).
+        self._paths = bytearray()
+        self._path_offsets: typing.Optional[array.array] = None
+
+        if self.version == 4:
+            end = self._parse_entries_v4()
+        else:
+            end = self._parse_entries()
+
+        self.extensions = self._parse_extensions(end)
+
+    @classmethod
+    def open(
+        cls,
+        path: pathlib.Path,
+        hash_size: int = 20,
+        verify_checksum: bool = False,
+    ) -> "GitIndex":
+        """
+        Memory-maps and parses an index file.
+
+        Args:
+            path: Path to the index file, usually `.git/index`.
+            hash_size: Object id length, 20 for SHA-1 and 32 for SHA-256.
+            verify_checksum: Whether to check the trailing file checksum.
+
+        Raises:
+            OSError: If the file can not be read.
+            GitIndexError: If the file is not a supported index.
+        """
+        with open(path, "rb") as file:
+            try:
+                buffer: typing.Union[mmap.mmap, bytes] = mmap.mmap(
+                    file.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                )
+            except ValueError:
+                # Empty files can not be mapped.
+                buffer = b""
+
+        return cls(
+            buffer=buffer,
+            hash_size=hash_size,
+            verify_checksum=verify_checksum,
+        )
+
+    def close(self) -> None:
+        """Unmaps the file; the index must not be used afterwards."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "GitIndex":
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> typing.Iterator[GitIndexEntry]:
+        for index in range(self._count):
+            yield self.get_entry(index)
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the entry table lists every tracked file by itself."""
+        return not any(
+            extension.signature in UNSUPPORTED_EXTENSIONS
+            for extension in self.extensions
+        )
+
+    def get_path(self, index: int) -> bytes:
+        """Returns the path of an entry."""
+        if self.version == 4:
+            if self._path_offsets is None:
+                self._decompress_paths()
+
+            assert self._path_offsets is not None
+
+            return bytes(self._paths[self._path_offsets[index]:self._path_offsets[index + 1]])
+
+        offset = self._entry_offsets[index]
+        path_start = offset + self._get_path_offset(offset)
+        name_length = self._get_flags(offset) & FLAG_NAME_MASK
+
+        if name_length < FLAG_NAME_MASK:
+            return bytes(self._buffer[path_start:path_start + name_length])
+
+        return bytes(self._buffer[path_start:self._buffer.find(b"\0", path_start)])
+
+    def get_paths(self) -> typing.List[bytes]:
+        """Returns the paths of all entries, in index order."""
+        if self.version == 4:
+            if self._path_offsets is None:
+                self._decompress_paths()
+
+            assert self._path_offsets is not None
+
+            paths = bytes(self._paths)
+            path_offsets = self._path_offsets
+
+            return [
+                paths[path_offsets[index]:path_offsets[index + 1]]
+                for index in range(self._count)
+            ]
+
+        buffer = self._buffer
+        find = buffer.find
+        flags_offset = STAT_SIZE + self.hash_size
+        paths: typing.List[bytes] = []
+        append = paths.append
+
+        for offset in self._entry_offsets:
+            flags = buffer[offset + flags_offset] << 8 | buffer[offset + flags_offset + 1]
+            path_start = offset + flags_offset + (4 if flags & FLAG_EXTENDED else 2)
+            name_length = flags & FLAG_NAME_MASK
+
+            if name_length == FLAG_NAME_MASK:
+                append(buffer[path_start:find(b"\0", path_start)])
+            else:
+                append(buffer[path_start:path_start + name_length])
+
+        return paths
+
+    def get_modes(self) -> array.array:
+        """Returns the file modes of all entries as an array, in index order."""
+        unpack_from = struct.Struct(">I").unpack_from
+        buffer = self._buffer
+
+        return array.array(
+            "L",
+            [unpack_from(buffer, offset + 24)[0] for offset in self._entry_offsets],
+        )
+
+    def get_mode(self, index: int) -> int:
+        """Returns the file mode of an entry."""
+        return struct.unpack_from(">I", self._buffer, self._entry_offsets[index] + 24)[0]
+
+    def get_oid(self, index: int) -> bytes:
+        """Returns the raw object id of an entry."""
+        start = self._entry_offsets[index] + STAT_SIZE
+        return bytes(self._buffer[start:start + self.hash_size])
+
+    def get_stage(self, index: int) -> int:
+        """Returns the merge stage of an entry (0 unless conflicted)."""
+        return (self._get_flags(self._entry_offsets[index]) & FLAG_STAGE_MASK) >> 12
+
+    def get_entry(self, index: int) -> GitIndexEntry:
+        """Decodes every field of an entry."""
+        offset = self._entry_offsets[index]
+
+        (
+            ctime_s,
+            ctime_ns,
+            mtime_s,
+            mtime_ns,
+            dev,
+            ino,
+            mode,
+            uid,
+            gid,
+            size,
+        ) = _STAT_STRUCT.unpack_from(self._buffer, offset)
+
+        flags = self._get_flags(offset)
+        extended_flags = 0
+
+        if flags & FLAG_EXTENDED:
+            flags_end = offset + STAT_SIZE + self.hash_size + 2
+            extended_flags = int.from_bytes(self._buffer[flags_end:flags_end + 2], "big")
+
+        return GitIndexEntry(
+            path=self.get_path(index),
+            oid=self.get_oid(index),
+            mode=mode,
+            stage=(flags & FLAG_STAGE_MASK) >> 12,
+            size=size,
+            mtime_ns=mtime_s * 1_000_000_000 + mtime_ns,
+            ctime_ns=ctime_s * 1_000_000_000 + ctime_ns,
+            ino=ino,
+            dev=dev,
+            uid=uid,
+            gid=gid,
+            flags=flags,
+            extended_flags=extended_flags,
+        )
+
+    def find(self, path: bytes, stage: int = 0) -> int:
+        """
+        Binary-searches the entry for a path.
+
+        Returns:
+            The entry's position, or -1 if the path is not in the index.
+        """
+        low, high = 0, self._count
+
+        while low < high:
+            middle = (low + high) // 2
+            key = (self.get_path(middle), self.get_stage(middle))
+
+            if key < (path, stage):
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self._count and self.get_path(low) == path and self.get_stage(low) == stage:
+            return low
+
+        return -1
+
+    def read_extension(self, signature: bytes) -> typing.Optional[bytes]:
+        """Returns the raw payload of an extension, if present."""
+        for extension in self.extensions:
+            if extension.signature == signature:
+                return bytes(self._buffer[extension.offset:extension.offset + extension.size])
+
+        return None
+
+    def _get_flags(self, offset: int) -> int:
+        """Reads the 16-bit flags field of the entry at `offset`."""
+        flags_start = offset + STAT_SIZE + self.hash_size
+        return self._buffer[flags_start] << 8 | self._buffer[flags_start + 1]
+
+    def _get_path_offset(self, offset: int) -> int:
+        """Returns where the path starts, relative to the entry."""
+        if self._get_flags(offset) & FLAG_EXTENDED:
+            return STAT_SIZE + self.hash_size + 4
+
+        return STAT_SIZE + self.hash_size + 2
+
+    def _parse_entries(self) -> int:
+        """Records entry offsets for v2/v3; returns the end of the entries."""
+        buffer = self._buffer
+        flags_offset = STAT_SIZE + self.hash_size
+        path_offset = flags_offset + 2
+        limit = len(buffer) - self.hash_size
+
+        # Filling a preallocated list and converting once is the cheapest
+        # way to run this loop hundreds of thousands of times.
+        offsets = [0] * self._count
+        offset = 12
+
+        for index in range(self._count):
+            if offset + path_offset > limit:
+                raise GitIndexError("truncated index entry")
+
+            offsets[index] = offset
+            flags = buffer[offset + flags_offset] << 8 | buffer[offset + flags_offset + 1]
+
+            # Extended entry or a name too long for the length field.
+            if flags & (FLAG_EXTENDED | FLAG_NAME_MASK) >= FLAG_NAME_MASK:
+                entry_path_offset = path_offset + (2 if flags & FLAG_EXTENDED else 0)
+                name_length = flags & FLAG_NAME_MASK
+
+                if name_length == FLAG_NAME_MASK:
+                    name_length = buffer.find(b"\0", offset + entry_path_offset) - offset - entry_path_offset
+
+                offset += (entry_path_offset + name_length + 8) & ~7
+            else:
+                # Entries are NUL-padded to a multiple of eight bytes.
+                offset += (path_offset + (flags & FLAG_NAME_MASK) + 8) & ~7
+
+        self._entry_offsets = array.array("L", offsets)
+
+        return offset
+
+    def _parse_entries_v4(self) -> int:
+        """
+        Records entry offsets for v4; returns the end of the entries.
+
+        Only the entry boundaries are found here. Paths are rebuilt from
+        their compressed form the first time any of them is needed.
+        """
+        buffer = self._buffer
+        find = buffer.find
+        flags_offset = STAT_SIZE + self.hash_size
+        limit = len(buffer) - self.hash_size
+
+        offsets = [0] * self._count
+        offset = 12
+
+        for index in range(self._count):
+            if offset + flags_offset + 2 > limit:
+                raise GitIndexError("truncated index entry")
+
+            offsets[index] = offset
+            position = offset + flags_offset + (4 if buffer[offset + flags_offset] & 0x40 else 2)
+
+            # Skip the strip-length varint; only its last byte lacks the high bit.
+            while buffer[position] & 0x80:
+                position += 1
+
+            offset = find(b"\0", position + 1) + 1
+
+            if offset == 0:
+                raise GitIndexError("truncated index entry")
+
+        self._entry_offsets = array.array("L", offsets)
+
+        return offset
+
+    def _decompress_paths(self) -> None:
+        """Rebuilds every v4 path into one buffer with an offset table."""
+        buffer = self._buffer
+        find = buffer.find
+        flags_offset = STAT_SIZE + self.hash_size
+
+        paths = bytearray()
+        path_offsets = [0] * (self._count + 1)
+        previous_path = b""
+
+        for index, offset in enumerate(self._entry_offsets):
+            position = offset + flags_offset + (4 if buffer[offset + flags_offset] & 0x40 else 2)
+
+            # Offset varint: big-endian groups of 7 bits, each continuation adds one.
+            byte = buffer[position]
+            position += 1
+            strip_length = byte & 0x7F
+
+            while byte & 0x80:
+                byte = buffer[position]
+                position += 1
+                strip_length = ((strip_length + 1) << 7) | (byte & 0x7F)
+
+            if strip_length > len(previous_path):
+                raise GitIndexError("corrupt v4 path compression")
+
+            path_end = find(b"\0", position)
+            path = previous_path[:len(previous_path) - strip_length] + buffer[position:path_end]
+
+            paths += path
+            path_offsets[index + 1] = len(paths)
+            previous_path = path
+
+        self._paths = paths
+        self._path_offsets = array.array("L", path_offsets)
+
+    def _parse_extensions(self, offset: int) -> typing.List[GitIndexExtension]:
+        """Walks the extension sections between the entries and the checksum."""
+        extensions: typing.List[GitIndexExtension] = []
+        end = len(self._buffer) - self.hash_size
+
+        while offset + 8 <= end:
+            signature = bytes(self._buffer[offset:offset + 4])
+            (size,) = struct.unpack_from(">I", self._buffer, offset + 4)
+
+            if offset + 8 + size > end:
+                raise GitIndexError(f"truncated index extension {signature!r}")
+
+            extensions.append(
+                GitIndexExtension(
+                    signature=signature,
+                    offset=offset + 8,
+                    size=size,
+                ),
+            )
+
+            offset += 8 + size
+
+        if offset != end:
+            raise GitIndexError("trailing garbage after index extensions")
+
+        return extensions
+
+    def _verify_checksum(self) -> None:
+        """Checks the trailing hash over the rest of the file."""
+        algorithm = "sha1" if self.hash_size == 20 else "sha256"
+        body_end = len(self._buffer) - self.hash_size
+
+        digest = hashlib.new(algorithm, memoryview(self._buffer)[:body_end]).digest()
+
+        if digest != self._buffer[body_end:]:
+            raise GitIndexError("index checksum mismatch")
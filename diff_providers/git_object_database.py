@@ -0,0 +1,455 @@
+from constants.constants import GIT_DELTA_BASE_CACHE_BYTES
+
+import collections
+import mmap
+import pathlib
+import struct
+import typing
+import zlib
+
+#: Pack object type codes.
+OBJ_COMMIT: typing.Final[int] = 1
+OBJ_TREE: typing.Final[int] = 2
+OBJ_BLOB: typing.Final[int] = 3
+OBJ_TAG: typing.Final[int] = 4
+OBJ_OFS_DELTA: typing.Final[int] = 6
+OBJ_REF_DELTA: typing.Final[int] = 7
+
+OBJECT_TYPE_NAMES: typing.Final[typing.Dict[int, str]] = {
+    OBJ_COMMIT: "commit",
+    OBJ_TREE: "tree",
+    OBJ_BLOB: "blob",
+    OBJ_TAG: "tag",
+}
+
+#: Magic and version at the start of a v2 pack index.
+PACK_INDEX_V2_HEADER: typing.Final[bytes] = b"\377tOc\0\0\0\2"
+
+#: Bytes inflated at a time when the compressed length is unknown.
+INFLATE_CHUNK_SIZE: typing.Final[int] = 64 * 1024
+
+#: Delta chains longer than this are treated as corrupt.
+MAX_DELTA_CHAIN_LENGTH: typing.Final[int] = 10_000
+
+class GitObjectError(ValueError):
+    """Raised when an object is missing or can not be decoded."""
+
+class GitObject(typing.NamedTuple):
+    """A fully resolved object: its type name and raw content."""
+    type_name: str
+    data: bytes
+
+class _LRUCache:
+    """Least-recently-used cache bounded by the total size of its values."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._items: "collections.OrderedDict[typing.Hashable, GitObject]" = collections.OrderedDict()
+
+    def get(self, key: typing.Hashable) -> typing.Optional[GitObject]:
+        item = self._items.get(key)
+
+        if item is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._items.move_to_end(key)
+
+        return item
+
+    def put(self, key: typing.Hashable, item: GitObject) -> None:
+        if len(item.data) > self.max_bytes or key in self._items:
+            return
+
+        self._items[key] = item
+        self._size += len(item.data)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self._size -= len(evicted.data)
+
+def _inflate(buffer: typing.Union[mmap.mmap, bytes], offset: int, size: int) -> bytes:
+    """Inflates a zlib stream of known decompressed size starting at `offset`."""
+    decompressor = zlib.decompressobj()
+    chunks: typing.List[bytes] = []
+    position = offset
+
+    # Compressed data is rarely much larger than the result, so the first
+    # read usually covers the whole stream without over-copying the map.
+    read_size = min(size + 64, INFLATE_CHUNK_SIZE)
+
+    while not decompressor.eof:
+        compressed = buffer[position:position + read_size]
+        read_size = INFLATE_CHUNK_SIZE
+
+        if not compressed:
+            raise GitObjectError("truncated zlib stream in pack")
+
+        chunks.append(decompressor.decompress(compressed))
+        position += len(compressed)
+
+    data = b"".join(chunks)
+
+    if len(data) != size:
+        raise GitObjectError("pack object size mismatch")
+
+    return data
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Applies a git delta to its base object.
+
+    Raises:
+        GitObjectError: If the delta does not fit the base.
+    """
+    position = 0
+
+    def read_size() -> int:
+        nonlocal position
+        value = 0
+        shift = 0
+
+        while True:
+            byte = delta[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+
+            if not byte & 0x80:
+                return value
+
+    if read_size() != len(base):
+        raise GitObjectError("delta base size mismatch")
+
+    result_size = read_size()
+    result = bytearray()
+
+    while position < len(delta):
+        opcode = delta[position]
+        position += 1
+
+        if opcode & 0x80:
+            # Copy from base: bits 0-3 select offset bytes, bits 4-6 size bytes.
+            copy_offset = 0
+            copy_size = 0
+
+            for bit in range(4):
+                if opcode & (1 << bit):
+                    copy_offset |= delta[position] << (8 * bit)
+                    position += 1
+
+            for bit in range(3):
+                if opcode & (0x10 << bit):
+                    copy_size |= delta[position] << (8 * bit)
+                    position += 1
+
+            if copy_size == 0:
+                copy_size = 0x10000
+
+            result += base[copy_offset:copy_offset + copy_size]
+        elif opcode:
+            # Insert the next `opcode` bytes of the delta itself.
+            result += delta[position:position + opcode]
+            position += opcode
+        else:
+            raise GitObjectError("reserved delta opcode")
+
+    if len(result) != result_size:
+        raise GitObjectError("delta result size mismatch")
+
+    return bytes(result)
+
+class _PackIndex:
+    """A memory-mapped v2 `.idx` file with fan-out assisted binary search."""
+
+    def __init__(self, path: pathlib.Path, hash_size: int) -> None:
+        self.hash_size = hash_size
+
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._buffer[:8] != PACK_INDEX_V2_HEADER:
+            self._buffer.close()
+            raise GitObjectError(f"unsupported pack index {path.name}")
+
+        self._fanout = struct.unpack_from(">256I", self._buffer, 8)
+        self.count = self._fanout[255]
+
+        self._oids_offset = 8 + 256 * 4
+        self._offsets_offset = self._oids_offset + self.count * (hash_size + 4)
+        self._large_offsets_offset = self._offsets_offset + self.count * 4
+
+    def find_offset(self, oid: bytes) -> typing.Optional[int]:
+        """Returns the pack offset of an object, or None if it is not here."""
+        first_byte = oid[0]
+        low = self._fanout[first_byte - 1] if first_byte else 0
+        high = self._fanout[first_byte]
+        hash_size = self.hash_size
+
+        while low < high:
+            middle = (low + high) // 2
+            start = self._oids_offset + middle * hash_size
+            candidate = self._buffer[start:start + hash_size]
+
+            if candidate < oid:
+                low = middle + 1
+            elif candidate > oid:
+                high = middle
+            else:
+                (offset,) = struct.unpack_from(">I", self._buffer, self._offsets_offset + middle * 4)
+
+                if offset & 0x80000000:
+                    large_index = offset & 0x7FFFFFFF
+                    (offset,) = struct.unpack_from(">Q", self._buffer, self._large_offsets_offset + large_index * 8)
+
+                return offset
+
+        return None
+
+    def close(self) -> None:
+        self._buffer.close()
+
+class _Pack:
+    """A `.pack` file paired with its index."""
+
+    def __init__(self, index_path: pathlib.Path, hash_size: int) -> None:
+        self.index = _PackIndex(index_path, hash_size=hash_size)
+
+        with open(index_path.with_suffix(".pack"), "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read_header(self, offset: int) -> typing.Tuple[int, int, int]:
+        """Decodes an object header; returns (type, size, data offset)."""
+        byte = self.buffer[offset]
+        offset += 1
+        object_type = (byte >> 4) & 0x07
+        size = byte & 0x0F
+        shift = 4
+
+        while byte & 0x80:
+            byte = self.buffer[offset]
+            offset += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+
+        return object_type, size, offset
+
+    def read_ofs_delta_base(self, offset: int) -> typing.Tuple[int, int]:
+        """Decodes the negative base offset of an OFS_DELTA; returns (distance, data offset)."""
+        byte = self.buffer[offset]
+        offset += 1
+        distance = byte & 0x7F
+
+        while byte & 0x80:
+            byte = self.buffer[offset]
+            offset += 1
+            distance = ((distance + 1) << 7) | (byte & 0x7F)
+
+        return distance, offset
+
+    def close(self) -> None:
+        self.index.close()
+        self.buffer.close()
+
+class GitObjectDatabase:
+    """
+    In-process reader for a repository's object store.
+
+    Reads loose objects by inflating them, and packed objects by
+    binary-searching memory-mapped `.idx` v2 files and resolving
+    OFS/REF delta chains from the `.pack` files. Resolved delta bases
+    are kept in a bounded LRU cache, since consecutive reads tend to
+    share them. Alternates listed in `objects/info/alternates` are
+    searched as well.
+    """
+
+    def __init__(
+        self,
+        objects_dir: pathlib.Path,
+        hash_size: int = 20,
+        cache_bytes: int = GIT_DELTA_BASE_CACHE_BYTES,
+    ) -> None:
+        """
+        Initializes the reader.
+
+        Args:
+            objects_dir: The `objects` directory of the repository.
+            hash_size: Object id length, 20 for SHA-1 and 32 for SHA-256.
+            cache_bytes: Upper bound for the delta base cache.
+        """
+        self.objects_dir = objects_dir
+        self.hash_size = hash_size
+        self.base_cache = _LRUCache(max_bytes=cache_bytes)
+        self._packs: typing.Dict[pathlib.Path, _Pack] = {}
+        self._alternates = [
+            GitObjectDatabase(
+                objects_dir=alternate,
+                hash_size=hash_size,
+                cache_bytes=cache_bytes,
+            )
+            for alternate in self._read_alternates()
+        ]
+
+        self._scan_packs()
+
+    def read(self, oid: bytes) -> GitObject:
+        """
+        Reads and fully resolves an object.
+
+        Args:
+            oid: The raw (binary) object id.
+
+        Raises:
+            GitObjectError: If the object is missing or corrupt.
+        """
+        item = self._read_or_none(oid)
+
+        if item is None:
+            # A repack may have happened since the packs were listed.
+            self._scan_packs()
+            item = self._read_or_none(oid)
+
+        if item is None:
+            raise GitObjectError(f"object {oid.hex()} not found")
+
+        return item
+
+    def close(self) -> None:
+        """Unmaps every pack."""
+        for pack in self._packs.values():
+            pack.close()
+
+        self._packs.clear()
+
+        for alternate in self._alternates:
+            alternate.close()
+
+    def _read_or_none(self, oid: bytes) -> typing.Optional[GitObject]:
+        for pack in self._packs.values():
+            offset = pack.index.find_offset(oid)
+
+            if offset is not None:
+                return self._read_packed(pack, offset)
+
+        item = self._read_loose(oid)
+
+        if item is not None:
+            return item
+
+        for alternate in self._alternates:
+            item = alternate._read_or_none(oid)
+
+            if item is not None:
+                return item
+
+        return None
+
+    def _read_loose(self, oid: bytes) -> typing.Optional[GitObject]:
+        hex_oid = oid.hex()
+
+        try:
+            compressed = (self.objects_dir / hex_oid[:2] / hex_oid[2:]).read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            raw = zlib.decompress(compressed)
+        except zlib.error as exception:
+            raise GitObjectError(f"corrupt loose object {hex_oid}") from exception
+
+        header, _, data = raw.partition(b"\0")
+        type_name, _, size = header.partition(b" ")
+
+        if int(size) != len(data):
+            raise GitObjectError(f"loose object {hex_oid} size mismatch")
+
+        return GitObject(type_name=type_name.decode("ascii"), data=data)
+
+    def _read_packed(self, pack: _Pack, offset: int) -> GitObject:
+        """Resolves the object at `offset`, walking its delta chain iteratively."""
+        deltas: typing.List[bytes] = []
+        chain: typing.List[typing.Tuple[_Pack, int]] = []
+        base: typing.Optional[GitObject] = None
+
+        while base is None:
+            if len(chain) > MAX_DELTA_CHAIN_LENGTH:
+                raise GitObjectError("delta chain too long")
+
+            base = self.base_cache.get((id(pack), offset))
+
+            if base is not None:
+                break
+
+            chain.append((pack, offset))
+            object_type, size, data_offset = pack.read_header(offset)
+
+            if object_type == OBJ_OFS_DELTA:
+                distance, data_offset = pack.read_ofs_delta_base(data_offset)
+                deltas.append(_inflate(pack.buffer, data_offset, size))
+                offset -= distance
+            elif object_type == OBJ_REF_DELTA:
+                base_oid = pack.buffer[data_offset:data_offset + self.hash_size]
+                deltas.append(_inflate(pack.buffer, data_offset + self.hash_size, size))
+                base = self._read_ref_delta_base(base_oid)
+            elif object_type in OBJECT_TYPE_NAMES:
+                base = GitObject(
+                    type_name=OBJECT_TYPE_NAMES[object_type],
+                    data=_inflate(pack.buffer, data_offset, size),
+                )
+                chain.pop()
+                self.base_cache.put((id(pack), offset), base)
+            else:
+                raise GitObjectError(f"unknown pack object type {object_type}")
+
+        # Apply deltas from the innermost base outwards, caching each step.
+        while deltas:
+            delta_pack, delta_offset = chain.pop()
+            base = GitObject(
+                type_name=base.type_name,
+                data=apply_delta(base.data, deltas.pop()),
+            )
+            self.base_cache.put((id(delta_pack), delta_offset), base)
+
+        return base
+
+    def _read_ref_delta_base(self, oid: bytes) -> GitObject:
+        item = self._read_or_none(oid)
+
+        if item is None:
+            raise GitObjectError(f"delta base {oid.hex()} not found")
+
+        return item
+
+    def _scan_packs(self) -> None:
+        pack_dir = self.objects_dir / "pack"
+
+        try:
+            index_paths = sorted(pack_dir.glob("*.idx"))
+        except OSError:
+            return
+
+        for index_path in index_paths:
+            if index_path in self._packs or not index_path.with_suffix(".pack").exists():
+                continue
+
+            try:
+                self._packs[index_path] = _Pack(index_path, hash_size=self.hash_size)
+            except (OSError, ValueError):
+                # Half-written pack from a concurrent repack; retried later.
+                continue
+
+    def _read_alternates(self) -> typing.List[pathlib.Path]:
+        try:
+            content = (self.objects_dir / "info" / "alternates").read_text(encoding="utf-8")
+        except OSError:
+            return []
+
+        return [
+            (self.objects_dir / line.strip()).resolve()
+            for line in content.splitlines()
+            if line.strip() and not line.startswith("#")
+        ]
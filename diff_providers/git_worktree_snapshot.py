@@ -0,0 +1,236 @@
+from constants.constants import DEFAULT_GIT_TIMEOUT, GIT_RACY_WINDOW_NS
+from diff_providers.git_index_reader import GitIndex, GitIndexError
+from utils.git_paths import GitPaths, read_git_dir, read_object_hash_size
+from utils.subprocess_deadline import run_with_deadline
+
+import os
+import pathlib
+import time
+import typing
+
+#: Mode of a submodule entry in the index.
+GITLINK_MODE: typing.Final[bytes] = b"160000"
+
+#: Stat fingerprint of a single file: (mtime_ns, ctime_ns, size, inode, mode).
+StatSignature = typing.Tuple[int, ...]
+
+def _run_git_with_default_timeout(git_command: typing.Sequence[str]) -> bytes:
+    """Runs git under DEFAULT_GIT_TIMEOUT and returns its stdout."""
+    return run_with_deadline(git_command, timeout=DEFAULT_GIT_TIMEOUT, capture_output=True, check=True).stdout
+
+class WorktreeScan(typing.NamedTuple):
+    """Result of comparing the worktree against the previous snapshot."""
+    is_index_changed: bool
+    is_head_changed: bool
+    changed_paths: typing.List[bytes]
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether anything at all moved since the previous scan."""
+        return self.is_index_changed or self.is_head_changed or bool(self.changed_paths)
+
+def get_stat_signature(path: typing.Union[bytes, pathlib.Path]) -> typing.Optional[StatSignature]:
+    """Returns the stat fingerprint of a path, or None if it is missing."""
+    try:
+        file_stat = os.lstat(path)
+    except OSError:
+        return None
+
+    return (
+        file_stat.st_mtime_ns,
+        file_stat.st_ctime_ns,
+        file_stat.st_size,
+        file_stat.st_ino,
+        file_stat.st_mode,
+    )
+
+class GitWorktreeSnapshot:
+    """
+    Stat fingerprint of every tracked file plus `.git/index` and
+    `.git/HEAD`, used to tell cheaply whether a worktree may have changed.
+
+    The list of tracked files is reloaded from the index only when the
+    index file moves. Files modified within GIT_RACY_WINDOW_NS of
+    a scan are racily clean: their stat data may not change on the next
+    write (coarse filesystem timestamps), so they are reported as changed
+    until they age out of the window.
+    """
+
+    def __init__(
+        self,
+        git_paths: GitPaths,
+        run_git: typing.Optional[typing.Callable[[typing.Sequence[str]], bytes]] = None,
+    ) -> None:
+        """
+        Initializes an empty snapshot; the first scan reports everything.
+
+        Args:
+            git_paths: The worktree and git dir to watch.
+            run_git: Runs a git command and returns its stdout, raising
+                OSError or subprocess.SubprocessError on failure; used
+                when the index can not be read in-process. Defaults to
+                running git with DEFAULT_GIT_TIMEOUT.
+        """
+        self.git_paths = git_paths
+        self._run_git = run_git if run_git is not None else _run_git_with_default_timeout
+        self.tracked_modes: typing.Dict[bytes, bytes] = {}
+        self._index_signature: typing.Optional[StatSignature] = None
+        self._head_signature: typing.Optional[StatSignature] = None
+        self._signatures: typing.Dict[bytes, typing.Optional[StatSignature]] = {}
+        self._racy_paths: typing.Set[bytes] = set()
+        self._is_index_racy = False
+        self._is_initialized = False
+
+    def scan(self) -> WorktreeScan:
+        """
+        Compares the worktree against the previous scan and remembers
+        the new fingerprint.
+
+        Returns:
+            What moved since the previous scan.
+
+        Raises:
+            subprocess.SubprocessError: If listing tracked files fails or times out.
+        """
+        scan_started_ns = time.time_ns()
+
+        index_signature = get_stat_signature(self.git_paths.git_dir / "index")
+        head_signature = get_stat_signature(self.git_paths.git_dir / "HEAD")
+
+        is_index_changed = (
+            not self._is_initialized
+            or index_signature != self._index_signature
+            or self._is_index_racy
+        )
+
+        is_head_changed = (
+            not self._is_initialized
+            or head_signature != self._head_signature
+        )
+
+        if is_index_changed:
+            self.load_tracked_files()
+
+        self._index_signature = index_signature
+        self._head_signature = head_signature
+        self._is_index_racy = self._is_racy(index_signature, scan_started_ns)
+        self._is_initialized = True
+
+        worktree = os.fsencode(self.git_paths.worktree)
+
+        changed_paths: typing.List[bytes] = []
+        signatures: typing.Dict[bytes, typing.Optional[StatSignature]] = {}
+        racy_paths: typing.Set[bytes] = set()
+
+        for path, mode in self.tracked_modes.items():
+            full_path = os.path.join(worktree, path)
+
+            if mode == GITLINK_MODE:
+                signature = self._get_gitlink_signature(full_path)
+            else:
+                signature = get_stat_signature(full_path)
+
+            signatures[path] = signature
+
+            # A racily clean path is reported once more after it was seen.
+            if path in self._racy_paths or signature != self._signatures.get(path, ()):
+                changed_paths.append(path)
+
+            if self._is_racy(signature, scan_started_ns):
+                racy_paths.add(path)
+
+        self._signatures = signatures
+        self._racy_paths = racy_paths
+
+        return WorktreeScan(
+            is_index_changed=is_index_changed,
+            is_head_changed=is_head_changed,
+            changed_paths=changed_paths,
+        )
+
+    def get_signature(self, path: bytes) -> typing.Optional[StatSignature]:
+        """Returns the fingerprint a tracked path had during the last scan."""
+        return self._signatures.get(path)
+
+    def forget(self) -> None:
+        """Drops all remembered signatures, so the next scan reports everything."""
+        self._signatures.clear()
+        self._racy_paths.clear()
+        self._is_initialized = False
+
+    def _is_racy(self, signature: typing.Optional[StatSignature], scan_started_ns: int) -> bool:
+        """Whether a file was modified too recently to trust its stat data."""
+        return signature is not None and signature[0] >= scan_started_ns - GIT_RACY_WINDOW_NS
+
+    def load_tracked_files(self) -> None:
+        """
+        Reloads the tracked file list and modes from the index into
+        `tracked_modes`, without taking any stat fingerprints.
+
+        Raises:
+            subprocess.SubprocessError: If the index can not be read
+                in-process and `git ls-files` fails or times out.
+        """
+        try:
+            with GitIndex.open(
+                path=self.git_paths.git_dir / "index",
+                hash_size=read_object_hash_size(self.git_paths.git_dir),
+            ) as index:
+                if index.is_complete:
+                    modes = index.get_modes()
+                    mode_names = {mode: b"%o" % mode for mode in set(modes)}
+
+                    self.tracked_modes = {
+                        path: mode_names[mode]
+                        for path, mode in zip(index.get_paths(), modes)
+                    }
+
+                    return
+        except FileNotFoundError:
+            # Fresh repository without an index yet.
+            self.tracked_modes = {}
+            return
+        except (OSError, GitIndexError):
+            pass
+
+        self._load_tracked_files_with_git()
+
+    def _load_tracked_files_with_git(self) -> None:
+        """Reloads the tracked file list via `git ls-files`."""
+        git_command = [
+            "git",
+            "-C",
+            str(self.git_paths.worktree),
+            "ls-files",
+            "--stage",
+            "-z",
+        ]
+
+        output = self._run_git(git_command)
+
+        tracked_modes: typing.Dict[bytes, bytes] = {}
+
+        for record in output.split(b"\0"):
+            if not record:
+                continue
+
+            # "<mode> <object> <stage>\t<path>"
+            info, _, path = record.partition(b"\t")
+            tracked_modes[path] = info.split(b" ", 1)[0]
+
+        self.tracked_modes = tracked_modes
+
+    def _get_gitlink_signature(self, submodule_path: bytes) -> typing.Optional[StatSignature]:
+        """Fingerprints a submodule by its HEAD and index files."""
+        git_dir = read_git_dir(pathlib.Path(os.fsdecode(submodule_path)))
+
+        if git_dir is None:
+            return None
+
+        head_signature = get_stat_signature(git_dir / "HEAD") or ()
+        index_signature = get_stat_signature(git_dir / "index") or ()
+
+        # Keep mtime first, so the racy check looks at the newest of both.
+        newest_mtime_ns = max(head_signature[:1] + index_signature[:1], default=0)
+
+        return (newest_mtime_ns, *head_signature, *index_signature)
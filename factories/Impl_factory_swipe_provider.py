@@ -1,26 +1,100 @@
+from base.gesture_backend_base import GestureBackendBase
 from base.impl_factory_base import ImplFactoryBase
 from base.swipe_provider_base import SwipeProviderBase
-from constants.enums import SwipeProviders
-from swipe_providers.swipe_provider_adb import SwipeProviderADB
+from constants.constants import DEFAULT_ADB_TIMEOUT, SWIPE_PROVIDERS_ENTRY_POINT_GROUP
+from constants.enums import GestureBackends, SwipeProviders
+from factories.impl_factory_gesture_backend import ImplFactoryGestureBackend
+from utils.impl_registry import ImplRegistry
 
 import typing
 
+if typing.TYPE_CHECKING:
+    from utils.adb_device_monitor import AdbDeviceMonitor
+
+#: Swipe providers by name, imported on demand.
+SWIPE_PROVIDER_REGISTRY: typing.Final[ImplRegistry[SwipeProviderBase]] = ImplRegistry(
+    base_class=SwipeProviderBase,
+    entry_point_group=SWIPE_PROVIDERS_ENTRY_POINT_GROUP,
+    builtins={
+        SwipeProviders.ADB: "swipe_providers.swipe_provider_adb:SwipeProviderADB",
+        SwipeProviders.ADB_SHELL: "swipe_providers.swipe_provider_adb_shell:SwipeProviderADBShell",
+        SwipeProviders.ADB_SOCKET: "swipe_providers.swipe_provider_adb_socket:SwipeProviderADBSocket",
+        SwipeProviders.ADB_ALL: "swipe_providers.swipe_provider_adb_fan_out:SwipeProviderADBFanOut",
+        SwipeProviders.NULL: "swipe_providers.swipe_provider_null:SwipeProviderNull",
+    },
+)
+
 class ImplFactorySwipeProvider(ImplFactoryBase[SwipeProviderBase, SwipeProviders]):
     """
     Factory for creating instances of SwipeProviderBase implementations.
     """
 
-    def __init__(self, verbose: bool):
+    def __init__(
+        self,
+        verbose: bool,
+        serial: typing.Optional[str] = None,
+        gesture_backend_name: str = GestureBackends.INPUT,
+        follow_rotation: bool = False,
+        device_monitor: typing.Optional["AdbDeviceMonitor"] = None,
+        timeout: float = DEFAULT_ADB_TIMEOUT,
+    ):
         self.verbose = verbose
+        self.serial = serial
+        self.gesture_backend_factory = ImplFactoryGestureBackend(verbose=verbose, follow_rotation=follow_rotation)
+        self.gesture_backend_name = gesture_backend_name
+        self.device_monitor = device_monitor
+        self.timeout = timeout
 
     @property
-    def impl_name_class(self) -> type[SwipeProviders]:
-        return SwipeProviders
+    def registry(self) -> ImplRegistry[SwipeProviderBase]:
+        return SWIPE_PROVIDER_REGISTRY
+
+    def get_impl_kwargs(self) -> typing.Dict[str, typing.Any]:
+        """
+        Returns the keyword arguments third-party swipe providers are
+        created with.
+        """
+        return {
+            "verbose": self.verbose,
+            "serial": self.serial,
+            "timeout": self.timeout,
+        }
 
-    def get_impl_map(self) -> typing.Dict[SwipeProviders, typing.Callable[[], SwipeProviderBase]]:
+    def get_impl_map(self) -> typing.Dict[SwipeProviders, typing.Callable[[type[SwipeProviderBase]], SwipeProviderBase]]:
         """
         Returns a map of swipe provider names to their factory functions.
         """
         return {
-            SwipeProviders.ADB: lambda: SwipeProviderADB(verbose=self.verbose),
+            SwipeProviders.ADB: lambda impl_class: impl_class(
+                verbose=self.verbose,
+                serial=self.serial,
+                gesture_backend=self._get_gesture_backend(),
+                device_monitor=self.device_monitor,
+                timeout=self.timeout,
+            ),
+            SwipeProviders.ADB_SHELL: lambda impl_class: impl_class(
+                verbose=self.verbose,
+                serial=self.serial,
+                gesture_backend=self._get_gesture_backend(),
+                device_monitor=self.device_monitor,
+                timeout=self.timeout,
+            ),
+            SwipeProviders.ADB_SOCKET: lambda impl_class: impl_class(
+                verbose=self.verbose,
+                serial=self.serial,
+                gesture_backend=self._get_gesture_backend(),
+                device_monitor=self.device_monitor,
+                timeout=self.timeout,
+            ),
+            SwipeProviders.ADB_ALL: lambda impl_class: impl_class(
+                verbose=self.verbose,
+                gesture_backend_factory=self._get_gesture_backend,
+                device_monitor=self.device_monitor,
+                timeout=self.timeout,
+            ),
+            SwipeProviders.NULL: lambda impl_class: impl_class(verbose=self.verbose),
         }
+
+    def _get_gesture_backend(self) -> GestureBackendBase:
+        """Creates a fresh instance of the chosen gesture backend."""
+        return self.gesture_backend_factory.get_impl_instance(self.gesture_backend_name)
@@ -0,0 +1,39 @@
+from base.gesture_backend_base import GestureBackendBase
+from base.impl_factory_base import ImplFactoryBase
+from constants.constants import GESTURE_BACKENDS_ENTRY_POINT_GROUP
+from constants.enums import GestureBackends
+from utils.impl_registry import ImplRegistry
+
+import typing
+
+#: Gesture backends by name, imported on demand.
+GESTURE_BACKEND_REGISTRY: typing.Final[ImplRegistry[GestureBackendBase]] = ImplRegistry(
+    base_class=GestureBackendBase,
+    entry_point_group=GESTURE_BACKENDS_ENTRY_POINT_GROUP,
+    builtins={
+        GestureBackends.INPUT: "gesture_backends.gesture_backend_input:GestureBackendInput",
+        GestureBackends.SENDEVENT: "gesture_backends.gesture_backend_sendevent:GestureBackendSendevent",
+    },
+)
+
+class ImplFactoryGestureBackend(ImplFactoryBase[GestureBackendBase, GestureBackends]):
+    """
+    Factory for creating instances of GestureBackendBase implementations.
+    """
+
+    def __init__(self, verbose: bool, follow_rotation: bool = False):
+        self.verbose = verbose
+        self.follow_rotation = follow_rotation
+
+    @property
+    def registry(self) -> ImplRegistry[GestureBackendBase]:
+        return GESTURE_BACKEND_REGISTRY
+
+    def get_impl_kwargs(self) -> typing.Dict[str, typing.Any]:
+        """
+        Returns the keyword arguments gesture backends are created with.
+        """
+        return {
+            "verbose": self.verbose,
+            "follow_rotation": self.follow_rotation,
+        }
@@ -1,30 +1,50 @@
-
 from base.git_diff_changes_detector_base import GitDiffChangesDetectorBase
+from base.git_diff_provider_base import GitDiffProviderBase
 from base.impl_factory_base import ImplFactoryBase
+from constants.constants import CHANGE_DETECTORS_ENTRY_POINT_GROUP
 from constants.enums import ChangeDetectors
-from change_detectors.git_diff_changes_detector_line_count import GitDiffChangesDetectorLineCount
-from change_detectors.git_diff_changes_detector_exact import GitDiffChangesDetectorExact
+from utils.detector_state_file import DetectorStateFile
+from utils.impl_registry import ImplRegistry
 
 import typing
 import pathlib
 
+#: Change detectors by name, imported on demand.
+CHANGE_DETECTOR_REGISTRY: typing.Final[ImplRegistry[GitDiffChangesDetectorBase]] = ImplRegistry(
+    base_class=GitDiffChangesDetectorBase,
+    entry_point_group=CHANGE_DETECTORS_ENTRY_POINT_GROUP,
+    builtins={
+        ChangeDetectors.LINECOUNT: "change_detectors.git_diff_changes_detector_line_count:GitDiffChangesDetectorLineCount",
+        ChangeDetectors.EXACT: "change_detectors.git_diff_changes_detector_exact:GitDiffChangesDetectorExact",
+        ChangeDetectors.NUMSTAT: "change_detectors.git_diff_changes_detector_numstat:GitDiffChangesDetectorNumstat",
+    },
+)
+
 class ImplFactoryGitDiffChangesDetector(ImplFactoryBase[GitDiffChangesDetectorBase, ChangeDetectors]):
     """
     Factory for creating instances of GitDiffChangesDetectorBase implementations.
     """
 
-    def __init__(self, repo_path: pathlib.Path):
+    def __init__(
+        self,
+        repo_path: pathlib.Path,
+        diff_provider: GitDiffProviderBase,
+        state_file: typing.Optional[DetectorStateFile] = None,
+    ):
         self.repo_path = repo_path
+        self.diff_provider = diff_provider
+        self.state_file = state_file
 
     @property
-    def impl_name_class(self) -> type[ChangeDetectors]:
-        return ChangeDetectors
+    def registry(self) -> ImplRegistry[GitDiffChangesDetectorBase]:
+        return CHANGE_DETECTOR_REGISTRY
 
-    def get_impl_map(self) -> typing.Dict[ChangeDetectors, typing.Callable[[], GitDiffChangesDetectorBase]]:
+    def get_impl_kwargs(self) -> typing.Dict[str, typing.Any]:
         """
-        Returns a map of change detector names to their factory functions.
+        Returns the keyword arguments change detectors are created with.
         """
         return {
-            ChangeDetectors.LINECOUNT: lambda: GitDiffChangesDetectorLineCount(repo_path=self.repo_path),
-            ChangeDetectors.EXACT: lambda: GitDiffChangesDetectorExact(repo_path=self.repo_path),
+            "repo_path": self.repo_path,
+            "diff_provider": self.diff_provider,
+            "state_file": self.state_file,
         }
@@ -0,0 +1,49 @@
+from base.git_diff_provider_base import GitDiffProviderBase
+from base.impl_factory_base import ImplFactoryBase
+from constants.constants import DEFAULT_GIT_TIMEOUT, GIT_DIFF_PROVIDERS_ENTRY_POINT_GROUP
+from constants.enums import GitDiffProviders
+from utils.impl_registry import ImplRegistry
+
+import typing
+
+#: Git diff providers by name, imported on demand.
+GIT_DIFF_PROVIDER_REGISTRY: typing.Final[ImplRegistry[GitDiffProviderBase]] = ImplRegistry(
+    base_class=GitDiffProviderBase,
+    entry_point_group=GIT_DIFF_PROVIDERS_ENTRY_POINT_GROUP,
+    builtins={
+        GitDiffProviders.SUBPROCESS: "diff_providers.git_diff_provider_subprocess:GitDiffProviderSubprocess",
+        GitDiffProviders.BATCH: "diff_providers.git_diff_provider_batch:GitDiffProviderBatch",
+        GitDiffProviders.NATIVE: "diff_providers.git_diff_provider_native:GitDiffProviderNative",
+        GitDiffProviders.INCREMENTAL: "diff_providers.git_diff_provider_incremental:GitDiffProviderIncremental",
+    },
+)
+
+class ImplFactoryGitDiffProvider(ImplFactoryBase[GitDiffProviderBase, GitDiffProviders]):
+    """
+    Factory for creating instances of GitDiffProviderBase implementations.
+    """
+
+    def __init__(self, verbose: bool, timeout: float = DEFAULT_GIT_TIMEOUT):
+        self.verbose = verbose
+        self.timeout = timeout
+
+    @property
+    def registry(self) -> ImplRegistry[GitDiffProviderBase]:
+        return GIT_DIFF_PROVIDER_REGISTRY
+
+    def get_impl_kwargs(self) -> typing.Dict[str, typing.Any]:
+        """
+        Returns the keyword arguments git diff providers are created with.
+        """
+        return {
+            "verbose": self.verbose,
+            "timeout": self.timeout,
+        }
+
+    def get_impl_map(self) -> typing.Dict[GitDiffProviders, typing.Callable[[type[GitDiffProviderBase]], GitDiffProviderBase]]:
+        """
+        Returns a map of git diff provider names to their factory functions.
+        """
+        return {
+            GitDiffProviders.SUBPROCESS: lambda impl_class: impl_class(timeout=self.timeout),
+        }
@@ -0,0 +1,58 @@
+from base.git_diff_changes_detector_base import GitDiffChangesDetectorBase
+from base.impl_factory_base import ImplFactoryBase
+from base.runtime_base import RuntimeBase
+from base.swipe_provider_base import SwipeProviderBase
+from base.watcher_base import WatcherBase
+from constants.constants import RUNTIMES_ENTRY_POINT_GROUP
+from constants.enums import Runtimes
+from utils.impl_registry import ImplRegistry
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from metrics.poll_stats import PollStats
+
+#: Runtimes by name, imported on demand.
+RUNTIME_REGISTRY: typing.Final[ImplRegistry[RuntimeBase]] = ImplRegistry(
+    base_class=RuntimeBase,
+    entry_point_group=RUNTIMES_ENTRY_POINT_GROUP,
+    builtins={
+        Runtimes.SYNC: "runtimes.runtime_sync:RuntimeSync",
+        Runtimes.ASYNCIO: "runtimes.runtime_asyncio:RuntimeAsyncio",
+    },
+)
+
+class ImplFactoryRuntime(ImplFactoryBase[RuntimeBase, Runtimes]):
+    """
+    Factory for creating instances of RuntimeBase implementations.
+    """
+
+    def __init__(
+        self,
+        detector: GitDiffChangesDetectorBase,
+        provider: SwipeProviderBase,
+        watcher: WatcherBase,
+        verbose: bool,
+        stats: typing.Optional["PollStats"] = None,
+    ):
+        self.detector = detector
+        self.provider = provider
+        self.watcher = watcher
+        self.verbose = verbose
+        self.stats = stats
+
+    @property
+    def registry(self) -> ImplRegistry[RuntimeBase]:
+        return RUNTIME_REGISTRY
+
+    def get_impl_kwargs(self) -> typing.Dict[str, typing.Any]:
+        """
+        Returns the keyword arguments runtimes are created with.
+        """
+        return {
+            "detector": self.detector,
+            "provider": self.provider,
+            "watcher": self.watcher,
+            "verbose": self.verbose,
+            "stats": self.stats,
+        }
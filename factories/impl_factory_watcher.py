@@ -0,0 +1,66 @@
+from base.impl_factory_base import ImplFactoryBase
+from base.watcher_base import WatcherBase
+from constants.constants import WATCHERS_ENTRY_POINT_GROUP
+from constants.enums import WatchModes
+from utils.impl_registry import ImplRegistry
+
+import pathlib
+import typing
+
+#: Watchers by name, imported on demand.
+WATCHER_REGISTRY: typing.Final[ImplRegistry[WatcherBase]] = ImplRegistry(
+    base_class=WatcherBase,
+    entry_point_group=WATCHERS_ENTRY_POINT_GROUP,
+    builtins={
+        WatchModes.POLL: "watchers.watcher_poll:WatcherPoll",
+        WatchModes.INOTIFY: "watchers.watcher_inotify:WatcherInotify",
+    },
+)
+
+class ImplFactoryWatcher(ImplFactoryBase[WatcherBase, WatchModes]):
+    """
+    Factory for creating instances of WatcherBase implementations.
+    """
+
+    def __init__(
+        self,
+        repo_path: pathlib.Path,
+        poll_interval: float,
+        min_poll_interval: float,
+        max_poll_interval: float,
+        verbose: bool,
+    ):
+        self.repo_path = repo_path
+        self.poll_interval = poll_interval
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.verbose = verbose
+
+    @property
+    def registry(self) -> ImplRegistry[WatcherBase]:
+        return WATCHER_REGISTRY
+
+    def get_impl_kwargs(self) -> typing.Dict[str, typing.Any]:
+        """
+        Returns the keyword arguments watchers are created with.
+        """
+        return {
+            "repo_path": self.repo_path,
+            "poll_interval": self.poll_interval,
+            "min_interval": self.min_poll_interval,
+            "max_interval": self.max_poll_interval,
+            "verbose": self.verbose,
+        }
+
+    def get_impl_map(self) -> typing.Dict[WatchModes, typing.Callable[[type[WatcherBase]], WatcherBase]]:
+        """
+        Returns a map of watch mode names to their factory functions.
+        """
+        return {
+            WatchModes.POLL: lambda impl_class: impl_class(
+                poll_interval=self.poll_interval,
+                min_interval=self.min_poll_interval,
+                max_interval=self.max_poll_interval,
+                verbose=self.verbose,
+            ),
+        }
@@ -0,0 +1,130 @@
+from base.gesture_backend_base import DeviceCommandError, GestureBackendBase
+from constants.constants import (
+    ADB_DEVICE_ID_COMMAND,
+    ADB_GEOMETRY_COMMAND,
+    ADB_SWIPE_DEVICE_COMMAND,
+    ADB_SWIPE_DURATION_MS,
+    ADB_SWIPE_FRACTIONS,
+)
+from utils.adb_gestures import (
+    DeviceGeometry,
+    SwipeFractions,
+    parse_wm_density,
+    parse_wm_size,
+)
+from utils.device_geometry_cache import DeviceGeometryCache
+
+import shlex
+import typing
+
+import click
+
+class GestureBackendInput(GestureBackendBase):
+    """
+    A gesture backend that runs Android's `input swipe` tool.
+
+    Works on every device, but `input` starts a Java process
+    (app_process) for each gesture, which dominates on-device latency.
+
+    The swipe is derived from ADB_SWIPE_FRACTIONS and the device's screen
+    geometry, which is read once per serial and build and kept in a
+    DeviceGeometryCache. The coordinates are those for the rotation when
+    the swipe is built, or picked on the device in every swipe with
+    `follow_rotation`. If the geometry can not be read, the
+    fixed ADB_SWIPE_DEVICE_COMMAND is used: for good if the device
+    answered (the probe failed or printed nothing usable), for that swipe
+    only if the device could not be reached.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        follow_rotation: bool = False,
+        geometry_cache: typing.Optional[DeviceGeometryCache] = None,
+    ) -> None:
+        """Initializes the backend; the device is probed on first use."""
+        super().__init__(verbose=verbose, follow_rotation=follow_rotation)
+        self.geometry_cache = geometry_cache if geometry_cache is not None else DeviceGeometryCache()
+        self._swipe_command: typing.Optional[str] = None
+
+    def get_swipe_command(self, run_device_command: typing.Callable[[str], str]) -> str:
+        """Returns the `input swipe` command line, probing the device until it answers."""
+        if self._swipe_command is not None:
+            return self._swipe_command
+
+        try:
+            geometry = self._get_geometry(run_device_command)
+            swipe_command = self._build_swipe_command(geometry, run_device_command)
+        except DeviceCommandError as exception:
+            click.echo(f"Warning: reading the screen geometry failed ({exception}), using fixed swipe coordinates.", err=True)
+            swipe_command = self._build_swipe_command(None, run_device_command)
+        except OSError as exception:
+            click.echo(f"Warning: reading the screen geometry failed ({exception}), using fixed swipe coordinates for now.", err=True)
+            return shlex.join(ADB_SWIPE_DEVICE_COMMAND)
+
+        self._swipe_command = swipe_command
+
+        return self._swipe_command
+
+    def _build_swipe_command(self, geometry: typing.Optional[DeviceGeometry], run_device_command: typing.Callable[[str], str]) -> str:
+        """
+        Scales the swipe to the device for every rotation and picks the
+        command line for the display's rotation.
+
+        Raises:
+            OSError: If the rotation could not be read.
+        """
+        if geometry is None:
+            return shlex.join(ADB_SWIPE_DEVICE_COMMAND)
+
+        fractions = SwipeFractions(*ADB_SWIPE_FRACTIONS)
+        commands: typing.Dict[int, str] = {}
+
+        for rotation in range(4):
+            pixels = fractions.to_pixels(*geometry.get_display_size(rotation))
+            commands[rotation] = shlex.join(["input", "swipe", *map(str, pixels), str(ADB_SWIPE_DURATION_MS)])
+
+        return self.select_rotation_command(commands, run_device_command)
+
+    def _get_geometry(self, run_device_command: typing.Callable[[str], str]) -> typing.Optional[DeviceGeometry]:
+        """
+        Returns the device's geometry from the cache, or reads and caches it.
+
+        Returns:
+            The geometry, or None if the device reports none usable.
+
+        Raises:
+            DeviceCommandError: If a probe command failed on the device.
+            OSError: If the device could not be asked.
+        """
+        serial, _, fingerprint = run_device_command(ADB_DEVICE_ID_COMMAND).strip().partition("\n")
+        serial, fingerprint = serial.strip(), fingerprint.strip()
+
+        geometry = self.geometry_cache.get(serial, fingerprint)
+
+        if geometry is not None:
+            if self.verbose:
+                click.echo(f"Screen geometry of {serial or 'device'} (cached): {geometry}", err=True)
+
+            return geometry
+
+        output = run_device_command(ADB_GEOMETRY_COMMAND)
+
+        size = parse_wm_size(output)
+        density = parse_wm_density(output)
+
+        if size is None or density is None:
+            click.echo("Warning: unexpected `wm` output, using fixed swipe coordinates.", err=True)
+            return None
+
+        geometry = DeviceGeometry(width=size[0], height=size[1], density=density)
+
+        if self.verbose:
+            click.echo(f"Screen geometry of {serial or 'device'}: {geometry}", err=True)
+
+        try:
+            self.geometry_cache.put(serial, fingerprint, geometry)
+        except OSError as exception:
+            click.echo(f"Warning: could not cache the screen geometry in {self.geometry_cache.path} ({exception}).", err=True)
+
+        return geometry
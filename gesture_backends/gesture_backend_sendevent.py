@@ -0,0 +1,130 @@
+from base.gesture_backend_base import DeviceCommandError, GestureBackendBase
+from constants.constants import (
+    ADB_GETEVENT_PROBE_COMMAND,
+    ADB_SWIPE_DURATION_MS,
+    ADB_SWIPE_FRACTIONS,
+    SENDEVENT_SWIPE_STEPS,
+)
+from gesture_backends.gesture_backend_input import GestureBackendInput
+from utils.adb_gestures import (
+    SwipeFractions,
+    Touchscreen,
+    build_sendevent_script,
+    parse_getevent,
+)
+from utils.device_geometry_cache import DeviceGeometryCache
+
+import shlex
+import typing
+
+import click
+
+class GestureBackendSendevent(GestureBackendBase):
+    """
+    A gesture backend that writes raw touch events with `sendevent`.
+
+    On first use it finds the touchscreen's `/dev/input/eventN` and axis
+    ranges (`getevent -pl`), maps ADB_SWIPE_FRACTIONS onto the axes for
+    the display's rotation (or for every rotation, picked on the device
+    in every swipe, with `follow_rotation`) and caches the resulting
+    event sequence as one shell line. No Java process is started per
+    gesture.
+
+    If the device has no touchscreen the shell user can write, or the
+    probe fails on the device, the backend falls back to `input swipe`
+    for good. If the device could not be reached, `input swipe` is used
+    for that swipe only and the probe is repeated on the next one.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        follow_rotation: bool = False,
+        geometry_cache: typing.Optional[DeviceGeometryCache] = None,
+    ) -> None:
+        """Initializes the backend; the device is probed on first use."""
+        super().__init__(verbose=verbose, follow_rotation=follow_rotation)
+        self._fallback = GestureBackendInput(verbose=verbose, follow_rotation=follow_rotation, geometry_cache=geometry_cache)
+        self._swipe_command: typing.Optional[str] = None
+        self._is_fallback = False
+
+    def get_swipe_command(self, run_device_command: typing.Callable[[str], str]) -> str:
+        """Returns the cached `sendevent` script, probing the device until it answers."""
+        if self._swipe_command is not None:
+            return self._swipe_command
+
+        if self._is_fallback:
+            return self._fallback.get_swipe_command(run_device_command)
+
+        try:
+            touchscreen = self._probe_touchscreen(run_device_command)
+
+            if touchscreen is not None:
+                self._swipe_command = self._build_swipe_command(touchscreen, run_device_command)
+                return self._swipe_command
+        except DeviceCommandError as exception:
+            click.echo(f"Warning: probing the touchscreen failed ({exception}), using `input swipe`.", err=True)
+        except OSError as exception:
+            click.echo(f"Warning: probing the touchscreen failed ({exception}), using `input swipe` for now.", err=True)
+            return self._fallback.get_swipe_command(run_device_command)
+
+        self._is_fallback = True
+
+        return self._fallback.get_swipe_command(run_device_command)
+
+    def _probe_touchscreen(self, run_device_command: typing.Callable[[str], str]) -> typing.Optional[Touchscreen]:
+        """
+        Finds the touchscreen and checks that the shell user can write it.
+
+        Returns:
+            The touchscreen, or None if there is none usable.
+
+        Raises:
+            DeviceCommandError: If `getevent` failed on the device.
+            OSError: If the device could not be asked.
+        """
+        touchscreen = parse_getevent(run_device_command(shlex.join(ADB_GETEVENT_PROBE_COMMAND)))
+
+        if touchscreen is None:
+            click.echo("Warning: no multi-touch screen found, using `input swipe`.", err=True)
+            return None
+
+        # Most builds let the shell user write input devices; some need root.
+        # The status is printed, so a failed test is told apart from a failed call.
+        test_status = run_device_command(f"{shlex.join(['test', '-w', touchscreen.device_path])}; echo $?").strip()
+
+        if test_status != "0":
+            click.echo(f"Warning: {touchscreen.device_path} is not writable by the shell user, using `input swipe`.", err=True)
+            return None
+
+        return touchscreen
+
+    def _build_swipe_command(self, touchscreen: Touchscreen, run_device_command: typing.Callable[[str], str]) -> str:
+        """
+        Precomputes the swipe's event sequences for every rotation and
+        picks the one for the display's rotation.
+
+        Raises:
+            OSError: If the rotation could not be read.
+        """
+        if self.verbose:
+            click.echo(
+                f"Touchscreen: {touchscreen.device_path}, "
+                f"axes {touchscreen.axes['ABS_MT_POSITION_X']} x {touchscreen.axes['ABS_MT_POSITION_Y']}",
+                err=True,
+            )
+
+        fractions = SwipeFractions(*ADB_SWIPE_FRACTIONS)
+
+        return self.select_rotation_command(
+            {
+                rotation: build_sendevent_script(
+                    touchscreen=touchscreen,
+                    fractions=fractions.to_natural(rotation),
+                    duration_ms=ADB_SWIPE_DURATION_MS,
+                    steps=SENDEVENT_SWIPE_STEPS,
+                )
+                for rotation in range(4)
+            },
+            run_device_command,
+        )
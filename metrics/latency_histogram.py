@@ -0,0 +1,75 @@
+from constants.constants import LATENCY_BUCKET_BOUNDS
+
+import bisect
+import typing
+
+class LatencyHistogram:
+    """
+    Counts durations in fixed buckets (LATENCY_BUCKET_BOUNDS), so a
+    sample costs a bisect and two additions however many are recorded.
+
+    Percentiles are estimated by interpolating inside the bucket the
+    rank falls in, like Prometheus' histogram_quantile().
+
+    Not locked: each histogram is written by one thread at a time.
+    """
+
+    def __init__(self, bounds: typing.Sequence[float] = LATENCY_BUCKET_BOUNDS) -> None:
+        """Initializes empty buckets with the given upper bounds."""
+        self.bounds = tuple(bounds)
+        self.bucket_counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Records one duration."""
+        self.bucket_counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def get_percentile(self, fraction: float) -> float:
+        """
+        Estimates the duration below which `fraction` of the samples fall.
+
+        Returns:
+            Seconds, or 0 without samples.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+
+        for index, bucket_count in enumerate(self.bucket_counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max_seconds
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+
+                return min(estimate, self.max_seconds)
+
+            seen += bucket_count
+
+        return self.max_seconds
+
+    def get_cumulative_counts(self) -> typing.List[typing.Tuple[float, int]]:
+        """
+        Returns (upper bound, samples at or below it) per bucket, ending
+        with infinity, like Prometheus' `le` buckets.
+
+        The counts are copied first, so a sample recorded by another
+        thread meanwhile can not make them decrease.
+        """
+        counts = list(self.bucket_counts)
+        cumulative: typing.List[typing.Tuple[float, int]] = []
+        total = 0
+
+        for bound, bucket_count in zip((*self.bounds, float("inf")), counts):
+            total += bucket_count
+            cumulative.append((bound, total))
+
+        return cumulative
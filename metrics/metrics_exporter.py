@@ -0,0 +1,203 @@
+from constants.constants import METRICS_HOST, METRICS_TEXTFILE_INTERVAL
+from metrics.poll_stats import PollStats
+from utils.circuit_breaker import get_circuit_breakers
+
+import functools
+import http.server
+import os
+import pathlib
+import tempfile
+import threading
+import typing
+
+import click
+
+#: Content type of the Prometheus text exposition format.
+CONTENT_TYPE: typing.Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+
+def format_label(value: str) -> str:
+    """Escapes a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_bound(bound: float) -> str:
+    """Formats a bucket bound like the Prometheus client libraries do."""
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+def render_metrics(stats: PollStats) -> str:
+    """
+    Renders the stats and every circuit breaker's counters in the
+    Prometheus text exposition format, which node exporter's textfile
+    collector reads too.
+    """
+    lines = [
+        "# HELP code4swipe_phase_seconds Duration of the phases of the main loop; reward is the swipe provider call, e.g. adb.",
+        "# TYPE code4swipe_phase_seconds histogram",
+    ]
+
+    for phase, histogram in stats.histograms.items():
+        cumulative = histogram.get_cumulative_counts()
+
+        for bound, count in cumulative:
+            lines.append(f'code4swipe_phase_seconds_bucket{{phase="{phase}",le="{format_bound(bound)}"}} {count}')
+
+        lines.append(f'code4swipe_phase_seconds_sum{{phase="{phase}"}} {histogram.total_seconds!r}')
+        lines.append(f'code4swipe_phase_seconds_count{{phase="{phase}"}} {cumulative[-1][1]}')
+
+    lines += [
+        "# HELP code4swipe_diff_bytes_total Bytes of diff output read from the diff provider.",
+        "# TYPE code4swipe_diff_bytes_total counter",
+        f"code4swipe_diff_bytes_total {stats.diff_bytes}",
+        "# HELP code4swipe_rewards_total Checks in which the detector found new work.",
+        "# TYPE code4swipe_rewards_total counter",
+        f"code4swipe_rewards_total {stats.reward_count}",
+        "# HELP code4swipe_reward_errors_total Swipe provider calls that raised.",
+        "# TYPE code4swipe_reward_errors_total counter",
+        f"code4swipe_reward_errors_total {stats.reward_error_count}",
+        "# HELP code4swipe_uptime_seconds Seconds since start-up.",
+        "# TYPE code4swipe_uptime_seconds gauge",
+        f"code4swipe_uptime_seconds {stats.uptime_seconds!r}",
+    ]
+
+    breakers = get_circuit_breakers()
+    counters = (
+        ("calls", "Calls admitted by the circuit breaker.", "call_count"),
+        ("timeouts", "Calls that hit their deadline.", "failure_count"),
+        ("rejected", "Calls skipped while the circuit was open.", "rejected_count"),
+        ("trips", "Times the circuit opened.", "trip_count"),
+    )
+
+    for suffix, help_text, attribute in counters:
+        lines.append(f"# HELP code4swipe_circuit_breaker_{suffix}_total {help_text}")
+        lines.append(f"# TYPE code4swipe_circuit_breaker_{suffix}_total counter")
+        lines.extend(
+            f'code4swipe_circuit_breaker_{suffix}_total{{backend="{format_label(breaker.name)}"}} {getattr(breaker, attribute)}'
+            for breaker in breakers
+        )
+
+    lines.append("# HELP code4swipe_circuit_breaker_open Whether calls to the backend are paused.")
+    lines.append("# TYPE code4swipe_circuit_breaker_open gauge")
+    lines.extend(
+        f'code4swipe_circuit_breaker_open{{backend="{format_label(breaker.name)}"}} {int(breaker.is_open)}'
+        for breaker in breakers
+    )
+
+    return "\n".join(lines) + "\n"
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Answers `GET /metrics`."""
+
+    def __init__(self, *args: typing.Any, stats: PollStats, **kwargs: typing.Any) -> None:
+        self.stats = stats
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        """Renders the metrics on every scrape."""
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = render_metrics(self.stats).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        """Keeps scrapes out of the console."""
+
+class MetricsHttpServer:
+    """
+    Serves the metrics on `http://127.0.0.1:<port>/metrics` from a
+    daemon thread. Rendering only reads counters, so a scrape never
+    waits for the main loop, nor the other way round.
+    """
+
+    def __init__(self, stats: PollStats, port: int) -> None:
+        """
+        Binds the port.
+
+        Raises:
+            OSError: If the port can not be bound.
+        """
+        self.stats = stats
+        self._server = http.server.ThreadingHTTPServer((METRICS_HOST, port), functools.partial(MetricsRequestHandler, stats=stats))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="code4swipe-metrics-http", daemon=True)
+
+    @property
+    def description(self) -> str:
+        """Where the metrics can be scraped."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> None:
+        """Starts serving in the background."""
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stops serving and releases the port."""
+        if self._thread.is_alive():
+            self._server.shutdown()
+
+        self._server.server_close()
+
+class MetricsTextfileWriter:
+    """
+    Rewrites the metrics into a file every METRICS_TEXTFILE_INTERVAL
+    seconds from a daemon thread, for node exporter's textfile
+    collector. Each write goes to a temporary file in the same directory
+    that then replaces the target, so readers never see half a file.
+    """
+
+    def __init__(self, stats: PollStats, path: pathlib.Path, interval: float = METRICS_TEXTFILE_INTERVAL) -> None:
+        """Initializes the writer; nothing is written before start()."""
+        self.stats = stats
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="code4swipe-metrics-textfile", daemon=True)
+
+    @property
+    def description(self) -> str:
+        """Where the metrics are written."""
+        return str(self.path)
+
+    def start(self) -> None:
+        """Starts writing in the background."""
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stops the thread and writes the final values."""
+        self._stop_event.set()
+
+        if self._thread.is_alive():
+            self._thread.join()
+
+        self.write()
+
+    def write(self) -> None:
+        """Writes the current values atomically; failures are reported, not raised."""
+        try:
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+
+            try:
+                with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                    file.write(render_metrics(self.stats))
+
+                os.chmod(temp_path, 0o644)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as exception:
+            click.echo(f"Warning: writing metrics to {self.path} failed: {exception}", err=True)
+
+    def _run(self) -> None:
+        """Writes until stopped."""
+        while True:
+            self.write()
+
+            if self._stop_event.wait(self.interval):
+                return
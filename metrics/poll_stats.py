@@ -0,0 +1,102 @@
+from constants.enums import PollPhases
+from metrics.latency_histogram import LatencyHistogram
+
+import datetime
+import time
+import typing
+
+class PollStats:
+    """
+    Latency histograms of the main loop's phases:
+
+    - `check`: one detector call, i.e. a whole poll without the reward;
+    - `diff`: time spent inside the diff provider (fed by
+      GitDiffProviderTimed), including git's runtime;
+    - `state`: the rest of the check, i.e. hashing or counting the diff
+      and comparing the result with the baseline;
+    - `reward`: handing a reward to the swipe provider;
+    - `sleep`: waiting for the watcher.
+    """
+
+    def __init__(self, clock: typing.Callable[[], float] = time.monotonic) -> None:
+        """Initializes empty histograms."""
+        self.histograms = {phase: LatencyHistogram() for phase in PollPhases}
+        self.reward_count = 0
+        self.reward_error_count = 0
+        self.diff_bytes = 0
+        self._clock = clock
+        self._started_at = clock()
+        self._check_diff_seconds = 0.0
+
+    @property
+    def uptime_seconds(self) -> float:
+        """Seconds since the stats were created."""
+        return self._clock() - self._started_at
+
+    def observe(self, phase: PollPhases, seconds: float) -> None:
+        """Records the duration of one phase."""
+        self.histograms[phase].observe(seconds)
+
+    def observe_reward(self, seconds: float, has_failed: bool) -> None:
+        """Records one call into the swipe provider."""
+        self.histograms[PollPhases.REWARD].observe(seconds)
+
+        if has_failed:
+            self.reward_error_count += 1
+
+    def observe_diff(self, seconds: float, byte_count: int) -> None:
+        """Records one call into the diff provider."""
+        self.histograms[PollPhases.DIFF].observe(seconds)
+        self.diff_bytes += byte_count
+        self._check_diff_seconds += seconds
+
+    def start_check(self) -> float:
+        """Marks the start of a detector call; pass the result to end_check()."""
+        self._check_diff_seconds = 0.0
+        return time.perf_counter()
+
+    def end_check(self, started: float, has_new_work: bool) -> None:
+        """Records a detector call and splits it into diff and state time."""
+        seconds = time.perf_counter() - started
+
+        self.histograms[PollPhases.CHECK].observe(seconds)
+        self.histograms[PollPhases.STATE].observe(max(seconds - self._check_diff_seconds, 0.0))
+
+        if has_new_work:
+            self.reward_count += 1
+
+    def describe(self) -> str:
+        """Returns the summary printed on exit and on SIGUSR1."""
+        uptime = self.uptime_seconds
+
+        lines = [
+            f"Stats after {datetime.timedelta(seconds=round(uptime))}:",
+            f"  {'phase':<8} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'total s':>9}",
+        ]
+
+        for phase, histogram in self.histograms.items():
+            lines.append(
+                f"  {phase:<8} {histogram.count:>7} "
+                f"{histogram.get_percentile(0.50) * 1000:9.2f} "
+                f"{histogram.get_percentile(0.95) * 1000:9.2f} "
+                f"{histogram.get_percentile(0.99) * 1000:9.2f} "
+                f"{histogram.max_seconds * 1000:9.2f} "
+                f"{histogram.total_seconds:9.2f}"
+            )
+
+        lines.append(
+            f"  Rewards: {self.reward_count} ({self.reward_count / max(uptime, 1) * 3600:.1f} per hour), "
+            f"{self.reward_error_count} failed swipes"
+        )
+        lines.append(f"  Diff bytes read: {self.diff_bytes}")
+
+        try:
+            # POSIX only.
+            import resource
+        except ImportError:
+            pass
+        else:
+            usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            lines.append(f"  Subprocess CPU time (exited children): {usage.ru_utime + usage.ru_stime:.2f} s")
+
+        return "\n".join(lines)
@@ -0,0 +1,68 @@
+from base.runtime_base import RuntimeBase
+from constants.constants import REWARD_QUEUE_MAX_SIZE
+
+import asyncio
+import typing
+
+import click
+
+class RuntimeAsyncio(RuntimeBase):
+    """
+    Implementation of RuntimeBase built on asyncio.
+
+    Detection, reward dispatch and status output run as separate tasks
+    joined by queues, and git and adb run as asyncio subprocesses where
+    the components support it. A slow or hanging swipe therefore never
+    delays the next check: rewards wait in a bounded queue, and rewards
+    found while it is full are dropped.
+    """
+
+    def run(self) -> None:
+        """Runs the event loop until interrupted."""
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        """Starts the tasks and waits for them (they never finish on their own)."""
+        self._rewards: asyncio.Queue[None] = asyncio.Queue(maxsize=REWARD_QUEUE_MAX_SIZE)
+        self._messages: asyncio.Queue[typing.Tuple[str, bool]] = asyncio.Queue()
+
+        async with asyncio.TaskGroup() as task_group:
+            task_group.create_task(self._detect())
+            task_group.create_task(self._dispatch_rewards())
+            task_group.create_task(self._print_messages())
+
+    async def _detect(self) -> None:
+        """Checks for new work whenever the watcher wakes up."""
+        while True:
+            has_new_work = await self.check_for_new_work_async()
+
+            if has_new_work:
+                try:
+                    self._rewards.put_nowait(None)
+                    self._messages.put_nowait((self.get_reward_message(), False))
+                except asyncio.QueueFull:
+                    if self.verbose:
+                        self._messages.put_nowait(("Swipe provider is busy, dropping reward.", True))
+
+            self.watcher.report_activity(has_new_work=has_new_work)
+            await self.wait_for_change_async()
+
+    async def _dispatch_rewards(self) -> None:
+        """Hands queued rewards to the swipe provider one at a time."""
+        while True:
+            await self._rewards.get()
+
+            try:
+                await self.swipe_up_async()
+            except Exception as exception:
+                self._messages.put_nowait((f"An unexpected error occurred during swipe: {exception}", True))
+            finally:
+                self._rewards.task_done()
+
+    async def _print_messages(self) -> None:
+        """Prints status lines in the order they were produced; diagnostics go to stderr."""
+        while True:
+            message, is_diagnostic = await self._messages.get()
+
+            click.echo(message, err=is_diagnostic)
+            self._messages.task_done()
@@ -0,0 +1,21 @@
+from base.runtime_base import RuntimeBase
+
+class RuntimeSync(RuntimeBase):
+    """
+    Implementation of RuntimeBase that runs everything in one loop:
+    check, swipe, wait.
+
+    A slow swipe delays the next check.
+    """
+
+    def run(self) -> None:
+        """Runs the main loop until interrupted."""
+        while True:
+            has_new_work = self.check_for_new_work()
+
+            if has_new_work:
+                self.swipe_up()
+                self.echo_reward()
+
+            self.watcher.report_activity(has_new_work=has_new_work)
+            self.wait_for_change()
@@ -1,18 +1,131 @@
-from constants.constants import ADB_SWIPE_COMMAND
+from base.gesture_backend_base import DeviceCommandError, GestureBackendBase
 from base.swipe_provider_base import SwipeProviderBase
+from constants.constants import ADB_CLIENT_ERROR_PREFIXES, DEFAULT_ADB_TIMEOUT
+from gesture_backends.gesture_backend_input import GestureBackendInput
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.subprocess_deadline import communicate_with_deadline, run_with_deadline
 
 import subprocess
+import typing
+
+if typing.TYPE_CHECKING:
+    from utils.adb_device_monitor import AdbDeviceMonitor
 
 import click
 
 class SwipeProviderADB(SwipeProviderBase):
     """
     A swipe provider that uses the Android Debug Bridge (ADB).
+
+    Every adb call has a deadline; an adb that hits it (e.g. waiting for
+    an unauthorized device) is killed with its process group, and after
+    repeated timeouts a circuit breaker skips swipes for a while.
     """
 
-    def __init__(self, verbose: bool = False) -> None:
-        """Initializes the ADB provider."""
+    def __init__(
+        self,
+        verbose: bool = False,
+        serial: typing.Optional[str] = None,
+        gesture_backend: typing.Optional[GestureBackendBase] = None,
+        device_monitor: typing.Optional["AdbDeviceMonitor"] = None,
+        timeout: float = DEFAULT_ADB_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the ADB provider.
+
+        Args:
+            verbose: Whether to log each command.
+            serial: The device to swipe on; None uses the only one connected.
+            gesture_backend: Builds the swipe's device command line;
+                defaults to `input swipe`.
+            device_monitor: Tracks device states, so swipes on a device
+                that is not online are skipped without running adb.
+            timeout: Seconds one adb call may take.
+        """
         super().__init__(verbose=verbose)
+        self.serial = serial
+        self.gesture_backend = gesture_backend if gesture_backend is not None else GestureBackendInput(verbose=verbose)
+        self.device_monitor = device_monitor
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(name=f"adb{self.device_label}")
+
+    @property
+    def device_label(self) -> str:
+        """Returns ` on <serial>` for messages, if a device was chosen."""
+        return f" on {self.serial}" if self.serial is not None else ""
+
+    def get_adb_command(self, command: typing.List[str]) -> typing.List[str]:
+        """Adds `-s <serial>` to an adb command line if a device was chosen."""
+        if self.serial is None:
+            return list(command)
+
+        return [command[0], "-s", self.serial, *command[1:]]
+
+    def is_device_online(self) -> bool:
+        """
+        Asks the device monitor, if any, whether the device is online, and
+        reports a swipe that is bound to fail.
+        """
+        reason = self.device_monitor.get_skip_reason(self.serial) if self.device_monitor is not None else None
+
+        if reason is not None:
+            click.echo(f"Skipping swipe: {reason}.", err=True)
+            return False
+
+        return True
+
+    def run_device_command(self, device_command: str) -> str:
+        """
+        Runs a command line on the device and returns its output.
+
+        Raises:
+            DeviceCommandError: If the command exited non-zero on the device.
+            OSError: If adb is missing, paused, timed out or could not reach the device.
+        """
+        try:
+            result = self.run_adb(self.get_adb_command(["adb", "shell", device_command]))
+        except subprocess.TimeoutExpired as exception:
+            raise OSError(f"`{device_command}` did not finish{self.device_label} within {self.timeout:.0f} seconds") from exception
+        except subprocess.CalledProcessError as exception:
+            message = (exception.stderr or exception.stdout).strip()
+
+            # adb exits non-zero both for its own errors and with the device command's status.
+            if message.startswith(ADB_CLIENT_ERROR_PREFIXES):
+                raise OSError(f"`{device_command}` failed{self.device_label}: {message}") from exception
+
+            raise DeviceCommandError(f"`{device_command}` failed{self.device_label} (exit status {exception.returncode}): {message}") from exception
+
+        return result.stdout
+
+    def run_adb(self, adb_command: typing.List[str]) -> subprocess.CompletedProcess:
+        """
+        Runs an adb command line under the deadline and the circuit breaker.
+
+        Raises:
+            CircuitOpenError: If adb is paused after repeated timeouts.
+            subprocess.TimeoutExpired: If adb hit the deadline and was killed.
+            subprocess.CalledProcessError: If adb failed.
+        """
+        self.breaker.before_call()
+
+        try:
+            result = run_with_deadline(adb_command, timeout=self.timeout, capture_output=True, check=True, text=True)
+        except subprocess.TimeoutExpired:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # adb answered (or is missing) in time; the backend is not hanging.
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+
+        return result
+
+    def get_swipe_command(self) -> typing.List[str]:
+        """Returns the host command line that performs the swipe."""
+        device_command = self.gesture_backend.get_swipe_command(self.run_device_command)
+        return self.get_adb_command(["adb", "shell", device_command])
 
     def check_availability(self) -> bool:
         """Checks if the adb command is available."""
@@ -25,12 +138,7 @@ class SwipeProviderADB(SwipeProviderBase):
             click.echo(f"Running check: {' '.join(adb_command)}", err=True)
 
         try:
-            result = subprocess.run(
-                adb_command,
-                capture_output=True,
-                check=True,
-                text=True,
-            )
+            result = self.run_adb(adb_command)
 
             if self.verbose:
                 # Log first line of version output
@@ -45,6 +153,9 @@ class SwipeProviderADB(SwipeProviderBase):
                 err=True,
             )
 
+            return False
+        except subprocess.TimeoutExpired:
+            click.echo(f"Error: `adb version` did not finish within {self.timeout:.0f} seconds.", err=True)
             return False
         except subprocess.CalledProcessError as exception:
             click.echo(
@@ -63,19 +174,20 @@ class SwipeProviderADB(SwipeProviderBase):
 
     def swipe_up(self) -> None:
         """Executes the ADB swipe up command."""
+        if not self.is_device_online():
+            return
+
+        swipe_command = self.get_swipe_command()
+
         if self.verbose:
             click.echo(
-                f"Running swipe: {' '.join(ADB_SWIPE_COMMAND)}",
+                f"Running swipe: {' '.join(swipe_command)}",
                 err=True,
             )
 
         try:
-            result = subprocess.run(
-                ADB_SWIPE_COMMAND,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            result = self.run_adb(swipe_command)
+
             if self.verbose:
                 click.echo("Swipe command executed successfully.", err=True)
 
@@ -91,6 +203,15 @@ class SwipeProviderADB(SwipeProviderBase):
                 "Please ensure it is installed and in your PATH.",
                 err=True,
             )
+        except CircuitOpenError as exception:
+            click.echo(f"Skipping swipe: {exception}.", err=True)
+        except subprocess.TimeoutExpired:
+            click.echo(f"Error executing swipe{self.device_label}: adb did not finish within {self.timeout:.0f} seconds and was killed.", err=True)
+            click.echo(
+                "Hint: Is your Android device connected and "
+                "USB debugging authorized?",
+                err=True,
+            )
         except subprocess.CalledProcessError as exception:
             click.echo(
                 f"Error executing swipe: {exception.stderr.strip()}",
@@ -107,3 +228,93 @@ class SwipeProviderADB(SwipeProviderBase):
             )
         except Exception as exception:
             click.echo(f"An unexpected error occurred during swipe: {exception}", err=True)
+
+    async def swipe_up_async(self) -> None:
+        """Executes the ADB swipe up command without blocking the event loop."""
+        import asyncio
+
+        if not self.is_device_online():
+            return
+
+        # Probing the device happens once; later calls return the cached command.
+        swipe_command = await asyncio.to_thread(self.get_swipe_command)
+
+        if self.verbose:
+            click.echo(
+                f"Running swipe: {' '.join(swipe_command)}",
+                err=True,
+            )
+
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as exception:
+            click.echo(f"Skipping swipe: {exception}.", err=True)
+            return
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *swipe_command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+
+            stdout_bytes, stderr_bytes = await communicate_with_deadline(process=process, args=swipe_command, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self.breaker.record_failure()
+            click.echo(f"Error executing swipe{self.device_label}: adb did not finish within {self.timeout:.0f} seconds and was killed.", err=True)
+            click.echo(
+                "Hint: Is your Android device connected and "
+                "USB debugging authorized?",
+                err=True,
+            )
+
+            return
+        except FileNotFoundError:
+            self.breaker.record_success()
+            click.echo(
+                "Error: adb command not found. "
+                "Please ensure it is installed and in your PATH.",
+                err=True,
+            )
+
+            return
+        except BaseException as exception:
+            self.breaker.record_success()
+
+            if not isinstance(exception, Exception):
+                raise
+
+            click.echo(f"An unexpected error occurred during swipe: {exception}", err=True)
+            return
+
+        self.breaker.record_success()
+
+        stdout = stdout_bytes.decode("utf-8", errors="replace").strip()
+        stderr = stderr_bytes.decode("utf-8", errors="replace").strip()
+
+        if process.returncode != 0:
+            click.echo(
+                f"Error executing swipe: {stderr}",
+                err=True,
+            )
+
+            if self.verbose:
+                click.echo(f"Swipe failed stdout: {stdout}", err=True)
+
+            click.echo(
+                "Hint: Is your Android device connected and "
+                "USB debugging enabled?",
+                err=True,
+            )
+
+            return
+
+        if self.verbose:
+            click.echo("Swipe command executed successfully.", err=True)
+
+            if stdout:
+                click.echo(f"Swipe stdout: {stdout}", err=True)
+
+            if stderr:
+                click.echo(f"Swipe stderr: {stderr}", err=True)
@@ -0,0 +1,173 @@
+from base.gesture_backend_base import GestureBackendBase
+from base.swipe_provider_base import SwipeProviderBase
+from constants.constants import (
+    ADB_FAN_OUT_MAX_WORKERS,
+    DEFAULT_ADB_TIMEOUT,
+)
+from gesture_backends.gesture_backend_input import GestureBackendInput
+from swipe_providers.swipe_provider_adb_shell import SwipeProviderADBShell
+from utils.adb_host_client import AdbHostClient
+from utils.subprocess_deadline import run_with_deadline
+
+import concurrent.futures
+import subprocess
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from utils.adb_device_monitor import AdbDeviceMonitor
+
+import click
+
+class SwipeProviderADBFanOut(SwipeProviderBase):
+    """
+    A swipe provider that swipes on every online device at once.
+
+    Devices are discovered through the adb server's host protocol before
+    each swipe, so plugged and unplugged devices are picked up. Each
+    device keeps its own persistent `adb shell` session
+    (SwipeProviderADBShell), and the swipes run concurrently in a thread
+    pool, so a reward takes as long as the slowest device rather than
+    the sum of all. A failing or hanging device only affects itself.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        client: typing.Optional[AdbHostClient] = None,
+        gesture_backend_factory: typing.Optional[typing.Callable[[], GestureBackendBase]] = None,
+        device_monitor: typing.Optional["AdbDeviceMonitor"] = None,
+        timeout: float = DEFAULT_ADB_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the provider; sessions are opened on first use.
+
+        Args:
+            verbose: Whether to log each swipe.
+            client: The host protocol client; defaults to the local adb server.
+            gesture_backend_factory: Creates the gesture backend of each
+                device, since backends may cache device specifics;
+                defaults to `input swipe`.
+            device_monitor: Tracks device states; while it is connected,
+                its table replaces asking the server before each swipe.
+            timeout: Seconds each adb call may take, per device.
+        """
+        super().__init__(verbose=verbose)
+        self.timeout = timeout
+        self.client = client if client is not None else AdbHostClient(timeout=timeout)
+        self.gesture_backend_factory = gesture_backend_factory or (lambda: GestureBackendInput(verbose=verbose))
+        self.device_monitor = device_monitor
+        self._sessions: typing.Dict[str, SwipeProviderADBShell] = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=ADB_FAN_OUT_MAX_WORKERS,
+            thread_name_prefix="code4swipe-swipe",
+        )
+        self._lock = threading.Lock()
+
+    def check_availability(self) -> bool:
+        """Checks that at least one device is online."""
+        try:
+            serials = self._discover_devices()
+        except OSError as exception:
+            click.echo(f"Error: adb server not reachable ({exception}).", err=True)
+            return False
+
+        if not serials:
+            click.echo("Error: no online Android devices found.", err=True)
+            return False
+
+        if self.verbose:
+            click.echo(f"Swiping on {len(serials)} devices: {', '.join(serials)}", err=True)
+
+        return True
+
+    def swipe_up(self) -> None:
+        """Swipes on all online devices concurrently."""
+        try:
+            serials = self._discover_devices()
+        except OSError as exception:
+            click.echo(f"Error listing devices: {exception}", err=True)
+            return
+
+        if not serials:
+            click.echo("Warning: no online Android devices to swipe on.", err=True)
+            return
+
+        started = time.monotonic()
+
+        with self._lock:
+            sessions = [self._get_session(serial) for serial in serials]
+
+        futures = {
+            self._executor.submit(session.swipe_up): session.serial
+            for session in sessions
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as exception:
+                click.echo(f"Error swiping on {futures[future]}: {exception}", err=True)
+
+        if self.verbose:
+            click.echo(f"Swiped on {len(serials)} devices in {(time.monotonic() - started) * 1000:.0f} ms.", err=True)
+
+    def close(self) -> None:
+        """Closes every device session and the thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+
+            self._sessions.clear()
+
+    def _discover_devices(self) -> typing.List[str]:
+        """
+        Returns the serials of online devices, closing sessions of devices
+        that went away.
+
+        Raises:
+            OSError: If the adb server can not be reached or started.
+        """
+        serials = self.device_monitor.get_online_serials() if self.device_monitor is not None else None
+
+        if serials is None:
+            try:
+                devices = self.client.list_devices()
+            except ConnectionRefusedError:
+                self._start_server()
+                devices = self.client.list_devices()
+
+            serials = [device.serial for device in devices if device.state == "device"]
+
+        with self._lock:
+            for serial in set(self._sessions) - set(serials):
+                self._sessions.pop(serial).close()
+
+        return serials
+
+    def _start_server(self) -> None:
+        """Starts the adb server on demand, like the adb binary does."""
+        if self.verbose:
+            click.echo("adb server not running, starting it...", err=True)
+
+        try:
+            run_with_deadline(["adb", "start-server"], timeout=self.timeout, capture_output=True, check=True)
+        except subprocess.TimeoutExpired as exception:
+            raise OSError(f"adb start-server did not finish within {self.timeout:.0f} seconds") from exception
+        except subprocess.CalledProcessError as exception:
+            raise OSError(f"adb start-server failed: {exception.stderr.decode('utf-8', errors='replace').strip()}") from exception
+
+    def _get_session(self, serial: str) -> SwipeProviderADBShell:
+        """Returns the session of a device, creating it on first use."""
+        if serial not in self._sessions:
+            self._sessions[serial] = SwipeProviderADBShell(
+                verbose=self.verbose,
+                serial=serial,
+                gesture_backend=self.gesture_backend_factory(),
+                timeout=self.timeout,
+            )
+
+        return self._sessions[serial]
@@ -0,0 +1,262 @@
+from base.gesture_backend_base import DeviceCommandError, GestureBackendBase
+from constants.constants import (
+    ADB_SHELL_COMMAND,
+    DEFAULT_ADB_TIMEOUT,
+)
+from swipe_providers.swipe_provider_adb import SwipeProviderADB
+from utils.circuit_breaker import CircuitOpenError
+from utils.subprocess_deadline import kill_process_group
+
+import os
+import selectors
+import subprocess
+import threading
+import time
+import typing
+import uuid
+
+if typing.TYPE_CHECKING:
+    from utils.adb_device_monitor import AdbDeviceMonitor
+
+import click
+
+class AdbShellSessionError(OSError):
+    """Raised when the persistent `adb shell` session died or hung."""
+
+class AdbShellTimeoutError(AdbShellSessionError):
+    """Raised when the persistent `adb shell` session stopped responding."""
+
+class SwipeProviderADBShell(SwipeProviderADB):
+    """
+    A swipe provider that keeps one `adb shell` session open and writes
+    swipe commands to its stdin, saving the connection handshake
+    that a fresh `adb shell` process pays for every swipe.
+
+    Each command is followed by an `echo` of a unique sentinel and the
+    command's exit status, so the provider knows when the swipe finished
+    and whether it succeeded. A dead or hung session is replaced by a
+    new one and the swipe is retried once.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        serial: typing.Optional[str] = None,
+        gesture_backend: typing.Optional[GestureBackendBase] = None,
+        device_monitor: typing.Optional["AdbDeviceMonitor"] = None,
+        timeout: float = DEFAULT_ADB_TIMEOUT,
+    ) -> None:
+        """Initializes the provider; the session is opened on first use."""
+        super().__init__(
+            verbose=verbose,
+            serial=serial,
+            gesture_backend=gesture_backend,
+            device_monitor=device_monitor,
+            timeout=timeout,
+        )
+        self._process: typing.Optional[subprocess.Popen[bytes]] = None
+        self._selector: typing.Optional[selectors.BaseSelector] = None
+        self._output = b""
+        self._sentinel_prefix = f"__code4swipe_{uuid.uuid4().hex}"
+        self._sentinel_count = 0
+        self._lock = threading.Lock()
+
+    def swipe_up(self) -> None:
+        """Executes the swipe through the persistent shell session."""
+        if not self.is_device_online():
+            return
+
+        try:
+            device_command = self.gesture_backend.get_swipe_command(self.run_device_command)
+        except OSError as exception:
+            click.echo(f"Error preparing swipe{self.device_label}: {exception}", err=True)
+            return
+
+        if self.verbose:
+            click.echo(f"Running swipe in adb shell session: {device_command}", err=True)
+
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    started = time.monotonic()
+                    exit_status, output = self._run_guarded(device_command)
+                    break
+                except CircuitOpenError as exception:
+                    click.echo(f"Skipping swipe: {exception}.", err=True)
+                    return
+                except (AdbShellSessionError, OSError) as exception:
+                    self._close_session()
+
+                    if attempt == 0:
+                        if self.verbose:
+                            click.echo(f"adb shell session{self.device_label} lost ({exception}), reconnecting...", err=True)
+
+                        continue
+
+                    click.echo(f"Error executing swipe{self.device_label}: {exception}", err=True)
+                    click.echo(
+                        "Hint: Is your Android device connected and "
+                        "USB debugging enabled?",
+                        err=True,
+                    )
+
+                    return
+
+        if exit_status != 0:
+            click.echo(f"Error executing swipe{self.device_label} (exit status {exit_status}): {output}", err=True)
+            return
+
+        if self.verbose:
+            click.echo(f"Swipe command executed successfully{self.device_label} in {(time.monotonic() - started) * 1000:.0f} ms.", err=True)
+
+            if output:
+                click.echo(f"Swipe output: {output}", err=True)
+
+    def run_device_command(self, device_command: str) -> str:
+        """
+        Runs a command line in the session and returns its output.
+
+        Raises:
+            DeviceCommandError: If the command exited non-zero.
+            OSError: If the session failed.
+        """
+        with self._lock:
+            try:
+                exit_status, output = self._run_guarded(device_command)
+            except CircuitOpenError:
+                raise
+            except OSError:
+                self._close_session()
+                raise
+
+        if exit_status != 0:
+            raise DeviceCommandError(f"`{device_command}` failed{self.device_label} (exit status {exit_status}): {output}")
+
+        return output
+
+    def close(self) -> None:
+        """Closes the shell session."""
+        with self._lock:
+            self._close_session()
+
+    def _run_guarded(self, device_command: str) -> typing.Tuple[int, str]:
+        """
+        Runs one command in the session under the circuit breaker.
+
+        Raises:
+            CircuitOpenError: If the session timed out too often lately.
+            AdbShellSessionError: If the session ended or timed out.
+        """
+        self.breaker.before_call()
+
+        try:
+            result = self._run_in_session(device_command)
+        except AdbShellTimeoutError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+
+        return result
+
+    def _run_in_session(self, device_command: str) -> typing.Tuple[int, str]:
+        """
+        Runs one command in the session and waits for its sentinel.
+
+        Returns:
+            The command's exit status and its combined output.
+
+        Raises:
+            AdbShellSessionError: If the session ended or timed out.
+        """
+        if self._process is None:
+            self._open_session()
+
+        assert self._process is not None and self._process.stdin is not None
+
+        self._sentinel_count += 1
+        sentinel = f"{self._sentinel_prefix}_{self._sentinel_count}"
+
+        self._process.stdin.write(f"{device_command} 2>&1; echo {sentinel} $?\n".encode("utf-8"))
+        self._process.stdin.flush()
+
+        deadline = time.monotonic() + self.timeout
+        marker = sentinel.encode("utf-8") + b" "
+
+        while (position := self._output.find(marker)) == -1:
+            self._read_output(deadline=deadline)
+
+        line_end = self._output.find(b"\n", position)
+
+        while line_end == -1:
+            self._read_output(deadline=deadline)
+            line_end = self._output.find(b"\n", position)
+
+        output = self._output[:position].decode("utf-8", errors="replace").strip()
+        exit_status = int(self._output[position + len(marker):line_end].strip() or b"-1")
+        self._output = self._output[line_end + 1:]
+
+        return exit_status, output
+
+    def _read_output(self, deadline: float) -> None:
+        """Appends whatever the session printed, waiting until `deadline`."""
+        assert self._process is not None and self._process.stdout is not None and self._selector is not None
+
+        remaining = deadline - time.monotonic()
+
+        if remaining <= 0 or not self._selector.select(timeout=remaining):
+            raise AdbShellTimeoutError(f"no response from adb shell within {self.timeout:.0f} seconds")
+
+        chunk = os.read(self._process.stdout.fileno(), 4096)
+
+        if not chunk:
+            raise AdbShellSessionError(f"adb shell exited with status {self._process.wait()}")
+
+        self._output += chunk
+
+    def _open_session(self) -> None:
+        """Starts `adb shell` with piped stdin and stdout."""
+        shell_command = self.get_adb_command(ADB_SHELL_COMMAND)
+
+        if self.verbose:
+            click.echo(f"Opening session: {' '.join(shell_command)}", err=True)
+
+        self._process = subprocess.Popen(
+            shell_command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+        assert self._process.stdout is not None
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._process.stdout, selectors.EVENT_READ)
+        self._output = b""
+
+    def _close_session(self) -> None:
+        """Terminates the session, if any."""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+
+        if self._process is None:
+            return
+
+        try:
+            if self._process.stdin is not None:
+                self._process.stdin.close()
+
+            self._process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            kill_process_group(self._process)
+            self._process.wait()
+
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+
+        self._process = None
@@ -0,0 +1,185 @@
+from base.gesture_backend_base import DeviceCommandError, GestureBackendBase
+from base.swipe_provider_base import SwipeProviderBase
+from constants.constants import DEFAULT_ADB_TIMEOUT
+from gesture_backends.gesture_backend_input import GestureBackendInput
+from utils.adb_host_client import AdbHostClient
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from utils.adb_device_monitor import AdbDeviceMonitor
+
+import click
+
+#: Printed after the swipe, followed by its exit status.
+_EXIT_STATUS_MARKER: typing.Final[str] = "__code4swipe_exit_status:"
+
+class SwipeProviderADBSocket(SwipeProviderBase):
+    """
+    A swipe provider that talks to the adb server over its host protocol
+    instead of running the `adb` binary, so no process is spawned per
+    swipe or availability check.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        serial: typing.Optional[str] = None,
+        client: typing.Optional[AdbHostClient] = None,
+        gesture_backend: typing.Optional[GestureBackendBase] = None,
+        device_monitor: typing.Optional["AdbDeviceMonitor"] = None,
+        timeout: float = DEFAULT_ADB_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the provider.
+
+        Args:
+            verbose: Whether to log each request.
+            serial: The device to swipe on; None requires exactly one device.
+            client: The host protocol client; defaults to the local adb server.
+            gesture_backend: Builds the swipe's device command line;
+                defaults to `input swipe`.
+            device_monitor: Tracks device states, so swipes on a device
+                that is not online are skipped without a request.
+            timeout: Seconds a request may wait for the adb server or
+                the device; used when no client is given.
+        """
+        super().__init__(verbose=verbose)
+        self.serial = serial
+        self.client = client if client is not None else AdbHostClient(timeout=timeout)
+        self.gesture_backend = gesture_backend if gesture_backend is not None else GestureBackendInput(verbose=verbose)
+        self.device_monitor = device_monitor
+        self.breaker = CircuitBreaker(name="adb server" if serial is None else f"adb server ({serial})")
+
+    def check_availability(self) -> bool:
+        """Checks that the adb server is up and the device is online."""
+        try:
+            version = self.client.get_server_version()
+            devices = self.client.list_devices()
+        except OSError as exception:
+            click.echo(
+                f"Error: adb server not reachable at {self.client.host}:{self.client.port} ({exception}). "
+                "Start it with `adb start-server`.",
+                err=True,
+            )
+
+            return False
+
+        online_serials = [device.serial for device in devices if device.state == "device"]
+
+        if self.verbose:
+            click.echo(f"ADB server OK: protocol version {version}, devices: {online_serials}", err=True)
+
+        if self.serial is not None and self.serial not in online_serials:
+            click.echo(f"Error: device {self.serial} is not online.", err=True)
+            return False
+
+        if self.serial is None and len(online_serials) != 1:
+            click.echo(
+                f"Error: expected exactly one online device, found {len(online_serials)}. "
+                "Choose one with --device.",
+                err=True,
+            )
+
+            return False
+
+        return True
+
+    def is_device_online(self) -> bool:
+        """
+        Asks the device monitor, if any, whether the device is online, and
+        reports a swipe that is bound to fail.
+        """
+        reason = self.device_monitor.get_skip_reason(self.serial) if self.device_monitor is not None else None
+
+        if reason is not None:
+            click.echo(f"Skipping swipe: {reason}.", err=True)
+            return False
+
+        return True
+
+    def run_device_command(self, device_command: str) -> str:
+        """
+        Runs a command line on the device and returns its output.
+
+        Raises:
+            DeviceCommandError: If the command exited non-zero.
+            OSError: If the adb server refused.
+        """
+        exit_status, text = self._run_with_exit_status(device_command)
+
+        if exit_status != "0":
+            raise DeviceCommandError(f"`{device_command}` failed (exit status {exit_status or 'unknown'}): {text}")
+
+        return text
+
+    def swipe_up(self) -> None:
+        """Runs the swipe through the adb server's shell service."""
+        if not self.is_device_online():
+            return
+
+        started = time.monotonic()
+
+        try:
+            device_command = self.gesture_backend.get_swipe_command(self.run_device_command)
+
+            if self.verbose:
+                click.echo(f"Running swipe via adb server: {device_command}", err=True)
+
+            exit_status, text = self._run_with_exit_status(device_command)
+        except CircuitOpenError as exception:
+            click.echo(f"Skipping swipe: {exception}.", err=True)
+            return
+        except OSError as exception:
+            click.echo(f"Error executing swipe: {exception}", err=True)
+            click.echo(
+                "Hint: Is your Android device connected and "
+                "USB debugging enabled?",
+                err=True,
+            )
+
+            return
+
+        if exit_status != "0":
+            click.echo(f"Error executing swipe (exit status {exit_status or 'unknown'}): {text}", err=True)
+            return
+
+        if self.verbose:
+            click.echo(f"Swipe command executed successfully in {(time.monotonic() - started) * 1000:.0f} ms.", err=True)
+
+            if text:
+                click.echo(f"Swipe output: {text}", err=True)
+
+    def _run_with_exit_status(self, device_command: str) -> typing.Tuple[str, str]:
+        """
+        Runs a command line through the shell service.
+
+        Returns:
+            The command's exit status as printed by the shell (empty if
+            it never got printed) and its combined output.
+
+        Raises:
+            CircuitOpenError: If requests timed out too often lately.
+            OSError: If the adb server refused or did not answer in time.
+        """
+        self.breaker.before_call()
+
+        try:
+            output = self.client.run_shell_command(
+                command=f"{device_command} 2>&1; echo {_EXIT_STATUS_MARKER}$?",
+                serial=self.serial,
+            )
+        except TimeoutError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+
+        text, _, exit_status = output.decode("utf-8", errors="replace").rpartition(_EXIT_STATUS_MARKER)
+
+        return exit_status.strip(), text.strip()
@@ -0,0 +1,113 @@
+from base.swipe_provider_base import SwipeProviderBase
+from constants.constants import REWARD_BURST_SIZE
+from utils.token_bucket import TokenBucket
+
+import time
+import typing
+
+import click
+
+class SwipeProviderCoalescing(SwipeProviderBase):
+    """
+    Implementation of SwipeProviderBase that sits between the runtime
+    and another provider and collapses bursts of rewards.
+
+    A reward that arrives within `window` seconds after the previous
+    swipe finished is merged into it. Beyond that, a token bucket caps
+    the swipe rate at `max_per_minute`, allowing REWARD_BURST_SIZE
+    swipes back to back; rewards over the cap are dropped. Swipes, and
+    with them the time spent in adb, are therefore bounded however often
+    the detector fires, e.g. while a formatter rewrites many files.
+    """
+
+    def __init__(
+        self,
+        inner: SwipeProviderBase,
+        window: float,
+        max_per_minute: float,
+        verbose: bool = False,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes the queue around the provider doing the actual swipes.
+
+        Args:
+            inner: The provider that swipes.
+            window: Seconds after a swipe in which rewards are merged; 0
+                disables merging.
+            max_per_minute: Swipe rate cap; 0 disables the cap.
+            verbose: Whether to log merged and dropped rewards.
+            clock: Monotonic time source.
+        """
+        super().__init__(verbose=verbose)
+        self.inner = inner
+        self.window = window
+        self.requested_count = 0
+        self.swiped_count = 0
+        self.merged_count = 0
+        self.dropped_count = 0
+        self._clock = clock
+        self._bucket = TokenBucket(rate=max_per_minute / 60, capacity=REWARD_BURST_SIZE, clock=clock) if max_per_minute > 0 else None
+        self._last_swipe_end: typing.Optional[float] = None
+
+    def check_availability(self) -> bool:
+        """Checks if the inner provider is ready."""
+        return self.inner.check_availability()
+
+    def swipe_up(self) -> None:
+        """Swipes through the inner provider, unless the reward is merged or dropped."""
+        if not self._admit():
+            return
+
+        try:
+            self.inner.swipe_up()
+        finally:
+            self._last_swipe_end = self._clock()
+
+    async def swipe_up_async(self) -> None:
+        """Asynchronous variant of swipe_up()."""
+        if not self._admit():
+            return
+
+        try:
+            await self.inner.swipe_up_async()
+        finally:
+            self._last_swipe_end = self._clock()
+
+    def close(self) -> None:
+        """Closes the inner provider and reports the counters."""
+        self.inner.close()
+
+        if self.verbose:
+            click.echo(f"Rewards: {self.describe_counters()}.", err=True)
+
+    def describe_counters(self) -> str:
+        """Returns the counters as one human-readable line."""
+        return (
+            f"{self.requested_count} requested, {self.swiped_count} swiped, "
+            f"{self.merged_count} merged, {self.dropped_count} dropped"
+        )
+
+    def _admit(self) -> bool:
+        """Counts a reward and decides whether it gets its own swipe."""
+        self.requested_count += 1
+        now = self._clock()
+
+        if self._last_swipe_end is not None and now - self._last_swipe_end < self.window:
+            self.merged_count += 1
+
+            if self.verbose:
+                click.echo(f"Merging reward into the previous swipe ({self.describe_counters()}).", err=True)
+
+            return False
+
+        if self._bucket is not None and not self._bucket.try_take():
+            self.dropped_count += 1
+
+            if self.verbose:
+                click.echo(f"Swipe rate limit reached, dropping reward ({self.describe_counters()}).", err=True)
+
+            return False
+
+        self.swiped_count += 1
+        return True
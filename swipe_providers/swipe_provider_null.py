@@ -0,0 +1,25 @@
+from base.swipe_provider_base import SwipeProviderBase
+
+import click
+
+class SwipeProviderNull(SwipeProviderBase):
+    """
+    A swipe provider that only counts swipes, for benchmarks and for
+    trying code4swipe without a device.
+    """
+
+    def __init__(self, verbose: bool = False) -> None:
+        """Initializes the provider."""
+        super().__init__(verbose=verbose)
+        self.swipe_count = 0
+
+    def swipe_up(self) -> None:
+        """Counts the swipe."""
+        self.swipe_count += 1
+
+        if self.verbose:
+            click.echo(f"Swipe #{self.swipe_count} (null provider, nothing to do).", err=True)
+
+    def check_availability(self) -> bool:
+        """Always ready."""
+        return True
@@ -0,0 +1,162 @@
+from constants.constants import (
+    ADB_MONITOR_MAX_BACKOFF_SECONDS,
+    ADB_MONITOR_MIN_BACKOFF_SECONDS,
+)
+from utils.adb_host_client import AdbHostClient
+
+import socket
+import threading
+import typing
+
+import click
+
+class AdbDeviceMonitor:
+    """
+    Keeps an in-memory table of device states, fed by the adb server's
+    `host:track-devices` stream on a background thread.
+
+    Swipe providers ask it whether their device is online before paying
+    for a swipe that would fail, and the `adb-all` provider takes its
+    device list from it instead of asking the server on every swipe.
+    While the stream is down, the table is unknown and callers fall back
+    to their usual behaviour; the monitor reconnects with exponential
+    backoff.
+    """
+
+    def __init__(self, verbose: bool = False, client: typing.Optional[AdbHostClient] = None) -> None:
+        """Initializes the monitor; call start() to connect."""
+        self.verbose = verbose
+        self.client = client if client is not None else AdbHostClient()
+        self._devices: typing.Optional[typing.Dict[str, str]] = None
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._connection: typing.Optional[socket.socket] = None
+        self._thread = threading.Thread(target=self._run, name="code4swipe-track-devices", daemon=True)
+
+    def start(self) -> None:
+        """Starts tracking devices in the background."""
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stops tracking and waits for the background thread."""
+        self._closed.set()
+
+        with self._lock:
+            connection = self._connection
+
+        if connection is not None:
+            # Unblocks the thread's recv().
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+        if self._thread.is_alive():
+            self._thread.join(timeout=1)
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the device table is current."""
+        with self._lock:
+            return self._devices is not None
+
+    def get_devices(self) -> typing.Optional[typing.Dict[str, str]]:
+        """Returns a copy of the serial-to-state table, or None while unknown."""
+        with self._lock:
+            return dict(self._devices) if self._devices is not None else None
+
+    def get_online_serials(self) -> typing.Optional[typing.List[str]]:
+        """Returns the serials of online devices, or None while unknown."""
+        devices = self.get_devices()
+
+        if devices is None:
+            return None
+
+        return [serial for serial, state in devices.items() if state == "device"]
+
+    def get_skip_reason(self, serial: typing.Optional[str]) -> typing.Optional[str]:
+        """
+        Tells whether a swipe on a device is bound to fail.
+
+        Args:
+            serial: The chosen device, or None for the only connected one.
+
+        Returns:
+            Why the swipe should be skipped, or None to go ahead
+            (including while the device table is unknown).
+        """
+        devices = self.get_devices()
+
+        if devices is None:
+            return None
+
+        if serial is None:
+            online_count = sum(state == "device" for state in devices.values())
+            return None if online_count == 1 else f"{online_count} devices online, expected exactly one"
+
+        state = devices.get(serial)
+
+        if state is None:
+            return f"device {serial} is not connected"
+
+        if state != "device":
+            return f"device {serial} is {state}"
+
+        return None
+
+    def _run(self) -> None:
+        """Tracks devices until closed, reconnecting with backoff."""
+        backoff = ADB_MONITOR_MIN_BACKOFF_SECONDS
+
+        while not self._closed.is_set():
+            try:
+                connection = self.client.open_device_tracker()
+            except OSError as exception:
+                if self.verbose:
+                    click.echo(f"Device tracking: adb server not reachable ({exception}), retrying in {backoff:.1f} s.", err=True)
+
+                self._closed.wait(backoff)
+                backoff = min(backoff * 2, ADB_MONITOR_MAX_BACKOFF_SECONDS)
+                continue
+
+            backoff = ADB_MONITOR_MIN_BACKOFF_SECONDS
+
+            with self._lock:
+                self._connection = connection
+
+            try:
+                self._track(connection)
+            except OSError as exception:
+                if not self._closed.is_set() and self.verbose:
+                    click.echo(f"Device tracking: stream lost ({exception}), reconnecting.", err=True)
+            finally:
+                connection.close()
+
+                with self._lock:
+                    self._connection = None
+                    self._devices = None
+
+    def _track(self, connection: socket.socket) -> None:
+        """Applies device lists from the stream until it breaks."""
+        while not self._closed.is_set():
+            devices = {device.serial: device.state for device in self.client.read_tracked_devices(connection)}
+
+            with self._lock:
+                previous = self._devices
+                self._devices = devices
+
+            if self.verbose:
+                self._echo_changes(previous or {}, devices, is_first=previous is None)
+
+    def _echo_changes(self, previous: typing.Dict[str, str], devices: typing.Dict[str, str], is_first: bool) -> None:
+        """Logs the device table after (re)connecting, and every change after that."""
+        if is_first:
+            table = ", ".join(f"{serial} ({state})" for serial, state in devices.items()) or "none"
+            click.echo(f"Device tracking: connected, devices: {table}", err=True)
+            return
+
+        for serial in sorted(set(previous) | set(devices)):
+            before, after = previous.get(serial, "disconnected"), devices.get(serial, "disconnected")
+
+            if before != after:
+                click.echo(f"Device tracking: {serial} {before} -> {after}", err=True)
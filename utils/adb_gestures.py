@@ -0,0 +1,267 @@
+import re
+import shlex
+import typing
+
+#: Linux input event types and codes used for a single-finger swipe.
+EV_SYN: typing.Final[int] = 0x00
+EV_KEY: typing.Final[int] = 0x01
+EV_ABS: typing.Final[int] = 0x03
+SYN_REPORT: typing.Final[int] = 0x00
+BTN_TOUCH: typing.Final[int] = 0x14A
+
+ABS_CODES: typing.Final[typing.Dict[str, int]] = {
+    "ABS_MT_SLOT": 0x2F,
+    "ABS_MT_TOUCH_MAJOR": 0x30,
+    "ABS_MT_POSITION_X": 0x35,
+    "ABS_MT_POSITION_Y": 0x36,
+    "ABS_MT_TRACKING_ID": 0x39,
+    "ABS_MT_PRESSURE": 0x3A,
+}
+
+_ABS_LINE: typing.Final[re.Pattern[str]] = re.compile(
+    r"(ABS_\w+)\s*:\s*value -?\d+, min (-?\d+), max (-?\d+)"
+)
+
+_WM_SIZE_LINE: typing.Final[re.Pattern[str]] = re.compile(r"(Physical|Override) size: (\d+)x(\d+)")
+
+_WM_DENSITY_LINE: typing.Final[re.Pattern[str]] = re.compile(r"(Physical|Override) density: (\d+)")
+
+class SwipeFractions(typing.NamedTuple):
+    """A swipe's start and end as fractions of the screen's width and height."""
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+    def to_natural(self, rotation: int) -> "SwipeFractions":
+        """
+        Maps a swipe on the rotated display onto the display's natural
+        orientation, which is what `wm size` and touchscreens report.
+
+        Args:
+            rotation: The display rotation, 0-3 in quarter turns
+                counterclockwise (Surface.ROTATION_*).
+        """
+        def point(x: float, y: float) -> typing.Tuple[float, float]:
+            if rotation == 1:
+                return 1 - y, x
+
+            if rotation == 2:
+                return 1 - x, 1 - y
+
+            if rotation == 3:
+                return y, 1 - x
+
+            return x, y
+
+        return SwipeFractions(*point(self.x1, self.y1), *point(self.x2, self.y2))
+
+    def to_pixels(self, width: int, height: int) -> typing.Tuple[int, int, int, int]:
+        """Returns the swipe in pixels of a `width` x `height` display."""
+        return (
+            round(self.x1 * (width - 1)),
+            round(self.y1 * (height - 1)),
+            round(self.x2 * (width - 1)),
+            round(self.y2 * (height - 1)),
+        )
+
+class DeviceGeometry(typing.NamedTuple):
+    """Screen size in pixels, in the natural orientation, and density in dpi."""
+    width: int
+    height: int
+    density: int
+
+    def get_display_size(self, rotation: int) -> typing.Tuple[int, int]:
+        """Returns the display's width and height at a rotation."""
+        return (self.height, self.width) if rotation % 2 else (self.width, self.height)
+
+class AbsAxis(typing.NamedTuple):
+    """Range of an absolute axis reported by `getevent -pl`."""
+    minimum: int
+    maximum: int
+
+    def scale(self, fraction: float) -> int:
+        """Maps a fraction of the screen onto the axis range."""
+        return self.minimum + round(fraction * (self.maximum - self.minimum))
+
+class Touchscreen(typing.NamedTuple):
+    """A multi-touch input device and the capabilities a swipe needs."""
+    device_path: str
+    axes: typing.Dict[str, AbsAxis]
+    has_btn_touch: bool
+
+def parse_getevent(output: str) -> typing.Optional[Touchscreen]:
+    """
+    Finds the touchscreen in the output of `getevent -pl`.
+
+    Devices with both multi-touch position axes qualify; a device that
+    reports INPUT_PROP_DIRECT (a screen rather than a touchpad) wins.
+
+    Returns:
+        The touchscreen, or None if no device qualifies.
+    """
+    candidates: typing.List[typing.Tuple[bool, Touchscreen]] = []
+    device_path: typing.Optional[str] = None
+    axes: typing.Dict[str, AbsAxis] = {}
+    has_btn_touch = False
+    is_direct = False
+
+    def finish_device() -> None:
+        if device_path is not None and "ABS_MT_POSITION_X" in axes and "ABS_MT_POSITION_Y" in axes:
+            candidates.append((is_direct, Touchscreen(device_path, dict(axes), has_btn_touch)))
+
+    for line in output.splitlines():
+        if line.startswith("add device"):
+            finish_device()
+            device_path = line.rpartition(":")[2].strip()
+            axes = {}
+            has_btn_touch = False
+            is_direct = False
+            continue
+
+        if match := _ABS_LINE.search(line):
+            axes[match.group(1)] = AbsAxis(minimum=int(match.group(2)), maximum=int(match.group(3)))
+
+        has_btn_touch = has_btn_touch or "BTN_TOUCH" in line.split()
+        is_direct = is_direct or "INPUT_PROP_DIRECT" in line
+
+    finish_device()
+
+    if not candidates:
+        return None
+
+    # Prefer direct devices; keep getevent's order otherwise.
+    return max(candidates, key=lambda candidate: candidate[0])[1]
+
+def parse_wm_size(output: str) -> typing.Optional[typing.Tuple[int, int]]:
+    """Returns the screen size from `wm size`, preferring an override."""
+    sizes = {match.group(1): (int(match.group(2)), int(match.group(3))) for match in _WM_SIZE_LINE.finditer(output)}
+
+    return sizes.get("Override") or sizes.get("Physical")
+
+def parse_wm_density(output: str) -> typing.Optional[int]:
+    """Returns the density from `wm density`, preferring an override."""
+    densities = {match.group(1): int(match.group(2)) for match in _WM_DENSITY_LINE.finditer(output)}
+
+    return densities.get("Override") or densities.get("Physical")
+
+def parse_rotation(output: str) -> int:
+    """
+    Returns the display rotation printed by ADB_ROTATION_PROBE_COMMAND,
+    in quarter turns, or 0 if it printed nothing usable.
+    """
+    try:
+        rotation = int(output.strip())
+    except ValueError:
+        return 0
+
+    if 0 <= rotation < 4:
+        return rotation
+
+    if rotation in (90, 180, 270):
+        return rotation // 90
+
+    return 0
+
+def build_rotation_dispatch(rotation_probe: str, commands: typing.Dict[int, str]) -> str:
+    """
+    Builds one shell line that picks the command for the display's
+    current rotation on the device, so rotating the device never needs
+    a round trip from the host.
+
+    Args:
+        rotation_probe: Shell command printing the rotation, in quarter
+            turns (0-3) or degrees.
+        commands: The command line for each rotation; rotation 0 is
+            also used when the probe prints nothing usable.
+    """
+    default_command = commands[0]
+    arms: typing.Dict[str, typing.List[str]] = {}
+
+    for rotation, command in sorted(commands.items()):
+        if command != default_command:
+            arms.setdefault(command, []).extend([str(rotation), str(rotation * 90)])
+
+    if not arms:
+        return default_command
+
+    cases = " ".join(f"{'|'.join(patterns)}) {command} ;;" for command, patterns in arms.items())
+
+    return f'case "$({rotation_probe})" in {cases} *) {default_command} ;; esac'
+
+def build_sendevent_script(
+    touchscreen: Touchscreen,
+    fractions: SwipeFractions,
+    duration_ms: int,
+    steps: int,
+) -> str:
+    """
+    Builds one shell line that injects a single-finger swipe with
+    `sendevent`, bypassing the `input` tool's Java start-up.
+
+    The events are chained with `&&` inside a brace group, so the line
+    stops at the first failing write and redirections apply to all of it.
+
+    Args:
+        touchscreen: The device to write to.
+        fractions: The swipe in the display's natural orientation, in
+            which touchscreens report their axes.
+        duration_ms: How long the finger moves.
+        steps: Number of moves the swipe is split into.
+    """
+    x_axis = touchscreen.axes["ABS_MT_POSITION_X"]
+    y_axis = touchscreen.axes["ABS_MT_POSITION_Y"]
+
+    def event(event_type: int, code: int, value: int) -> str:
+        return f"_ev {event_type} {code} {value}"
+
+    def position(step: int) -> typing.List[str]:
+        x = fractions.x1 + (fractions.x2 - fractions.x1) * step / steps
+        y = fractions.y1 + (fractions.y2 - fractions.y1) * step / steps
+
+        return [
+            event(EV_ABS, ABS_CODES["ABS_MT_POSITION_X"], x_axis.scale(x)),
+            event(EV_ABS, ABS_CODES["ABS_MT_POSITION_Y"], y_axis.scale(y)),
+        ]
+
+    sync = event(EV_SYN, SYN_REPORT, 0)
+    commands: typing.List[str] = []
+
+    # Finger down.
+    if "ABS_MT_SLOT" in touchscreen.axes:
+        commands.append(event(EV_ABS, ABS_CODES["ABS_MT_SLOT"], 0))
+
+    tracking_id = touchscreen.axes.get("ABS_MT_TRACKING_ID", AbsAxis(0, 0))
+    commands.append(event(EV_ABS, ABS_CODES["ABS_MT_TRACKING_ID"], max(tracking_id.minimum, 1)))
+    commands.extend(position(0))
+
+    for name in ("ABS_MT_TOUCH_MAJOR", "ABS_MT_PRESSURE"):
+        if name in touchscreen.axes:
+            axis = touchscreen.axes[name]
+            commands.append(event(EV_ABS, ABS_CODES[name], max((axis.minimum + axis.maximum) // 2, 1)))
+
+    if touchscreen.has_btn_touch:
+        commands.append(event(EV_KEY, BTN_TOUCH, 1))
+
+    commands.append(sync)
+
+    # Movement, spread over the swipe's duration.
+    step_delay = duration_ms / steps / 1000
+
+    for step in range(1, steps + 1):
+        commands.append(f"sleep {step_delay:.3f}")
+        commands.extend(position(step))
+        commands.append(sync)
+
+    # Finger up.
+    commands.append(event(EV_ABS, ABS_CODES["ABS_MT_TRACKING_ID"], -1))
+
+    if touchscreen.has_btn_touch:
+        commands.append(event(EV_KEY, BTN_TOUCH, 0))
+
+    commands.append(sync)
+
+    # A shell function keeps the line short; older adbd cap its length.
+    define_event = f'_ev() {{ sendevent {shlex.quote(touchscreen.device_path)} "$@"; }}'
+
+    return "{ " + " && ".join([define_event, *commands]) + "; }"
@@ -0,0 +1,189 @@
+from constants.constants import (
+    ADB_SERVER_HOST,
+    ADB_SERVER_PORT,
+    DEFAULT_ADB_TIMEOUT,
+)
+
+import os
+import socket
+import typing
+
+class AdbProtocolError(OSError):
+    """Raised when the adb server refuses a request or answers garbage."""
+
+class AdbDevice(typing.NamedTuple):
+    """One line of `adb devices`."""
+    serial: str
+    state: str
+
+def get_adb_server_address() -> typing.Tuple[str, int]:
+    """Returns the adb server's address, honouring adb's environment variables."""
+    return (
+        os.environ.get("ANDROID_ADB_SERVER_ADDRESS", ADB_SERVER_HOST),
+        int(os.environ.get("ANDROID_ADB_SERVER_PORT", ADB_SERVER_PORT)),
+    )
+
+class AdbHostClient:
+    """
+    Minimal client for the adb host protocol, spoken by the adb server
+    on localhost:5037.
+
+    Requests are a 4-digit hex length followed by the payload; the
+    server answers `OKAY`, or `FAIL` plus a length-prefixed message.
+    The server closes the connection after a host service and turns it
+    into the service's stream after a device service, so every request
+    uses a fresh localhost connection.
+    """
+
+    def __init__(
+        self,
+        host: typing.Optional[str] = None,
+        port: typing.Optional[int] = None,
+        timeout: float = DEFAULT_ADB_TIMEOUT,
+    ) -> None:
+        """Initializes the client; no connection is made yet."""
+        default_host, default_port = get_adb_server_address()
+
+        self.host = host if host is not None else default_host
+        self.port = port if port is not None else default_port
+        self.timeout = timeout
+
+    def get_server_version(self) -> int:
+        """
+        Returns the adb server's protocol version (`host:version`).
+
+        Raises:
+            OSError: If the server can not be reached or refuses.
+        """
+        with self._request("host:version") as connection:
+            return int(self._read_length_prefixed(connection), 16)
+
+    def list_devices(self) -> typing.List[AdbDevice]:
+        """
+        Returns the devices known to the server (`host:devices`).
+
+        Raises:
+            OSError: If the server can not be reached or refuses.
+        """
+        with self._request("host:devices") as connection:
+            return parse_adb_devices(self._read_length_prefixed(connection))
+
+    def open_device_tracker(self) -> socket.socket:
+        """
+        Subscribes to device changes (`host:track-devices`).
+
+        The server keeps the connection open and sends the full device
+        list right away and again after every change; read the lists
+        with read_tracked_devices(). The connection has no timeout,
+        since the stream can be idle for hours.
+
+        Raises:
+            OSError: If the server can not be reached or refuses.
+        """
+        connection = self._request("host:track-devices")
+        connection.settimeout(None)
+
+        return connection
+
+    def read_tracked_devices(self, connection: socket.socket) -> typing.List[AdbDevice]:
+        """
+        Blocks until the next device list arrives on a tracker connection.
+
+        Raises:
+            OSError: If the connection broke or was closed.
+        """
+        return parse_adb_devices(self._read_length_prefixed(connection))
+
+    def run_shell_command(self, command: str, serial: typing.Optional[str] = None) -> bytes:
+        """
+        Runs a command on a device (`shell:<command>`) and returns its output.
+
+        Args:
+            command: The shell command line to run on the device.
+            serial: The device to use; None picks the only one connected.
+
+        Returns:
+            Everything the command printed, until it exited.
+
+        Raises:
+            OSError: If the server can not be reached, refuses, or the
+                device is not available.
+        """
+        transport = f"host:transport:{serial}" if serial else "host:transport-any"
+
+        with self._request(transport) as connection:
+            self._send(connection, f"shell:{command}")
+            self._read_status(connection)
+
+            chunks: typing.List[bytes] = []
+
+            while chunk := connection.recv(4096):
+                chunks.append(chunk)
+
+            return b"".join(chunks)
+
+    def _request(self, request: str) -> socket.socket:
+        """Connects, sends a request and checks that the server accepted it."""
+        connection = socket.create_connection((self.host, self.port), timeout=self.timeout)
+
+        try:
+            self._send(connection, request)
+            self._read_status(connection)
+        except BaseException:
+            connection.close()
+            raise
+
+        return connection
+
+    def _send(self, connection: socket.socket, request: str) -> None:
+        """Sends a length-prefixed request."""
+        payload = request.encode("utf-8")
+        connection.sendall(b"%04x" % len(payload) + payload)
+
+    def _read_status(self, connection: socket.socket) -> None:
+        """Reads `OKAY`, or raises with the server's `FAIL` message."""
+        status = self._read_exactly(connection, 4)
+
+        if status == b"OKAY":
+            return
+
+        if status == b"FAIL":
+            message = self._read_length_prefixed(connection).decode("utf-8", errors="replace")
+            raise AdbProtocolError(f"adb server: {message}")
+
+        raise AdbProtocolError(f"unexpected adb server reply: {status!r}")
+
+    def _read_length_prefixed(self, connection: socket.socket) -> bytes:
+        """Reads a 4-digit hex length followed by that many bytes."""
+        try:
+            length = int(self._read_exactly(connection, 4), 16)
+        except ValueError as exception:
+            raise AdbProtocolError(f"malformed adb server reply: {exception}") from exception
+
+        return self._read_exactly(connection, length)
+
+    def _read_exactly(self, connection: socket.socket, size: int) -> bytes:
+        """Reads exactly `size` bytes."""
+        data = b""
+
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+
+            if not chunk:
+                raise AdbProtocolError("adb server closed the connection")
+
+            data += chunk
+
+        return data
+
+def parse_adb_devices(output: bytes) -> typing.List[AdbDevice]:
+    """Parses the `<serial>\\t<state>` lines of `host:devices`."""
+    devices: typing.List[AdbDevice] = []
+
+    for line in output.decode("utf-8", errors="replace").splitlines():
+        serial, _, state = line.partition("\t")
+
+        if serial and state:
+            devices.append(AdbDevice(serial=serial, state=state))
+
+    return devices
@@ -0,0 +1,151 @@
+from constants.constants import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_SECONDS,
+)
+
+import threading
+import time
+import typing
+import weakref
+
+import click
+
+#: Every breaker alive, for exporting their counters.
+_BREAKERS: "weakref.WeakSet[CircuitBreaker]" = weakref.WeakSet()
+_SHARED_LOCK = threading.Lock()
+
+class CircuitOpenError(OSError):
+    """Raised instead of calling a backend that keeps timing out."""
+
+def get_circuit_breakers() -> typing.List["CircuitBreaker"]:
+    """Returns every breaker alive, sorted by name."""
+    return sorted(list(_BREAKERS), key=lambda breaker: breaker.name)
+
+def get_shared_circuit_breaker(name: str) -> "CircuitBreaker":
+    """
+    Returns the live breaker called `name`, creating it if there is
+    none, so every caller of one backend (e.g. all `git` calls of the
+    process) trips and counts together.
+    """
+    with _SHARED_LOCK:
+        for breaker in _BREAKERS:
+            if breaker.name == name:
+                return breaker
+
+        return CircuitBreaker(name=name)
+
+class CircuitBreaker:
+    """
+    Stops calling a backend after `failure_threshold` failures in a
+    row, e.g. a `git` or `adb` that keeps hitting its deadline, so every
+    poll or reward does not pay the full timeout again.
+
+    After `reset_seconds`, one call is let through as a probe: success
+    closes the circuit, another failure keeps it open for another
+    `reset_seconds`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_BREAKER_RESET_SECONDS,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializes a closed circuit for the backend called `name`."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.call_count = 0
+        self.failure_count = 0
+        self.rejected_count = 0
+        self.trip_count = 0
+        self._clock = clock
+        self._consecutive_failures = 0
+        self._opened_at: typing.Optional[float] = None
+        self._is_probing = False
+        self._lock = threading.Lock()
+
+        _BREAKERS.add(self)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self, is_counted: bool = True) -> None:
+        """
+        Admits a call, or rejects it while the circuit is open.
+
+        Args:
+            is_counted: Whether to add to `call_count`; False for a call
+                that continues an operation already admitted and counted.
+
+        Raises:
+            CircuitOpenError: If the backend is paused.
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                remaining = self._opened_at + self.reset_seconds - self._clock()
+
+                if remaining > 0 or self._is_probing:
+                    self.rejected_count += 1
+                    raise CircuitOpenError(f"{self.name} paused after repeated timeouts, retrying in {max(remaining, 0):.0f} s")
+
+                self._is_probing = True
+
+            if is_counted:
+                self.call_count += 1
+
+    def record_success(self) -> None:
+        """Records a call that completed in time, closing the circuit."""
+        with self._lock:
+            was_open = self._opened_at is not None
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._is_probing = False
+
+        if was_open:
+            click.echo(f"{self.name} responds again, resuming calls.", err=True)
+
+    def record_no_answer(self) -> None:
+        """
+        Records a call that ended without telling whether the backend
+        responds (e.g. a helper process that crashed): the circuit stays
+        as it is, and an open one lets the next call probe again.
+        """
+        with self._lock:
+            self._is_probing = False
+
+    def record_failure(self) -> None:
+        """Records a call that timed out, opening the circuit if it keeps happening."""
+        with self._lock:
+            self.failure_count += 1
+            self._consecutive_failures += 1
+            self._is_probing = False
+
+            if self._opened_at is not None:
+                # A failed probe, or a call admitted before the circuit opened.
+                self._opened_at = self._clock()
+                return
+
+            if self._consecutive_failures < self.failure_threshold:
+                return
+
+            self.trip_count += 1
+            self._opened_at = self._clock()
+            consecutive_failures = self._consecutive_failures
+
+        click.echo(
+            f"Warning: {self.name} timed out {consecutive_failures} times in a row, "
+            f"pausing it for {self.reset_seconds:.0f} s.",
+            err=True,
+        )
+
+    def describe_counters(self) -> str:
+        """Returns the counters as one human-readable line."""
+        return (
+            f"{self.name}: {self.call_count} calls, {self.failure_count} timeouts, "
+            f"{self.rejected_count} rejected, {self.trip_count} trips"
+        )
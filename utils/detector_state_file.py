@@ -0,0 +1,125 @@
+from constants.constants import DETECTOR_STATE_FILE_NAME, DETECTOR_STATE_FILE_VERSION
+from diff_providers.git_worktree_snapshot import get_stat_signature
+from utils.git_paths import find_git_paths, read_head_commit
+
+import json
+import os
+import pathlib
+import tempfile
+import typing
+
+import click
+
+class DetectorStateFile:
+    """
+    Keeps the baseline of change detectors in the git dir between runs,
+    one entry per detector, so start-up does not have to wait for a
+    full diff and changes made while code4swipe was down are rewarded.
+
+    An entry is only used while HEAD points to the same commit and
+    `.git/index` has the same stat fingerprint as when it was saved:
+    a commit or a `git add` in between would otherwise be rewarded as
+    new code. Both are read without spawning git.
+    """
+
+    def __init__(self, git_dir: pathlib.Path, detector_name: str, verbose: bool = False) -> None:
+        """Initializes the state file of one detector in `git_dir`."""
+        self.git_dir = git_dir
+        self.path = git_dir / DETECTOR_STATE_FILE_NAME
+        self.detector_name = detector_name
+        self.verbose = verbose
+
+    @classmethod
+    def for_repo(cls, repo_path: pathlib.Path, detector_name: str, verbose: bool = False) -> typing.Optional["DetectorStateFile"]:
+        """Returns the state file of a repository, or None outside of one."""
+        git_paths = find_git_paths(repo_path)
+
+        if git_paths is None:
+            return None
+
+        return cls(git_dir=git_paths.git_dir, detector_name=detector_name, verbose=verbose)
+
+    def get_fingerprint(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """Returns what an entry is validated against, or None if HEAD can not be read."""
+        head_commit = read_head_commit(self.git_dir)
+
+        if head_commit is None:
+            return None
+
+        index_signature = get_stat_signature(self.git_dir / "index")
+
+        return {
+            "head": head_commit,
+            "index": list(index_signature) if index_signature is not None else None,
+        }
+
+    def load(self) -> typing.Optional[typing.Any]:
+        """
+        Returns the detector's saved state, or None if there is none or
+        the repository moved since it was saved.
+        """
+        try:
+            document = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exception:
+            if self.verbose:
+                click.echo(f"Ignoring the state file {self.path}: {exception}", err=True)
+
+            return None
+
+        if not isinstance(document, dict) or document.get("version") != DETECTOR_STATE_FILE_VERSION:
+            return None
+
+        entry = document.get("detectors", {}).get(self.detector_name)
+
+        if not isinstance(entry, dict):
+            return None
+
+        fingerprint = self.get_fingerprint()
+
+        if fingerprint is None or entry.get("fingerprint") != fingerprint:
+            if self.verbose:
+                click.echo(f"The saved {self.detector_name} baseline is stale: HEAD or the index moved.", err=True)
+
+            return None
+
+        return entry.get("state")
+
+    def save(self, state: typing.Any) -> None:
+        """
+        Replaces the detector's entry, keeping the other detectors'.
+        Failures are reported, not raised.
+        """
+        fingerprint = self.get_fingerprint()
+
+        if fingerprint is None:
+            return
+
+        try:
+            document = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            document = None
+
+        if not isinstance(document, dict) or document.get("version") != DETECTOR_STATE_FILE_VERSION:
+            document = {"version": DETECTOR_STATE_FILE_VERSION, "detectors": {}}
+
+        document.setdefault("detectors", {})[self.detector_name] = {
+            "fingerprint": fingerprint,
+            "state": state,
+        }
+
+        try:
+            content = json.dumps(document, indent=2) + "\n"
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.git_dir, prefix=f".{self.path.name}.", suffix=".tmp")
+
+            try:
+                with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                    file.write(content)
+
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, TypeError, ValueError) as exception:
+            click.echo(f"Warning: saving the baseline to {self.path} failed: {exception}", err=True)
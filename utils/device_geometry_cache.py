@@ -0,0 +1,82 @@
+from constants.constants import DEVICE_GEOMETRY_CACHE_FILE_NAME
+from utils.adb_gestures import DeviceGeometry
+
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import typing
+
+def get_default_cache_path() -> pathlib.Path:
+    """Returns the cache file below $XDG_CACHE_HOME, or ~/.cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache_home) / "code4swipe" / DEVICE_GEOMETRY_CACHE_FILE_NAME
+
+class DeviceGeometryCache:
+    """
+    Small JSON file remembering each device's screen geometry, so later
+    runs need not query `wm size` and `wm density` again.
+
+    Entries are keyed by serial and remember the build fingerprint they
+    were read on; an entry from another build counts as a miss, and is
+    replaced on the next put(). A missing or corrupt file is an empty
+    cache.
+    """
+
+    #: Serializes read-modify-write cycles of instances in this process.
+    _lock: typing.ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: typing.Optional[pathlib.Path] = None) -> None:
+        """Initializes the cache; the file is read on each lookup."""
+        self.path = path if path is not None else get_default_cache_path()
+
+    def get(self, serial: str, fingerprint: str) -> typing.Optional[DeviceGeometry]:
+        """Returns the cached geometry, or None if unknown for this build."""
+        with self._lock:
+            entry = self._load().get(serial)
+
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+
+        try:
+            return DeviceGeometry(
+                width=int(entry["width"]),
+                height=int(entry["height"]),
+                density=int(entry["density"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def put(self, serial: str, fingerprint: str, geometry: DeviceGeometry) -> None:
+        """
+        Stores the geometry, replacing the file atomically.
+
+        Raises:
+            OSError: If the file can not be written.
+        """
+        with self._lock:
+            entries = self._load()
+            entries[serial] = {"fingerprint": fingerprint, **geometry._asdict()}
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+
+            try:
+                with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                    json.dump(entries, file, indent=2, sort_keys=True)
+
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def _load(self) -> typing.Dict[str, typing.Any]:
+        """Reads all entries, treating a missing or corrupt file as empty."""
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
@@ -0,0 +1,109 @@
+from constants.constants import (
+    DIFF_RECORDING_COMPRESSION_LEVEL,
+    DIFF_RECORDING_DIFFS_DIR_NAME,
+    DIFF_RECORDING_INDEX_NAME,
+)
+
+import hashlib
+import json
+import os
+import pathlib
+import string
+import threading
+import time
+import typing
+import zlib
+
+class RecordedPoll(typing.NamedTuple):
+    """One poll of a recording."""
+    #: Wall-clock time of the poll, in seconds since the epoch.
+    time: float
+    #: Digest the diff is stored under.
+    digest: str
+
+class DiffRecording(typing.NamedTuple):
+    """A recording loaded into memory."""
+    polls: typing.List[RecordedPoll]
+    #: Decompressed diffs by digest.
+    diffs: typing.Dict[str, bytes]
+
+def get_diff_digest(diff: bytes) -> str:
+    """Returns the name a diff is stored under."""
+    return hashlib.blake2b(diff, digest_size=16).hexdigest()
+
+class DiffRecordingWriter:
+    """
+    Appends polled diffs to a recording directory.
+
+    A diff already stored (by this or an earlier run) only costs an
+    index line, so an idle repository records a few bytes per poll.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        """
+        Opens the recording, creating it if needed; new polls are appended.
+
+        Raises:
+            OSError: If the directory can not be created or written.
+        """
+        self.path = path
+        self._diffs_path = path / DIFF_RECORDING_DIFFS_DIR_NAME
+        self._diffs_path.mkdir(parents=True, exist_ok=True)
+        self._known_digests = {diff_path.name for diff_path in self._diffs_path.iterdir()}
+        self._index_file = open(path / DIFF_RECORDING_INDEX_NAME, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def append(self, diff: bytes) -> None:
+        """Records one poll's diff."""
+        digest = get_diff_digest(diff)
+
+        with self._lock:
+            if digest not in self._known_digests:
+                diff_path = self._diffs_path / digest
+                temp_path = diff_path.with_name(f".{digest}.tmp")
+                temp_path.write_bytes(zlib.compress(diff, DIFF_RECORDING_COMPRESSION_LEVEL))
+                os.replace(temp_path, diff_path)
+                self._known_digests.add(digest)
+
+            self._index_file.write(json.dumps({"time": round(time.time(), 6), "digest": digest}) + "\n")
+            self._index_file.flush()
+
+    def close(self) -> None:
+        """Closes the index."""
+        with self._lock:
+            self._index_file.close()
+
+def load_diff_recording(path: pathlib.Path) -> DiffRecording:
+    """
+    Loads a recording and decompresses every diff it references.
+
+    Raises:
+        OSError: If a file of the recording can not be read.
+        ValueError: If the index or a diff is corrupt.
+    """
+    polls: typing.List[RecordedPoll] = []
+    diffs: typing.Dict[str, bytes] = {}
+
+    with open(path / DIFF_RECORDING_INDEX_NAME, encoding="utf-8") as index_file:
+        for line_number, line in enumerate(index_file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                entry = json.loads(line)
+                poll = RecordedPoll(time=float(entry["time"]), digest=str(entry["digest"]))
+
+                if len(poll.digest) != 32 or not all(character in string.hexdigits for character in poll.digest):
+                    raise ValueError(f"bad digest {poll.digest!r}")
+            except (ValueError, KeyError, TypeError) as exception:
+                raise ValueError(f"{DIFF_RECORDING_INDEX_NAME} line {line_number} is invalid: {exception}") from exception
+
+            if poll.digest not in diffs:
+                try:
+                    diffs[poll.digest] = zlib.decompress((path / DIFF_RECORDING_DIFFS_DIR_NAME / poll.digest).read_bytes())
+                except zlib.error as exception:
+                    raise ValueError(f"diff {poll.digest} is corrupt: {exception}") from exception
+
+            polls.append(poll)
+
+    return DiffRecording(polls=polls, diffs=diffs)
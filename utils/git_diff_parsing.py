@@ -0,0 +1,163 @@
+import typing
+
+#: Lines that start the output of a new file in `git diff`.
+_FILE_HEADERS: typing.Final[typing.Tuple[bytes, ...]] = (
+    b"diff --git ",
+    b"diff --cc ",
+    b"* Unmerged path ",
+)
+
+_C_ESCAPES: typing.Final[typing.Dict[int, int]] = {
+    ord("a"): 0x07,
+    ord("b"): 0x08,
+    ord("t"): 0x09,
+    ord("n"): 0x0A,
+    ord("v"): 0x0B,
+    ord("f"): 0x0C,
+    ord("r"): 0x0D,
+    ord('"'): 0x22,
+    ord("\\"): 0x5C,
+}
+
+def _unquote_c_style(text: bytes) -> bytes:
+    """Decodes a path quoted by git (`"..."` with C escapes)."""
+    result = bytearray()
+    position = 1
+
+    while position < len(text) and text[position] != ord('"'):
+        byte = text[position]
+
+        if byte != ord("\\"):
+            result.append(byte)
+            position += 1
+        elif text[position + 1] in _C_ESCAPES:
+            result.append(_C_ESCAPES[text[position + 1]])
+            position += 2
+        else:
+            result.append(int(text[position + 1:position + 4], 8))
+            position += 4
+
+    return bytes(result)
+
+def _parse_header_path(header: bytes) -> bytes:
+    """Extracts the worktree path from a file header line."""
+    for prefix in _FILE_HEADERS:
+        if header.startswith(prefix):
+            rest = header[len(prefix):].rstrip(b"\n")
+            break
+    else:
+        raise ValueError(f"not a file header: {header!r}")
+
+    if prefix != b"diff --git ":
+        return _unquote_c_style(rest) if rest.startswith(b'"') else rest
+
+    if rest.startswith(b'"'):
+        return _unquote_c_style(rest)[len(b"a/"):]
+
+    # "a/<path> b/<path>": both halves are the same path.
+    return rest[len(b"a/"):len(b"a/") + (len(rest) - len(b"a/ b/")) // 2]
+
+def split_file_diffs(output: bytes) -> typing.Dict[bytes, bytes]:
+    """
+    Splits `git diff` output into per-file chunks keyed by path.
+
+    Content lines always start with a space, `+`, `-` or `\\`, so only
+    real file headers can match.
+    """
+    file_diffs: typing.Dict[bytes, bytes] = {}
+    path: typing.Optional[bytes] = None
+    chunk: typing.List[bytes] = []
+
+    # Split on LF only; a lone CR inside content must not start a line.
+    lines = [line + b"\n" for line in output.split(b"\n")]
+    lines[-1] = lines[-1][:-1]
+
+    for line in lines:
+        if line.startswith(_FILE_HEADERS):
+            if path is not None:
+                file_diffs[path] = file_diffs.get(path, b"") + b"".join(chunk)
+
+            path = _parse_header_path(line)
+            chunk = []
+
+        chunk.append(line)
+
+    if path is not None:
+        file_diffs[path] = file_diffs.get(path, b"") + b"".join(chunk)
+
+    return file_diffs
+
+class GitNumstat(typing.NamedTuple):
+    """Added and deleted line counts of one file, as `git diff --numstat` reports them."""
+    added: typing.Optional[int]
+    deleted: typing.Optional[int]
+    path: bytes
+
+    @property
+    def is_binary(self) -> bool:
+        """Whether git could not count lines because the file is binary."""
+        return self.added is None
+
+def parse_git_numstat(output: bytes) -> typing.List[GitNumstat]:
+    """
+    Parses the output of `git diff --numstat -z`.
+
+    Each record is `<added>\\t<deleted>\\t<path>\\0`, or, for a rename,
+    `<added>\\t<deleted>\\t\\0<old path>\\0<new path>\\0`. Binary files
+    report `-` for both counts. Paths are never quoted with `-z`.
+
+    Raises:
+        ValueError: If the output is not in that format.
+    """
+    numstats: typing.List[GitNumstat] = []
+    fields = output.split(b"\0")
+    position = 0
+
+    # The output ends with a NUL, so the last field is always empty.
+    while position < len(fields) - 1:
+        added, deleted, path = fields[position].split(b"\t", 2)
+        position += 1
+
+        if not path:
+            # Rename: the old and the new path follow as separate fields.
+            path = fields[position + 1]
+            position += 2
+
+        numstats.append(
+            GitNumstat(
+                added=None if added == b"-" else int(added),
+                deleted=None if deleted == b"-" else int(deleted),
+                path=path,
+            )
+        )
+
+    return numstats
+
+def count_git_numstat(diff: bytes) -> typing.List[GitNumstat]:
+    """
+    Derives `git diff --numstat` figures from a patch that is already at hand.
+
+    Lines are counted in hunk bodies only, so the `---`/`+++` headers do
+    not add to the totals.
+    """
+    numstats: typing.List[GitNumstat] = []
+
+    for path, file_diff in split_file_diffs(diff).items():
+        if b"\nBinary files " in file_diff:
+            numstats.append(GitNumstat(added=None, deleted=None, path=path))
+            continue
+
+        added = 0
+        deleted = 0
+        hunk_start = file_diff.find(b"\n@@ ")
+
+        if hunk_start != -1:
+            for line in file_diff[hunk_start + 1:].split(b"\n"):
+                if line.startswith(b"+"):
+                    added += 1
+                elif line.startswith(b"-"):
+                    deleted += 1
+
+        numstats.append(GitNumstat(added=added, deleted=deleted, path=path))
+
+    return numstats
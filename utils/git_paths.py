@@ -0,0 +1,185 @@
+from constants.constants import DEFAULT_GIT_TIMEOUT
+from utils.subprocess_deadline import run_with_deadline
+
+import pathlib
+import subprocess
+import typing
+
+class GitPaths(typing.NamedTuple):
+    """Absolute locations of a repository's worktree root and git dir."""
+    worktree: pathlib.Path
+    git_dir: pathlib.Path
+
+def resolve_git_paths(repo_path: pathlib.Path) -> typing.Optional[GitPaths]:
+    """
+    Resolves the worktree root and git dir for a path inside a repository.
+
+    Args:
+        repo_path: Any path inside the repository's worktree.
+
+    Returns:
+        The resolved paths, or None if `repo_path` is not inside a git
+        worktree or git is unavailable.
+    """
+    git_command = [
+        "git",
+        "-C",
+        str(repo_path),
+        "rev-parse",
+        "--show-toplevel",
+        "--absolute-git-dir",
+    ]
+
+    try:
+        result = run_with_deadline(
+            git_command,
+            timeout=DEFAULT_GIT_TIMEOUT,
+            capture_output=True,
+            check=True,
+            text=True,
+            encoding="utf-8",
+        )
+    except (FileNotFoundError, subprocess.SubprocessError):
+        return None
+
+    lines = result.stdout.splitlines()
+
+    if len(lines) != 2:
+        return None
+
+    return GitPaths(
+        worktree=pathlib.Path(lines[0]),
+        git_dir=pathlib.Path(lines[1]),
+    )
+
+def read_git_dir(worktree: pathlib.Path) -> typing.Optional[pathlib.Path]:
+    """
+    Locates the git dir of a worktree without spawning git.
+
+    Understands both a plain `.git` directory and the `gitdir: <path>`
+    file used by submodules and linked worktrees.
+
+    Args:
+        worktree: The root of the worktree.
+
+    Returns:
+        The git dir, or None if it can not be determined.
+    """
+    dot_git = worktree / ".git"
+
+    if dot_git.is_dir():
+        return dot_git
+
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    prefix = "gitdir:"
+
+    if not content.startswith(prefix):
+        return None
+
+    return (worktree / content[len(prefix):].strip()).resolve()
+
+def read_common_dir(git_dir: pathlib.Path) -> pathlib.Path:
+    """
+    Returns the directory holding the objects and refs shared by all
+    worktrees, which is the git dir itself unless it belongs to a
+    linked worktree.
+
+    Args:
+        git_dir: The repository's git dir.
+    """
+    try:
+        return (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    except OSError:
+        return git_dir
+
+def read_head_commit(git_dir: pathlib.Path) -> typing.Optional[str]:
+    """
+    Resolves HEAD to a commit id without spawning git, through loose
+    refs and `packed-refs`.
+
+    Args:
+        git_dir: The repository's git dir.
+
+    Returns:
+        The commit id as hex, or None for an unborn branch or refs
+        stored in a format this does not read.
+    """
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    prefix = "ref:"
+
+    if not head.startswith(prefix):
+        return head or None
+
+    ref_name = head[len(prefix):].strip()
+    common_dir = read_common_dir(git_dir)
+
+    try:
+        return (common_dir / ref_name).read_text(encoding="utf-8").strip() or None
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    try:
+        packed_refs = (common_dir / "packed-refs").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+
+    for line in packed_refs.splitlines():
+        commit_id, _, name = line.partition(" ")
+
+        if name == ref_name and not line.startswith(("#", "^")):
+            return commit_id
+
+    return None
+
+def read_object_hash_size(git_dir: pathlib.Path) -> int:
+    """
+    Returns the object id length of a repository without spawning git.
+
+    Args:
+        git_dir: The repository's git dir.
+
+    Returns:
+        32 for SHA-256 repositories, otherwise 20.
+    """
+    try:
+        config = (read_common_dir(git_dir) / "config").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return 20
+
+    for line in config.splitlines():
+        key, _, value = line.partition("=")
+
+        if key.strip().lower() == "objectformat" and value.strip().lower() == "sha256":
+            return 32
+
+    return 20
+
+def find_git_paths(repo_path: pathlib.Path) -> typing.Optional[GitPaths]:
+    """
+    Resolves the worktree root and git dir without spawning git, by
+    walking up from `repo_path` until a `.git` entry is found.
+
+    Args:
+        repo_path: Any path inside the repository's worktree.
+
+    Returns:
+        The resolved paths, or None if no enclosing worktree is found.
+    """
+    for candidate in (repo_path.resolve(), *repo_path.resolve().parents):
+        if (candidate / ".git").exists():
+            git_dir = read_git_dir(candidate)
+
+            if git_dir is None:
+                return None
+
+            return GitPaths(worktree=candidate, git_dir=git_dir)
+
+    return None
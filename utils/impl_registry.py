@@ -0,0 +1,136 @@
+import importlib
+import typing
+
+import click
+
+TBaseClass = typing.TypeVar("TBaseClass")
+
+class ImplRegistry(typing.Generic[TBaseClass]):
+    """
+    Resolves implementation names to classes, importing an
+    implementation's module only when it is selected.
+
+    Built-in implementations are listed as `module:ClassName`
+    references. Installed packages can add more through an entry point
+    group, so a third-party detector or provider needs no
+    change to constants/enums.py. Entry points are only scanned when a
+    name is not built in, which keeps importlib.metadata off the
+    start-up path. Built-in names can not be overridden.
+    """
+
+    def __init__(
+        self,
+        base_class: type[TBaseClass],
+        entry_point_group: str,
+        builtins: typing.Dict[str, str],
+    ) -> None:
+        """
+        Initializes the registry; nothing is imported yet.
+
+        Args:
+            base_class: The class every implementation must derive from.
+            entry_point_group: Where installed packages register theirs.
+            builtins: `module:ClassName` references by name.
+        """
+        self.base_class = base_class
+        self.entry_point_group = entry_point_group
+        self._builtins = {str(name): reference for name, reference in builtins.items()}
+        self._plugins: typing.Optional[typing.Dict[str, typing.Any]] = None
+        self._classes: typing.Dict[str, type[TBaseClass]] = {}
+
+    @property
+    def builtin_names(self) -> typing.List[str]:
+        """The names of the built-in implementations."""
+        return list(self._builtins)
+
+    @property
+    def builtin_references(self) -> typing.Dict[str, str]:
+        """The `module:ClassName` references of the built-in implementations."""
+        return dict(self._builtins)
+
+    def get_plugin_names(self) -> typing.List[str]:
+        """Returns the names registered by installed packages."""
+        return list(self._get_plugins())
+
+    def get_names(self) -> typing.List[str]:
+        """Returns all implementation names, built-in ones first."""
+        return self.builtin_names + self.get_plugin_names()
+
+    def load(self, name: str) -> type[TBaseClass]:
+        """
+        Returns the implementation class called `name`, importing it on
+        first use.
+
+        Raises:
+            LookupError: If no implementation is called `name`.
+            ImportError: If the implementation could not be imported.
+            TypeError: If it does not derive from the base class.
+        """
+        if name in self._classes:
+            return self._classes[name]
+
+        if name in self._builtins:
+            module_name, _, class_name = self._builtins[name].partition(":")
+            impl_class = getattr(importlib.import_module(module_name), class_name)
+        else:
+            entry_point = self._get_plugins().get(name)
+
+            if entry_point is None:
+                raise LookupError(f"unknown implementation `{name}`")
+
+            try:
+                impl_class = entry_point.load()
+            except Exception as exception:
+                raise ImportError(f"loading `{entry_point.value}` failed: {exception}") from exception
+
+        if not isinstance(impl_class, type) or not issubclass(impl_class, self.base_class):
+            raise TypeError(f"`{name}` is not a {self.base_class.__name__}")
+
+        self._classes[name] = impl_class
+
+        return impl_class
+
+    def _get_plugins(self) -> typing.Dict[str, typing.Any]:
+        """Scans the entry point group once."""
+        if self._plugins is None:
+            # Imported here: importlib.metadata alone costs tens of milliseconds.
+            import importlib.metadata
+
+            self._plugins = {}
+
+            for entry_point in importlib.metadata.entry_points(group=self.entry_point_group):
+                name = entry_point.name.lower()
+
+                if name not in self._builtins:
+                    self._plugins.setdefault(name, entry_point)
+
+        return self._plugins
+
+class ImplChoice(click.Choice):
+    """
+    A case-insensitive click.Choice of a registry's implementation names.
+
+    Help and completion list the built-in names; entry points are only
+    scanned when a value is not one of them.
+    """
+
+    def __init__(self, registry: ImplRegistry) -> None:
+        """Offers the registry's built-in names."""
+        super().__init__(registry.builtin_names, case_sensitive=False)
+        self.registry = registry
+
+    def convert(self, value: typing.Any, param: typing.Optional[click.Parameter], ctx: typing.Optional[click.Context]) -> typing.Any:
+        """Accepts built-in names, then names registered by installed packages."""
+        try:
+            return super().convert(value, param, ctx)
+        except click.BadParameter:
+            name = str(value).lower()
+
+            if name in self.registry.get_plugin_names():
+                return name
+
+            self.fail(
+                f"{value!r} is not one of {', '.join(map(repr, self.registry.get_names()))}.",
+                param,
+                ctx,
+            )
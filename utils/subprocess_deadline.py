@@ -0,0 +1,109 @@
+import os
+import signal
+import subprocess
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+def kill_process_group(process: typing.Union[subprocess.Popen, "asyncio.subprocess.Process"]) -> None:
+    """
+    Kills a process started with `start_new_session=True` together with
+    everything it spawned (git's textconv drivers and pagers, adb's
+    forked server connection), ignoring a process that already exited.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+def run_with_deadline(
+    args: typing.Sequence[typing.Any],
+    timeout: float,
+    check: bool = False,
+    capture_output: bool = False,
+    **kwargs: typing.Any,
+) -> subprocess.CompletedProcess:
+    """
+    Like subprocess.run(), but the process runs in its own process group,
+    and the whole group is killed when `timeout` expires or the caller
+    is interrupted. subprocess.run() only kills the direct child, which
+    leaves grandchildren holding the pipes and the call hanging.
+
+    Raises:
+        subprocess.TimeoutExpired: If the deadline passed.
+        subprocess.CalledProcessError: If `check` is set and the process failed.
+    """
+    if capture_output:
+        kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+
+    with subprocess.Popen(args, start_new_session=True, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            kill_process_group(process)
+            raise
+
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args, output=stdout, stderr=stderr)
+
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+async def communicate_with_deadline(
+    process: "asyncio.subprocess.Process",
+    args: typing.Sequence[typing.Any],
+    timeout: float,
+) -> typing.Tuple[bytes, bytes]:
+    """
+    Asynchronous counterpart of run_with_deadline() for a process
+    started with `start_new_session=True`: waits for its output, and
+    kills its process group when `timeout` expires or the task is
+    cancelled.
+
+    Raises:
+        subprocess.TimeoutExpired: If the deadline passed.
+    """
+    import asyncio
+
+    try:
+        return await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except TimeoutError:
+        kill_process_group(process)
+        await process.wait()
+        raise subprocess.TimeoutExpired(list(args), timeout) from None
+    except asyncio.CancelledError:
+        kill_process_group(process)
+        raise
+
+class ProcessWatchdog:
+    """
+    Kills a process group once a deadline passes, for processes whose
+    output is read incrementally rather than through communicate().
+
+    Use as a context manager around the reading loop and check
+    `expired` afterwards.
+    """
+
+    def __init__(self, process: subprocess.Popen, timeout: float) -> None:
+        """Arms the watchdog; the timer starts on entering the context."""
+        self.process = process
+        self.timeout = timeout
+        self.expired = False
+        self._timer = threading.Timer(timeout, self._expire)
+        self._timer.daemon = True
+
+    def __enter__(self) -> "ProcessWatchdog":
+        self._timer.start()
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self._timer.cancel()
+
+    def _expire(self) -> None:
+        """Kills the process group from the timer thread."""
+        self.expired = True
+        kill_process_group(self.process)
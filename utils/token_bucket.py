@@ -0,0 +1,33 @@
+import time
+import typing
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens and refills at
+    `rate` tokens per second. Each allowed action takes one token.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializes a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def try_take(self) -> bool:
+        """Takes a token if one is available, without waiting."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
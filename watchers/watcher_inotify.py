@@ -0,0 +1,352 @@
+from base.watcher_base import WatcherBase
+from constants.constants import (
+    INOTIFY_READ_SIZE,
+    WATCH_COALESCE_MAX_SECONDS,
+    WATCH_COALESCE_SECONDS,
+)
+from diff_providers.git_worktree_snapshot import GitWorktreeSnapshot
+from utils.git_paths import find_git_paths
+from watchers.watcher_poll import WatcherPoll
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import pathlib
+import select
+import struct
+import subprocess
+import time
+import typing
+
+import click
+
+# Flags from <sys/inotify.h>.
+IN_MODIFY: typing.Final[int] = 0x00000002
+IN_ATTRIB: typing.Final[int] = 0x00000004
+IN_CLOSE_WRITE: typing.Final[int] = 0x00000008
+IN_MOVED_FROM: typing.Final[int] = 0x00000040
+IN_MOVED_TO: typing.Final[int] = 0x00000080
+IN_CREATE: typing.Final[int] = 0x00000100
+IN_DELETE: typing.Final[int] = 0x00000200
+IN_DELETE_SELF: typing.Final[int] = 0x00000400
+IN_MOVE_SELF: typing.Final[int] = 0x00000800
+IN_Q_OVERFLOW: typing.Final[int] = 0x00004000
+IN_IGNORED: typing.Final[int] = 0x00008000
+IN_ONLYDIR: typing.Final[int] = 0x01000000
+IN_NONBLOCK: typing.Final[int] = os.O_NONBLOCK
+IN_CLOEXEC: typing.Final[int] = 0o2000000
+
+#: Events that may change what `git diff` prints.
+WATCH_MASK: typing.Final[int] = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+#: Events after which the set of watched directories must be rebuilt.
+_RESYNC_MASK: typing.Final[int] = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED | IN_Q_OVERFLOW
+
+#: `struct inotify_event` without its trailing name.
+_EVENT_HEADER: typing.Final[struct.Struct] = struct.Struct("iIII")
+
+#: Files in the git dir whose change may change the diff.
+_GIT_DIR_NAMES: typing.Final[typing.FrozenSet[bytes]] = frozenset((b"index", b"HEAD"))
+
+class WatcherUnavailableError(OSError):
+    """Raised when inotify can not be set up for a worktree."""
+
+class _Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+
+    def __init__(self) -> None:
+        """Creates a non-blocking inotify instance."""
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    def add_watch(self, path: bytes, mask: int) -> int:
+        """Watches a path and returns its watch descriptor."""
+        watch_descriptor = self._libc.inotify_add_watch(self.fd, path, mask)
+
+        if watch_descriptor < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), os.fsdecode(path))
+
+        return watch_descriptor
+
+    def rm_watch(self, watch_descriptor: int) -> None:
+        """Stops watching; errors for already removed watches are ignored."""
+        self._libc.inotify_rm_watch(self.fd, watch_descriptor)
+
+    def read_events(self) -> typing.Iterator[typing.Tuple[int, int, bytes]]:
+        """Yields (watch descriptor, mask, name) for every queued event."""
+        while True:
+            try:
+                buffer = os.read(self.fd, INOTIFY_READ_SIZE)
+            except BlockingIOError:
+                return
+
+            offset = 0
+
+            while offset < len(buffer):
+                watch_descriptor, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + name_length].rstrip(b"\0")
+                offset += name_length
+
+                yield watch_descriptor, mask, name
+
+    def close(self) -> None:
+        """Closes the inotify descriptor, dropping all watches."""
+        os.close(self.fd)
+
+class WatcherInotify(WatcherBase):
+    """
+    Implementation of WatcherBase that sleeps until inotify reports a
+    change to a tracked file, `.git/index` or `.git/HEAD`.
+
+    Only the directories that contain tracked files are watched, so
+    ignored build output and untracked files, which never show up in
+    `git diff`, do not wake the detector up. The watched set follows
+    the index whenever it changes. Bursts of events are coalesced into
+    a single wake-up.
+
+    Falls back to plain polling if inotify is unavailable (non-Linux
+    systems) or the per-user watch limit is hit.
+    """
+
+    def __init__(
+        self,
+        repo_path: pathlib.Path,
+        poll_interval: float,
+        min_interval: typing.Optional[float] = None,
+        max_interval: typing.Optional[float] = None,
+        verbose: bool = False,
+    ) -> None:
+        """Sets up the watches, or falls back to polling if that fails."""
+        super().__init__(verbose=verbose)
+        self._fallback = WatcherPoll(
+            poll_interval=poll_interval,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            verbose=verbose,
+        )
+        self._inotify: typing.Optional[_Inotify] = None
+        self._snapshot: typing.Optional[GitWorktreeSnapshot] = None
+        self._tracked_paths: typing.Set[bytes] = set()
+        self._directory_watches: typing.Dict[bytes, int] = {}
+        self._watched_directories: typing.Dict[int, bytes] = {}
+        self._git_dir_watch = -1
+
+        try:
+            git_paths = find_git_paths(repo_path)
+
+            if git_paths is None:
+                raise WatcherUnavailableError(f"{repo_path} is not inside a git worktree")
+
+            self._snapshot = GitWorktreeSnapshot(git_paths=git_paths)
+            self._inotify = _Inotify()
+            self._git_dir_watch = self._inotify.add_watch(os.fsencode(git_paths.git_dir), WATCH_MASK)
+            self._sync_watches()
+        except (OSError, AttributeError, subprocess.SubprocessError) as exception:
+            # AttributeError: the C library has no inotify functions.
+            self._fall_back(reason=str(exception))
+
+    def wait_for_change(self) -> None:
+        """Blocks until a relevant event arrived and the burst settled."""
+        if self._inotify is None:
+            self._fallback.wait_for_change()
+            return
+
+        try:
+            while not (self._wait_readable(timeout=None) and self._process_events()):
+                pass
+
+            deadline = time.monotonic() + WATCH_COALESCE_MAX_SECONDS
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                if not self._wait_readable(timeout=min(WATCH_COALESCE_SECONDS, remaining)):
+                    break
+
+                self._process_events()
+        except (OSError, subprocess.SubprocessError) as exception:
+            self._fall_back(reason=str(exception))
+
+    async def wait_for_change_async(self) -> None:
+        """Asynchronous variant of wait_for_change(), using the event loop's reader."""
+        if self._inotify is None:
+            await self._fallback.wait_for_change_async()
+            return
+
+        try:
+            while not (await self._wait_readable_async(timeout=None) and self._process_events()):
+                pass
+
+            deadline = time.monotonic() + WATCH_COALESCE_MAX_SECONDS
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                if not await self._wait_readable_async(timeout=min(WATCH_COALESCE_SECONDS, remaining)):
+                    break
+
+                self._process_events()
+        except (OSError, subprocess.SubprocessError) as exception:
+            self._fall_back(reason=str(exception))
+
+    def report_activity(self, has_new_work: bool) -> None:
+        """Lets the polling fallback adapt its interval, once it is in use."""
+        if self._inotify is None:
+            self._fallback.report_activity(has_new_work=has_new_work)
+
+    def close(self) -> None:
+        """Closes the inotify descriptor."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    @property
+    def description(self) -> str:
+        """Returns the number of watched directories, or the fallback."""
+        if self._inotify is None:
+            return self._fallback.description
+
+        return f"inotify on {len(self._directory_watches)} directories"
+
+    def _wait_readable(self, timeout: typing.Optional[float]) -> bool:
+        """Waits up to `timeout` seconds for events; None waits forever."""
+        assert self._inotify is not None
+
+        readable, _, _ = select.select([self._inotify.fd], [], [], timeout)
+
+        return bool(readable)
+
+    async def _wait_readable_async(self, timeout: typing.Optional[float]) -> bool:
+        """Asynchronous variant of _wait_readable()."""
+        assert self._inotify is not None
+
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+
+        loop.add_reader(self._inotify.fd, lambda: readable.done() or readable.set_result(True))
+
+        try:
+            return await asyncio.wait_for(readable, timeout=timeout)
+        except TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(self._inotify.fd)
+
+    def _process_events(self) -> bool:
+        """
+        Reads and handles all queued events.
+
+        Returns:
+            True if any of them may change the diff.
+        """
+        assert self._inotify is not None
+
+        is_relevant = False
+        needs_sync = False
+
+        for watch_descriptor, mask, name in self._inotify.read_events():
+            if watch_descriptor == self._git_dir_watch:
+                if name in _GIT_DIR_NAMES:
+                    is_relevant = True
+                    needs_sync = needs_sync or name == b"index"
+
+                continue
+
+            directory = self._watched_directories.get(watch_descriptor)
+
+            if mask & IN_Q_OVERFLOW or (directory is not None and mask & _RESYNC_MASK):
+                # Events were lost, or a watched directory went away.
+                is_relevant = True
+                needs_sync = True
+                continue
+
+            if directory is None:
+                continue
+
+            path = directory + b"/" + name if directory else name
+
+            if path in self._tracked_paths:
+                is_relevant = True
+            elif path in self._directory_watches:
+                # A watched directory was removed, replaced or moved.
+                is_relevant = True
+                needs_sync = True
+
+        if needs_sync:
+            self._sync_watches()
+
+        return is_relevant
+
+    def _sync_watches(self) -> None:
+        """Reloads the tracked files and watches exactly their directories."""
+        assert self._inotify is not None and self._snapshot is not None
+
+        self._snapshot.load_tracked_files()
+        self._tracked_paths = set(self._snapshot.tracked_modes)
+
+        directories = {b""}
+
+        for path in self._tracked_paths:
+            directory = os.path.dirname(path)
+
+            # Parents must be watched too, to notice a removed subtree.
+            while directory not in directories:
+                directories.add(directory)
+                directory = os.path.dirname(directory)
+
+        worktree = os.fsencode(self._snapshot.git_paths.worktree)
+        directory_watches: typing.Dict[bytes, int] = {}
+
+        for directory in directories:
+            try:
+                # Re-adding an existing watch returns the same descriptor.
+                directory_watches[directory] = self._inotify.add_watch(
+                    os.path.join(worktree, directory) if directory else worktree,
+                    WATCH_MASK,
+                )
+            except OSError as exception:
+                if exception.errno == errno.ENOSPC:
+                    raise WatcherUnavailableError(
+                        errno.ENOSPC,
+                        "inotify watch limit reached "
+                        "(see /proc/sys/fs/inotify/max_user_watches)",
+                    ) from exception
+
+                if exception.errno not in (errno.ENOENT, errno.ENOTDIR):
+                    raise
+
+        for directory, watch_descriptor in self._directory_watches.items():
+            if directory_watches.get(directory) != watch_descriptor:
+                self._inotify.rm_watch(watch_descriptor)
+
+        self._directory_watches = directory_watches
+        self._watched_directories = {
+            watch_descriptor: directory
+            for directory, watch_descriptor in directory_watches.items()
+        }
+
+        if self.verbose:
+            click.echo(f"Watching {len(directory_watches)} directories with inotify.", err=True)
+
+    def _fall_back(self, reason: str) -> None:
+        """Switches to polling for the rest of the run."""
+        click.echo(f"Warning: inotify unavailable ({reason}), polling instead.", err=True)
+        self.close()
@@ -0,0 +1,91 @@
+from base.watcher_base import WatcherBase
+from constants.constants import POLL_BACKOFF_FACTOR
+
+import time
+import typing
+
+import click
+
+class WatcherPoll(WatcherBase):
+    """
+    Implementation of WatcherBase that sleeps between checks, adapting
+    the interval to how active the repository is.
+
+    The interval drops to `min_interval` whenever a check found new work
+    and is multiplied by POLL_BACKOFF_FACTOR after every idle check, up
+    to `max_interval`. Sleeps are measured from the previous wake-up on
+    the monotonic clock, so the time spent checking is not added on top
+    of the interval. With equal bounds the interval is fixed.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float,
+        min_interval: typing.Optional[float] = None,
+        max_interval: typing.Optional[float] = None,
+        verbose: bool = False,
+    ) -> None:
+        """
+        Initializes the watcher.
+
+        Args:
+            poll_interval: The interval used until the first check is reported.
+            min_interval: The interval while changes keep arriving.
+                Defaults to `poll_interval`.
+            max_interval: The cap for backing off while idle.
+                Defaults to `poll_interval`.
+            verbose: Whether to log interval changes.
+        """
+        super().__init__(verbose=verbose)
+        self.min_interval = min_interval if min_interval is not None else poll_interval
+        self.max_interval = max_interval if max_interval is not None else poll_interval
+        self.poll_interval = min(max(poll_interval, self.min_interval), self.max_interval)
+        self._last_wake: typing.Optional[float] = None
+
+    def wait_for_change(self) -> None:
+        """Sleeps until the current interval has passed since the previous wake-up."""
+        delay = self._get_delay()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        self._last_wake = time.monotonic()
+
+    async def wait_for_change_async(self) -> None:
+        """Asynchronous variant of wait_for_change()."""
+        import asyncio
+
+        delay = self._get_delay()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        self._last_wake = time.monotonic()
+
+    def report_activity(self, has_new_work: bool) -> None:
+        """Resets the interval on new work and backs off otherwise."""
+        if has_new_work:
+            poll_interval = self.min_interval
+        else:
+            poll_interval = min(self.poll_interval * POLL_BACKOFF_FACTOR, self.max_interval)
+
+        if poll_interval != self.poll_interval and self.verbose:
+            state = "active" if has_new_work else "idle"
+            click.echo(f"Repository {state}, next checks every {poll_interval:.1f} seconds.", err=True)
+
+        self.poll_interval = poll_interval
+
+    @property
+    def description(self) -> str:
+        """Returns the polling interval or its bounds."""
+        if self.min_interval == self.max_interval:
+            return f"polling every {self.poll_interval} seconds"
+
+        return f"polling every {self.min_interval}-{self.max_interval} seconds, adapting to activity"
+
+    def _get_delay(self) -> float:
+        """Returns the seconds left until the next check is due."""
+        if self._last_wake is None:
+            return self.poll_interval
+
+        return self._last_wake + self.poll_interval - time.monotonic()